@@ -0,0 +1,25 @@
+"""Times Variable.variance over increasingly large Variables, to show that it
+scales linearly with the number of values.
+
+Run with ``python benchmarks/variance.py`` from the repository root."""
+
+import random
+import timeit
+import sys
+sys.path.insert(0, ".")
+from inferi import Variable
+
+def main(sizes=(10000, 100000, 1000000), repeat=3):
+    previous = None
+    for size in sizes:
+        variable = Variable([random.random() for _ in range(size)])
+        seconds = min(timeit.repeat(variable.variance, number=1, repeat=repeat))
+        ratio = "" if previous is None else "  ({:.1f}x)".format(
+         seconds / previous
+        )
+        print("{:>9} values: {:.4f}s{}".format(size, seconds, ratio))
+        previous = seconds
+
+
+if __name__ == "__main__":
+    main()
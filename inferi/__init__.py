@@ -2,6 +2,15 @@ __author__ = "Sam Ireland"
 __version__ = "0.5.0"
 
 from .variables import Variable
+from .expressions import Expression
+from .rolling import Rolling
+from .streaming import StreamingVariable, ExponentialVariable
+from .moments import Moments, CoMoments
+from .sketches import QuantileSketch
+from .indexes import SortedIndex, FrequencyTable
+from .histograms import Histogram
 from .datasets import Dataset
+from .matrices import Matrix
+from .bootstrap import Bootstrap
 from .combinatorics import *
 from .probability import SampleSpace
@@ -0,0 +1,207 @@
+"""Contains tools for bootstrapping statistics of Variables."""
+
+from math import sqrt
+from operator import itemgetter, mul
+import random
+from .parallel import parallel_map
+
+class Bootstrap:
+    """The result of bootstrapping a statistic - its value for the original
+    data, and its value for each of many resamples of the data, from which
+    its standard error and confidence intervals can be estimated.
+
+    Bootstraps are made by :py:meth:`.Variable.bootstrap`.
+
+    :param estimate: The statistic's value for the original data.
+    :param replicates: The statistic's value for each resample. Where the\
+    statistic is undefined for a resample - such as the correlation of a\
+    resample whose values are all the same - it is ``None``, and is skipped\
+    when estimating the standard error and intervals."""
+
+    def __init__(self, estimate, replicates):
+        self._estimate, self._replicates = estimate, tuple(replicates)
+
+
+    def __repr__(self):
+        return "<Bootstrap ({} resamples)>".format(len(self._replicates))
+
+
+    def __len__(self):
+        return len(self._replicates)
+
+
+    @property
+    def estimate(self):
+        """Returns the statistic's value for the original data."""
+
+        return self._estimate
+
+
+    @property
+    def replicates(self):
+        """Returns the statistic's value for each resample.
+
+        :rtype: ``tuple``"""
+
+        return self._replicates
+
+
+    @property
+    def standard_error(self):
+        """Returns the standard error of the statistic - the standard deviation
+        of its values across the resamples.
+
+        :raises ValueError: if the statistic isn't defined for any resample.
+        :rtype: ``float``"""
+
+        return self._defined_replicates().st_dev()
+
+
+    def interval(self, confidence=0.95):
+        """Returns a confidence interval for the statistic, by the percentile
+        method - the range containing the middle of the resampled values.
+
+        :param float confidence: The proportion of resampled values the\
+        interval should contain (default is 0.95).
+        :raises ValueError: if the confidence isn't between 0 and 1.
+        :raises ValueError: if the statistic isn't defined for any resample.
+        :rtype: ``tuple``"""
+
+        if not 0 < confidence < 1:
+            raise ValueError("confidence {} isn't between 0 and 1".format(
+             confidence
+            ))
+        tail = (1 - confidence) * 50
+        return tuple(
+         self._defined_replicates().percentiles([tail, 100 - tail])
+        )
+
+
+    def _defined_replicates(self):
+        """Returns the replicates as a :py:class:`.Variable`, checking that
+        at least one of them isn't missing.
+
+        :raises ValueError: if the statistic isn't defined for any resample.
+        :rtype: ``Variable``"""
+
+        from .variables import Variable
+        if all(replicate is None for replicate in self._replicates):
+            raise ValueError(
+             "The statistic isn't defined for any of the resamples"
+            )
+        return Variable(self._replicates)
+
+
+
+def bootstrap(xs, statistic, ys=None, resamples=10000, batch_size=1000,
+              seed=None, workers=None, executor=None):
+    """Bootstraps a statistic of some values. Resamples are drawn as lists of
+    indices, a batch at a time, and the statistic is calculated straight from
+    the resampled values, without any :py:class:`.Variable` being made.
+
+    Each batch is given its own seed, drawn in order from the overall seed, so
+    the same seed gives the same result however the batches are spread
+    across processes. The values themselves are sent to each process once,
+    rather than with every batch.
+
+    :param list xs: The values to resample.
+    :param str statistic: The statistic - ``"mean"``, ``"median"``,\
+    ``"variance"``, ``"st_dev"`` or ``"correlation"``.
+    :param list ys: The values paired with xs, for the correlation.
+    :param int resamples: The number of resamples (default is 10000).
+    :param int batch_size: The number of resamples in each batch.
+    :param seed: The seed for the random resampling.
+    :param int workers: The number of processes to use.
+    :param executor: A ``concurrent.futures`` style executor to use.
+    :raises ValueError: if an unknown statistic is given, or the correlation\
+    is asked for without ys.
+    :raises ValueError: if the batch size is less than 1.
+    :raises ValueError: if there are no values to resample.
+    :rtype: ``Bootstrap``"""
+
+    if statistic not in _STATISTICS:
+        raise ValueError("Unknown statistic '{}'".format(statistic))
+    if (statistic == "correlation") != (ys is not None):
+        raise ValueError("Only the correlation needs paired values")
+    if batch_size < 1:
+        raise ValueError("batch_size {} must be at least 1".format(batch_size))
+    if not xs:
+        raise ValueError("There are no values to resample")
+    generator = random.Random(seed)
+    tasks = [(
+     statistic, min(batch_size, resamples - start), generator.getrandbits(64)
+    ) for start in range(0, resamples, batch_size)]
+    batches = parallel_map(
+     _resample_batch, tasks, workers=workers, executor=executor,
+     shared=(xs, ys)
+    )
+    estimate = _STATISTICS[statistic](xs, ys)
+    return Bootstrap(estimate, [value for batch in batches for value in batch])
+
+
+def _resample_batch(data, task):
+    """Calculates a statistic for a batch of resamples. This is the unit of
+    work sent to each worker process by :py:func:`bootstrap`.
+
+    :param tuple data: The values, and the paired values (or ``None``).
+    :param tuple task: The statistic, the number of resamples and the seed.
+    :rtype: ``list``"""
+
+    (xs, ys), (statistic, count, seed) = data, task
+    function, generator = _STATISTICS[statistic], random.Random(seed)
+    population, results = range(len(xs)), []
+    for _ in range(count):
+        indices = generator.choices(population, k=len(xs))
+        pick = itemgetter(*indices)
+        results.append(function(
+         _as_tuple(pick(xs)), None if ys is None else _as_tuple(pick(ys))
+        ))
+    return results
+
+
+def _as_tuple(values):
+    """itemgetter returns a bare value rather than a tuple when picking a
+    single index, so this wraps it.
+
+    :param values: The picked values."""
+
+    return values if isinstance(values, tuple) else (values,)
+
+
+def _mean(xs, ys=None):
+    return sum(xs) / len(xs)
+
+
+def _median(xs, ys=None):
+    xs, middle = sorted(xs), len(xs) // 2
+    return xs[middle] if len(xs) % 2 else (xs[middle - 1] + xs[middle]) / 2
+
+
+def _variance(xs, ys=None):
+    if len(xs) < 2: return None
+    mean = sum(xs) / len(xs)
+    deviations = [x - mean for x in xs]
+    return sum(map(mul, deviations, deviations)) / (len(xs) - 1)
+
+
+def _st_dev(xs, ys=None):
+    variance = _variance(xs)
+    return None if variance is None else sqrt(variance)
+
+
+def _correlation(xs, ys):
+    x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+    x_deviations = [x - x_mean for x in xs]
+    y_deviations = [y - y_mean for y in ys]
+    spread = sqrt(
+     sum(map(mul, x_deviations, x_deviations))
+     * sum(map(mul, y_deviations, y_deviations))
+    )
+    if not spread: return None
+    return sum(map(mul, x_deviations, y_deviations)) / spread
+
+
+_STATISTICS = {
+ "mean": _mean, "median": _median, "variance": _variance, "st_dev": _st_dev,
+ "correlation": _correlation
+}
@@ -1,6 +1,14 @@
 """Contains the Dataset class."""
 
+from array import array
+from collections import Counter
+from itertools import compress, islice
+from math import sqrt
+from operator import mul, not_
 from .variables import Variable
+from .matrices import Matrix
+from .moments import Moments
+from .parallel import parallel_map
 
 class Dataset:
     """A collection of :py:class:`.Variable` objects which describe the same
@@ -85,12 +93,55 @@ class Dataset:
 
     @property
     def rows(self):
-        """Returns the rows of the Dataset.
+        """Returns the rows of the Dataset, as a :py:class:`.Rows` view of
+        the Variables. No rows are built until they are indexed or iterated
+        over, and the view always reflects the Variables' current values.
 
+        :rtype: ``Rows``"""
+
+        return Rows(self)
+
+
+    def row(self, index):
+        """Returns a single row of the Dataset, made by looking up one value
+        in each Variable.
+
+        :param int index: The index of the row.
+        :raises IndexError: if there is no such row.
         :rtype: ``tuple``"""
 
-        columns = [var._values for var in self._variables]
-        return tuple([values for values in zip(*columns)])
+        return tuple([variable[index] for variable in self._variables])
+
+
+    def buffers(self):
+        """Returns a read-only ``memoryview`` of every Variable's typed
+        storage, as a ``dict`` keyed by Variable name (or position, if the
+        Variable has no name). The columns can then be read by other numerical
+        code without being copied.
+
+        :raises TypeError: if any Variable doesn't have typed storage.
+        :raises ValueError: if two Variables have the same name.
+        :rtype: ``dict``"""
+
+        return {
+         name: variable.buffer()
+         for name, variable in zip(self._names(), self._variables)
+        }
+
+
+    def _names(self):
+        """Returns the name of every Variable, or its position if it has no
+        name, for keying results by Variable.
+
+        :raises ValueError: if two Variables have the same name.
+        :rtype: ``list``"""
+
+        names = [
+         variable.name or index for index, variable in enumerate(self._variables)
+        ]
+        if len(set(names)) != len(names):
+            raise ValueError("Variable names {} aren't unique".format(names))
+        return names
 
 
     def add_row(self, row):
@@ -106,9 +157,83 @@ class Dataset:
             variable.add(value)
 
 
+    def add_rows(self, rows, chunk_size=10000):
+        """Adds many rows to the Dataset. The rows are taken a chunk at a
+        time, and each chunk is checked, turned into columns and added with
+        :py:meth:`extend_columns`, so the Variables are extended once per
+        chunk rather than once per value.
+
+        :param rows: An iterable of rows, each a list of values. It will be\
+        consumed once.
+        :param int chunk_size: The number of rows in each chunk.
+        :raises ValueError: if the chunk size is less than 1.
+        :raises ValueError: if any row's length does not equal the number of\
+        Variables in the Dataset. The chunks before it will have been added,\
+        but nothing from its own chunk."""
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size {} must be at least 1".format(
+             chunk_size
+            ))
+        rows, width = iter(rows), len(self._variables)
+        chunk = list(islice(rows, chunk_size))
+        while chunk:
+            for row in chunk:
+                if len(row) != width:
+                    raise ValueError(
+                     "Row {} is not the correct length".format(row)
+                    )
+            self.extend_columns(list(zip(*chunk)))
+            chunk = list(islice(rows, chunk_size))
+
+
+    def extend_columns(self, columns):
+        """Adds values to the end of every Variable at once, from one column
+        of values per Variable. Every column is turned into its Variable's
+        storage before any are added, so if one doesn't fit - a string given
+        to a numeric dtype, say - the Dataset is left as it was, and any new
+        categories are forgotten.
+
+        :param list columns: The columns of values, one per Variable, in order.
+        :raises ValueError: if the number of columns does not equal the\
+        number of Variables, or they are different lengths.
+        :raises TypeError: if any Variable is read-only, or a column doesn't\
+        fit its Variable's dtype."""
+
+        columns = [list(column) for column in columns]
+        if len(columns) != len(self._variables):
+            raise ValueError("{} columns given for {} Variables".format(
+             len(columns), len(self._variables)
+            ))
+        if len(set(map(len, columns))) > 1:
+            raise ValueError("Can't extend Dataset by different-length columns")
+        for variable in self._variables: variable._check_writable()
+        counts = [
+         None if variable._categories is None else len(variable._categories)
+         for variable in self._variables
+        ]
+        try:
+            stored = [
+             variable._store(column)
+             for variable, column in zip(self._variables, columns)
+            ]
+        except Exception:
+            for variable, count in zip(self._variables, counts):
+                if count is None: continue
+                for category in variable._categories[count:]:
+                    del variable._category_codes[category]
+                del variable._categories[count:]
+            raise
+        for variable, storage in zip(self._variables, stored):
+            variable._append(*storage)
+
+
     def sort(self, column=None):
         """Sorts all the Variables in the Dataset by a single column, by
-        default the first one.
+        default the first one. Rows where that column is missing are placed
+        at the end, in their original order. If the column is categorical,
+        the rows are sorted by the rank of their category, so only integers
+        are compared.
 
         :param Variable column: the Variable to sort by.
         :raises TypeError: if a non-Variable is given.
@@ -121,7 +246,211 @@ class Dataset:
             if column not in self._variables:
                 raise ValueError("{} isn't a Variable in {}".format(column, self))
             var = column
-        indeces = list(range(len(var._values)))
-        indeces.sort(key=var._values.__getitem__)
+        keys = var._values if var._categories is None else (
+         var._category_ranks()
+        )
+        if var._missing:
+            rows = range(len(var._values))
+            indeces = list(compress(rows, var._valid))
+            indeces.sort(key=keys.__getitem__)
+            indeces += compress(rows, map(not_, var._valid))
+        else:
+            indeces = list(range(len(var._values)))
+            indeces.sort(key=keys.__getitem__)
+        for variable in self._variables:
+            variable._reorder(indeces)
+
+
+    def covariance_matrix(self, population=False, block_size=65536):
+        """Returns the covariance of every pair of Variables in the Dataset, as
+        a :py:class:`.Matrix` which can be indexed by Variable name (or
+        position, if the Variable has no name).
+
+        All the pairwise co-deviations are accumulated in a single pass over
+        the rows, a block of rows at a time, so only one block of deviations
+        from the mean is held in memory at once.
+
+        :param bool population: If ``True``, the population covariances will\
+        be returned (default is ``False``).
+        :param int block_size: The number of rows to process at a time.
+        :raises ValueError: if any Variable has missing values.
+        :raises ValueError: if two Variables have the same name.
+        :rtype: ``Matrix``"""
+
+        names = self._names()
         for variable in self._variables:
-            variable._values = list(map(variable._values.__getitem__, indeces))
+            if variable._missing:
+                raise ValueError("{} has missing values".format(variable))
+        length = len(self._variables[0]) if self._variables else 0
+        means = [variable.mean for variable in self._variables]
+        size = len(self._variables)
+        totals = [0] * (size * (size + 1) // 2)
+        for start in range(0, length, block_size):
+            end = start + block_size
+            deviations = [
+             [value - mean
+              for value in variable._decode(variable._values[start:end])]
+             for variable, mean in zip(self._variables, means)
+            ]
+            position = 0
+            for row, first in enumerate(deviations):
+                for second in deviations[row:]:
+                    totals[position] += sum(map(mul, first, second))
+                    position += 1
+        denominator = length - (not population)
+        return Matrix(
+         names,
+         [total / denominator for total in totals]
+        )
+
+
+    def correlation_matrix(self, block_size=65536):
+        """Returns the correlation of every pair of Variables in the Dataset,
+        as a :py:class:`.Matrix` which can be indexed by Variable name (or
+        position, if the Variable has no name). It is calculated from the
+        :py:meth:`covariance_matrix`, so the same single pass over the rows is
+        made.
+
+        :param int block_size: The number of rows to process at a time.
+        :rtype: ``Matrix``"""
+
+        covariances = self.covariance_matrix(block_size=block_size)
+        size = len(covariances)
+        deviations = [sqrt(covariances[index, index]) for index in range(size)]
+        return Matrix(covariances.names, [
+         covariances[row, column] / (deviations[row] * deviations[column])
+         for row in range(size) for column in range(row, size)
+        ])
+
+
+    def describe(self, workers=None, executor=None, chunk_size=100000):
+        """Returns summary statistics for every Variable in the Dataset - its
+        length, min, max, mean, variance, median and frequencies - as a
+        ``dict`` keyed by Variable name (or position, if the Variable has no
+        name). Non-numeric Variables have ``None`` for the statistics that
+        need numbers. Missing values are skipped, but counted in the length.
+
+        Each Variable is split into chunks of rows, and every chunk is
+        summarised separately as :py:class:`.Moments` and a frequency table.
+        These partial results are then merged exactly - the median comes from
+        the merged frequency table. This means the chunks can be summarised
+        in parallel, by giving a number of worker processes or an executor.
+
+        :param int workers: The number of processes to use.
+        :param executor: A ``concurrent.futures`` style executor to use.
+        :param int chunk_size: The number of rows in each chunk.
+        :raises ValueError: if two Variables have the same name.
+        :rtype: ``dict``"""
+
+        names = self._names()
+        tasks, owners = [], []
+        for index, variable in enumerate(self._variables):
+            for start in range(0, len(variable), chunk_size):
+                chunk = variable[start:start + chunk_size]
+                if isinstance(chunk, memoryview):
+                    chunk = array(chunk.format, chunk.tobytes())
+                tasks.append(chunk)
+                owners.append(index)
+        partials = parallel_map(
+         _summarise, tasks, workers=workers, executor=executor
+        )
+        merged = [[Moments(), Counter()] for _ in self._variables]
+        for index, (moments, frequencies) in zip(owners, partials):
+            total = merged[index]
+            total[0] = None if moments is None or total[0] is None else (
+             total[0].merge(moments)
+            )
+            total[1].update(frequencies)
+        description = {}
+        for index, variable in enumerate(self._variables):
+            moments, frequencies = merged[index]
+            numeric = moments is not None and len(moments) > 0
+            description[names[index]] = {
+             "length": len(variable),
+             "min": moments.min if numeric else None,
+             "max": moments.max if numeric else None,
+             "mean": moments.mean if numeric else None,
+             "variance": moments.variance() if numeric and (
+              len(moments) > 1
+             ) else None,
+             "median": _frequency_median(frequencies) if numeric else None,
+             "frequencies": frequencies
+            }
+        return description
+
+
+
+class Rows:
+    """A read-only view of the rows of a :py:class:`.Dataset`. The Dataset
+    stores its values column by column, in its Variables, and a row is only
+    put together when it is asked for - by indexing, which looks up one value
+    per Variable, or by iterating, which walks along every Variable at once.
+
+    Rows can be compared to a tuple of row tuples, and ``tuple(rows)`` will
+    build every row if that is really needed.
+
+    :param Dataset dataset: The Dataset whose rows these are."""
+
+    def __init__(self, dataset):
+        self._dataset = dataset
+
+
+    def __repr__(self):
+        return "<Rows ({} rows)>".format(len(self))
+
+
+    def __len__(self):
+        variables = self._dataset._variables
+        return len(variables[0]) if variables else 0
+
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return tuple(self._dataset.row(index) for index in range(
+             *key.indices(len(self))
+            ))
+        if not -len(self) <= key < len(self):
+            raise IndexError("Dataset has no row {}".format(key))
+        return self._dataset.row(key)
+
+
+    def __iter__(self):
+        yield from zip(*self._dataset._variables)
+
+
+    def __eq__(self, other):
+        if isinstance(other, Rows): other = tuple(other)
+        return tuple(self) == other
+
+
+
+def _summarise(values):
+    """Summarises a chunk of values as :py:class:`.Moments` and a frequency
+    table, so that it can be merged with other chunks. This is the unit of
+    work sent to each worker process by :py:meth:`.Dataset.describe`.
+
+    :param values: The values to summarise. Missing values are skipped.
+    :returns: ``(Moments, Counter)``, or ``(None, Counter)`` if the values\
+    aren't numeric."""
+
+    if None in values: values = [value for value in values if value is not None]
+    moments = Moments()
+    try:
+        moments.update(values)
+    except TypeError:
+        moments = None
+    return moments, Counter(values)
+
+
+def _frequency_median(frequencies):
+    """Finds the exact median of some values from their frequency table.
+
+    :param Counter frequencies: The frequency of each value.
+    :rtype: ``float``"""
+
+    length, seen, lower = sum(frequencies.values()), 0, None
+    for value in sorted(frequencies):
+        seen += frequencies[value]
+        if lower is None and seen > (length - 1) // 2: lower = value
+        if seen > length // 2:
+            return value if length % 2 else (lower + value) / 2
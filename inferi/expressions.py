@@ -0,0 +1,282 @@
+"""Contains the Expression class, for lazily evaluated Variable arithmetic."""
+
+from functools import partial
+import operator
+from operator import is_not
+from itertools import repeat
+from .moments import Moments
+
+class Expression:
+    """An Expression is a calculation on the values of one or more Variables
+    which hasn't been carried out yet. It is made by calling
+    :py:meth:`.Variable.lazy`, and then using the same elementwise operators
+    that Variables support:
+
+        >>> expression = ((variable.lazy() - variable.mean) / 2) ** 2
+
+    Each operator adds a step to the Expression rather than producing a new
+    set of values. When the Expression is finally evaluated - by
+    :py:meth:`compute`, or by a reduction such as :py:attr:`sum` - the steps
+    are chained together so that each value passes through the whole
+    calculation in turn, in a single pass, and no intermediate values are ever
+    stored.
+
+    The values are read when the Expression is evaluated, not when it is
+    made, so an Expression can be evaluated again after its Variables have
+    changed.
+
+    As with Variables, missing values (``None``) stay missing through every
+    step, and are skipped by the reductions.
+
+    :param values: The values the Expression starts from - usually a\
+    :py:class:`.Variable`."""
+
+    def __init__(self, values):
+        self._function, self._operands = None, (values,)
+        self._length = len(values)
+
+
+    def __repr__(self):
+        return "<Expression ({} values)>".format(self._length)
+
+
+    def __len__(self):
+        return self._length
+
+
+    def __iter__(self):
+        return self._evaluate()
+
+
+    def _apply(self, function, other=None, reverse=False):
+        """Creates a new Expression which applies a function to the values of
+        this one, with the matching value of another Expression or Variable,
+        or a constant, as the other argument.
+
+        :param function: The function to apply.
+        :param other: An Expression or Variable of the same length, or a\
+        constant. If ``None``, the function only takes one argument.
+        :param bool reverse: If ``True``, the other value will be the first\
+        argument.
+        :raises ValueError: if something of a different length is given.
+        :rtype: ``Expression``"""
+
+        operands = (self,)
+        if other is not None:
+            if not isinstance(other, Expression) and hasattr(other, "lazy"):
+                other = other.lazy()
+            if isinstance(other, Expression) and len(other) != self._length:
+                raise ValueError(
+                 "length {} is not length {}".format(self._length, len(other))
+                )
+            operands = (other, self) if reverse else (self, other)
+        expression = Expression.__new__(Expression)
+        expression._function, expression._operands = function, operands
+        expression._length = self._length
+        return expression
+
+
+    def _evaluate(self):
+        """Returns an iterator over the values of the Expression. Every step is
+        a ``map`` over the iterators of its operands, so asking for one value
+        pulls one value through the whole chain of steps. If any values are
+        missing, every step is wrapped so that they stay missing.
+
+        :rtype: ``iterator``"""
+
+        return self._chain(self._has_missing())
+
+
+    def _has_missing(self):
+        """Returns ``True`` if any of the values the Expression starts from
+        are missing. For a Variable this is already known, so nothing needs
+        to be read.
+
+        :rtype: ``bool``"""
+
+        if self._function is None: return None in self._operands[0]
+        return any(
+         operand._has_missing() for operand in self._operands
+         if isinstance(operand, Expression)
+        )
+
+
+    def _chain(self, skip_missing):
+        """Builds the chain of ``map`` iterators for the Expression.
+
+        :param bool skip_missing: If ``True``, every step will give ``None``\
+        when any of its arguments is ``None``.
+        :rtype: ``iterator``"""
+
+        from .variables import _skip_missing
+        if self._function is None: return iter(self._operands[0])
+        function = self._function
+        if skip_missing: function = _skip_missing(function)
+        return map(function, *[
+         operand._chain(skip_missing) if isinstance(operand, Expression)
+         else repeat(operand, self._length) for operand in self._operands
+        ])
+
+
+    def _present(self):
+        """Returns an iterator over the values of the Expression which aren't
+        missing.
+
+        :rtype: ``iterator``"""
+
+        if not self._has_missing(): return self._chain(False)
+        return filter(partial(is_not, None), self._chain(True))
+
+
+    def __add__(self, other):
+        return self._apply(operator.add, other)
+
+
+    def __radd__(self, other):
+        return self._apply(operator.add, other, True)
+
+
+    def __sub__(self, other):
+        return self._apply(operator.sub, other)
+
+
+    def __rsub__(self, other):
+        return self._apply(operator.sub, other, True)
+
+
+    def __mul__(self, other):
+        return self._apply(operator.mul, other)
+
+
+    def __rmul__(self, other):
+        return self._apply(operator.mul, other, True)
+
+
+    def __truediv__(self, other):
+        return self._apply(operator.truediv, other)
+
+
+    def __rtruediv__(self, other):
+        return self._apply(operator.truediv, other, True)
+
+
+    def __pow__(self, other):
+        return self._apply(operator.pow, other)
+
+
+    def __rpow__(self, other):
+        return self._apply(operator.pow, other, True)
+
+
+    def __lt__(self, other):
+        return self._apply(operator.lt, other)
+
+
+    def __le__(self, other):
+        return self._apply(operator.le, other)
+
+
+    def __gt__(self, other):
+        return self._apply(operator.gt, other)
+
+
+    def __ge__(self, other):
+        return self._apply(operator.ge, other)
+
+
+    def __neg__(self):
+        return self._apply(operator.neg)
+
+
+    def __abs__(self):
+        return self._apply(abs)
+
+
+    def compute(self, name="", dtype=None):
+        """Evaluates the Expression, returning its values as a new
+        :py:class:`.Variable`.
+
+        :param str name: The name of the new Variable.
+        :param str dtype: If given, the values will be stored as this dtype.
+        :rtype: ``Variable``"""
+
+        from .variables import Variable
+        return Variable(self._evaluate(), name=name, dtype=dtype)
+
+
+    @property
+    def length(self):
+        """Returns the number of values the Expression produces.
+
+        :rtype: ``int``"""
+
+        return len(self)
+
+
+    @property
+    def sum(self):
+        """Evaluates the Expression and returns the sum of its values, without
+        storing them."""
+
+        return sum(self._present())
+
+
+    @property
+    def mean(self):
+        """Evaluates the Expression and returns the mean of its values, without
+        storing them. If any are missing, they are left out of the count as
+        well as the sum.
+
+        :rtype: ``float``"""
+
+        if self._has_missing(): return self.moments().mean
+        return self.sum / self._length
+
+
+    @property
+    def max(self):
+        """Evaluates the Expression and returns its largest value, without
+        storing the values."""
+
+        return max(self._present())
+
+
+    @property
+    def min(self):
+        """Evaluates the Expression and returns its smallest value, without
+        storing the values."""
+
+        return min(self._present())
+
+
+    def moments(self):
+        """Evaluates the Expression and summarises its values as
+        :py:class:`.Moments`, in a single pass, without storing them.
+
+        :rtype: ``Moments``"""
+
+        moments = Moments()
+        moments.update(self._present())
+        return moments
+
+
+    def variance(self, population=False):
+        """Evaluates the Expression and returns the variance of its values, in
+        a single pass, without storing them.
+
+        :param bool population: If ``True``, the population variance will be\
+        returned (default is ``False``).
+        :rtype: ``float``"""
+
+        return self.moments().variance(population=population)
+
+
+    def st_dev(self, population=False):
+        """Evaluates the Expression and returns the standard deviation of its
+        values, in a single pass, without storing them.
+
+        :param bool population: If ``True``, the population deviation will be\
+        returned (default is ``False``).
+        :rtype: ``float``"""
+
+        return self.moments().st_dev(population=population)
@@ -0,0 +1,161 @@
+"""Contains the Histogram class."""
+
+from bisect import bisect_right
+
+class Histogram:
+    """A Histogram counts how many values fall into each of a set of bins.
+    The bins are given by their edges - ``n + 1`` increasing numbers for ``n``
+    bins. Each bin includes its lower edge but not its upper edge, except the
+    last bin, which includes both. Values outside the edges aren't counted in
+    any bin, but the number below and above are kept.
+
+    If the edges are evenly spaced, a value's bin is worked out arithmetically
+    from its distance from the lowest edge. Otherwise it is found by a binary
+    search of the edges.
+
+    Values can be added to a Histogram after it is made, and Histograms with
+    the same edges can be merged, so a histogram of data split across many
+    places can be built in pieces.
+
+    :param edges: The edges of the bins.
+    :param values: An iterable of values to count. It will be consumed once.\
+    Missing values (``None``) are skipped.
+    :raises ValueError: if there are fewer than two edges, or they aren't\
+    increasing."""
+
+    def __init__(self, edges, values=()):
+        self._edges = tuple(edges)
+        if len(self._edges) < 2:
+            raise ValueError("A Histogram needs at least two edges")
+        if any(a >= b for a, b in zip(self._edges, self._edges[1:])):
+            raise ValueError("Edges {} aren't increasing".format(self._edges))
+        self._counts = [0] * (len(self._edges) - 1)
+        self._below, self._above = 0, 0
+        low, high, bins = self._edges[0], self._edges[-1], len(self._counts)
+        width = (high - low) / bins
+        self._uniform = all(
+         abs(edge - (low + index * width)) <= width * 1e-9
+         for index, edge in enumerate(self._edges)
+        )
+        self.update(values)
+
+
+    def __repr__(self):
+        return "<Histogram ({} bins)>".format(len(self._counts))
+
+
+    def __len__(self):
+        return len(self._counts)
+
+
+    def __eq__(self, other):
+        return isinstance(other, Histogram) and (
+         self._edges, self._counts, self._below, self._above
+        ) == (other._edges, other._counts, other._below, other._above)
+
+
+    def add(self, value):
+        """Counts a single new value.
+
+        :param value: The value to add."""
+
+        self.update((value,))
+
+
+    def update(self, values):
+        """Counts every value in an iterable, consuming it in a single pass.
+
+        :param values: The values to add."""
+
+        edges, counts = self._edges, self._counts
+        low, high, last = edges[0], edges[-1], len(counts) - 1
+        scale = len(counts) / (high - low)
+        for value in values:
+            if value is None: continue
+            if value < low:
+                self._below += 1
+            elif value > high:
+                self._above += 1
+            elif self._uniform:
+                index = min(int((value - low) * scale), last)
+                if value < edges[index]:
+                    index -= 1
+                elif index < last and value >= edges[index + 1]:
+                    index += 1
+                counts[index] += 1
+            else:
+                counts[min(bisect_right(edges, value) - 1, last)] += 1
+
+
+    def merge(self, other):
+        """Combines this Histogram with another with the same edges, returning
+        a new Histogram of both sets of values together.
+
+        :param Histogram other: The Histogram to merge with.
+        :raises TypeError: if something other than a Histogram is given.
+        :raises ValueError: if the Histograms have different edges.
+        :rtype: ``Histogram``"""
+
+        if not isinstance(other, Histogram):
+            raise TypeError("{} is not a Histogram".format(other))
+        if self._edges != other._edges:
+            raise ValueError("Can't merge Histograms with different edges")
+        histogram = Histogram(self._edges)
+        histogram._counts = [a + b for a, b in zip(self._counts, other._counts)]
+        histogram._below = self._below + other._below
+        histogram._above = self._above + other._above
+        return histogram
+
+
+    @property
+    def edges(self):
+        """Returns the edges of the bins.
+
+        :rtype: ``tuple``"""
+
+        return self._edges
+
+
+    @property
+    def counts(self):
+        """Returns the number of values in each bin.
+
+        :rtype: ``tuple``"""
+
+        return tuple(self._counts)
+
+
+    @property
+    def bins(self):
+        """Returns each bin as a ``(lower edge, upper edge, count)`` tuple.
+
+        :rtype: ``tuple``"""
+
+        return tuple(zip(self._edges, self._edges[1:], self._counts))
+
+
+    @property
+    def below(self):
+        """Returns the number of values below the lowest edge.
+
+        :rtype: ``int``"""
+
+        return self._below
+
+
+    @property
+    def above(self):
+        """Returns the number of values above the highest edge.
+
+        :rtype: ``int``"""
+
+        return self._above
+
+
+    @property
+    def total(self):
+        """Returns the number of values counted in the bins.
+
+        :rtype: ``int``"""
+
+        return sum(self._counts)
@@ -0,0 +1,253 @@
+"""Contains structures which Variables can keep up to date as they change,
+to make certain statistics quick to look up."""
+
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from itertools import accumulate, chain
+
+class SortedIndex:
+    """A SortedIndex keeps a copy of some values in sorted order, and stays
+    sorted as values are added and removed, so that order-based statistics
+    can be looked up rather than recalculated.
+
+    The values are held in a list of sorted blocks of roughly equal size,
+    along with the largest value in each block. Finding a value's place means
+    a binary search of the block maximums and then of a single block, and
+    adding or removing a value only shifts the values in one block.
+
+    :param values: The initial values."""
+
+    _LOAD = 1000
+
+    def __init__(self, values=()):
+        self._fill(sorted(values))
+
+
+    def _fill(self, values):
+        """Replaces the contents of the index with some values which are
+        already sorted, splitting them into blocks.
+
+        :param list values: The sorted values."""
+
+        self._blocks = [
+         values[i:i + self._LOAD] for i in range(0, len(values), self._LOAD)
+        ]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._length = len(values)
+        self._offsets = None
+
+
+    def __repr__(self):
+        return "<SortedIndex ({} values)>".format(self._length)
+
+
+    def __len__(self):
+        return self._length
+
+
+    def __iter__(self):
+        for block in self._blocks: yield from block
+
+
+    def __getitem__(self, index):
+        if index < 0: index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("SortedIndex index out of range")
+        offsets = self._get_offsets()
+        block = bisect_right(offsets, index) - 1
+        return self._blocks[block][index - offsets[block]]
+
+
+    def _get_offsets(self):
+        """Returns the position of each block's first value, recalculating
+        them if the blocks have changed since they were last needed.
+
+        :rtype: ``list``"""
+
+        if self._offsets is None:
+            self._offsets = [0] + list(
+             accumulate(len(block) for block in self._blocks[:-1])
+            )
+        return self._offsets
+
+
+    def add(self, value):
+        """Adds a value to the index, in its sorted position.
+
+        :param value: The value to add."""
+
+        if not self._blocks:
+            self._blocks.append([value])
+            self._maxes.append(value)
+        else:
+            block = min(bisect_left(self._maxes, value), len(self._maxes) - 1)
+            insort(self._blocks[block], value)
+            self._maxes[block] = self._blocks[block][-1]
+            if len(self._blocks[block]) > 2 * self._LOAD:
+                half = self._blocks[block][self._LOAD:]
+                del self._blocks[block][self._LOAD:]
+                self._blocks.insert(block + 1, half)
+                self._maxes.insert(block, self._blocks[block][-1])
+        self._length += 1
+        self._offsets = None
+
+
+    def update(self, values):
+        """Adds several values to the index. A few values are added one at a
+        time, but a larger batch is appended to the sorted values and the
+        whole is sorted again - which, as the existing values are already in
+        order, is a single merge of the two.
+
+        :param values: The values to add."""
+
+        values = list(values)
+        if len(values) < self._LOAD:
+            for value in values: self.add(value)
+        else:
+            self._fill(sorted(chain(self, values)))
+
+
+    def remove(self, value):
+        """Removes one occurrence of a value from the index.
+
+        :param value: The value to remove.
+        :raises ValueError: if the value is not in the index."""
+
+        block = bisect_left(self._maxes, value)
+        if block < len(self._blocks):
+            position = bisect_left(self._blocks[block], value)
+            if self._blocks[block][position] == value:
+                del self._blocks[block][position]
+                if self._blocks[block]:
+                    self._maxes[block] = self._blocks[block][-1]
+                else:
+                    del self._blocks[block], self._maxes[block]
+                self._length -= 1
+                self._offsets = None
+                return
+        raise ValueError("{} is not in the index".format(value))
+
+
+    def count_below(self, value):
+        """Returns the number of values in the index less than a given value.
+
+        :param value: The value to compare against.
+        :rtype: ``int``"""
+
+        block = bisect_left(self._maxes, value)
+        if block == len(self._blocks): return self._length
+        return self._get_offsets()[block] + bisect_left(
+         self._blocks[block], value
+        )
+
+
+
+class FrequencyTable:
+    """A FrequencyTable counts how many times each value occurs, and stays up
+    to date as values are added and removed, so that the frequencies and the
+    mode never need to be recounted from scratch.
+
+    As well as the count of each value, it keeps the set of values having
+    each count and the highest count, so the most frequent values can be
+    found without searching.
+
+    :param values: The initial values, or a mapping of values to their\
+    counts. They must be hashable."""
+
+    def __init__(self, values=()):
+        self._counts = Counter(values)
+        self._groups = {}
+        for value, count in self._counts.items():
+            self._groups.setdefault(count, set()).add(value)
+        self._highest = max(self._groups) if self._groups else 0
+
+
+    def __repr__(self):
+        return "<FrequencyTable ({} values)>".format(len(self._counts))
+
+
+    def __len__(self):
+        return len(self._counts)
+
+
+    def _move(self, value, old_count, new_count):
+        """Moves a value from the group of values with one count to the group
+        with another.
+
+        :param value: The value whose count has changed.
+        :param int old_count: Its previous count.
+        :param int new_count: Its new count."""
+
+        if old_count:
+            group = self._groups[old_count]
+            group.discard(value)
+            if not group:
+                del self._groups[old_count]
+                if old_count == self._highest: self._highest = new_count
+        if new_count:
+            self._groups.setdefault(new_count, set()).add(value)
+            self._highest = max(self._highest, new_count)
+
+
+    def add(self, value):
+        """Counts one more occurrence of a value.
+
+        :param value: The value to add."""
+
+        count = self._counts[value]
+        self._counts[value] = count + 1
+        self._move(value, count, count + 1)
+
+
+    def update(self, values):
+        """Counts several new values at once. They are counted among
+        themselves first, so each distinct value's count only changes once.
+
+        :param values: The values to add."""
+
+        for value, added in Counter(values).items():
+            count = self._counts[value]
+            self._counts[value] = count + added
+            self._move(value, count, count + added)
+
+
+    def remove(self, value):
+        """Counts one less occurrence of a value.
+
+        :param value: The value to remove.
+        :raises ValueError: if the value has no occurrences."""
+
+        count = self._counts.get(value, 0)
+        if not count: raise ValueError("{} is not in the table".format(value))
+        if count == 1:
+            del self._counts[value]
+        else:
+            self._counts[value] = count - 1
+        self._move(value, count, count - 1)
+
+
+    @property
+    def counts(self):
+        """Returns the number of occurrences of each value.
+
+        :rtype: ``Counter``"""
+
+        return Counter(self._counts)
+
+
+    @property
+    def highest(self):
+        """Returns the highest number of occurrences of any value.
+
+        :rtype: ``int``"""
+
+        return self._highest
+
+
+    @property
+    def most_frequent(self):
+        """Returns the set of values which occur most often.
+
+        :rtype: ``set``"""
+
+        return set(self._groups.get(self._highest, ()))
@@ -0,0 +1,96 @@
+"""Contains the Matrix class."""
+
+class Matrix:
+    """A square, symmetric table of values relating a set of named things to
+    each other - such as the covariances of the Variables in a
+    :py:class:`.Dataset`.
+
+    As the value at ``(a, b)`` is always the value at ``(b, a)``, only the
+    upper triangle is stored. Values can be looked up by name or by position:
+
+        >>> matrix["height", "age"]
+        0.42
+        >>> matrix[0, 1]
+        0.42
+
+    :param names: The names of the rows (and columns).
+    :param list triangle: The values of the upper triangle, row by row.
+    :raises ValueError: if any name is used more than once.
+    :raises ValueError: if the triangle is the wrong size for the names."""
+
+    def __init__(self, names, triangle):
+        self._names = tuple(names)
+        if len(set(self._names)) != len(self._names):
+            raise ValueError("Matrix names {} aren't unique".format(
+             self._names
+            ))
+        size = len(self._names)
+        if len(triangle) != size * (size + 1) // 2:
+            raise ValueError("{} values can't fill a {}x{} triangle".format(
+             len(triangle), size, size
+            ))
+        self._triangle = list(triangle)
+
+
+    def __repr__(self):
+        return "<Matrix ({0}x{0})>".format(len(self._names))
+
+
+    def __len__(self):
+        return len(self._names)
+
+
+    def __getitem__(self, key):
+        row, column = sorted(map(self._position, key))
+        size = len(self._names)
+        return self._triangle[row * size - row * (row - 1) // 2 + column - row]
+
+
+    def _position(self, key):
+        """Turns a name or position into a position.
+
+        :param key: The name or position.
+        :raises KeyError: if the name isn't in the matrix.
+        :rtype: ``int``"""
+
+        if isinstance(key, int):
+            if not -len(self._names) <= key < len(self._names):
+                raise KeyError("No position {} in matrix".format(key))
+            return key % len(self._names)
+        try:
+            return self._names.index(key)
+        except ValueError:
+            raise KeyError("No name {} in matrix".format(key))
+
+
+    @property
+    def names(self):
+        """Returns the names of the matrix's rows and columns.
+
+        :rtype: ``tuple``"""
+
+        return self._names
+
+
+    @property
+    def rows(self):
+        """Returns the full matrix as rows of values.
+
+        :rtype: ``tuple``"""
+
+        size = range(len(self._names))
+        return tuple(
+         tuple(self[row, column] for column in size) for row in size
+        )
+
+
+    def row(self, key):
+        """Returns a single row of the matrix, as a ``dict`` of values keyed
+        by name.
+
+        :param key: The name or position of the row.
+        :rtype: ``dict``"""
+
+        return {
+         name: self[key, index] for index, name in enumerate(self._names)
+        }
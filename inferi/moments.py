@@ -0,0 +1,342 @@
+"""Contains classes for compact, mergeable summaries of Variables."""
+
+from math import sqrt
+from .exceptions import EmptyVariableError
+
+class Moments:
+    """A summary of a set of numerical values - their count, sum, mean, sum of
+    squared deviations from the mean, and extremes - from which the
+    statistics of the values can be calculated without the values themselves.
+
+    Moments summarising different sets of values can be merged to get the
+    Moments of all the values together, so statistics for a large dataset can
+    be calculated in pieces and then combined.
+
+    :param int length: The number of values summarised.
+    :param sum: The sum of the values.
+    :param mean: The mean of the values.
+    :param square_deviations: The sum of squared deviations from the mean.
+    :param min: The smallest value.
+    :param max: The largest value."""
+
+    def __init__(self, length=0, sum=0, mean=0, square_deviations=0,
+                 min=None, max=None):
+        self._length, self._sum, self._mean = length, sum, mean
+        self._square_deviations = square_deviations
+        self._min, self._max = min, max
+
+
+    def __repr__(self):
+        return "<Moments ({} values)>".format(self._length)
+
+
+    def __len__(self):
+        return self._length
+
+
+    def __eq__(self, other):
+        return isinstance(other, Moments) and self.to_dict() == other.to_dict()
+
+
+    def update(self, values):
+        """Updates the Moments with every value in an iterable, consuming it
+        in a single pass using Welford's algorithm.
+
+        :param values: The values to add."""
+
+        length, total, mean = self._length, self._sum, self._mean
+        square_deviations = self._square_deviations
+        smallest, largest = self._min, self._max
+        for value in values:
+            length += 1
+            total += value
+            delta = value - mean
+            mean += delta / length
+            square_deviations += delta * (value - mean)
+            if smallest is None or value < smallest: smallest = value
+            if largest is None or value > largest: largest = value
+        self._length, self._sum, self._mean = length, total, mean
+        self._square_deviations = square_deviations
+        self._min, self._max = smallest, largest
+
+
+    def merge(self, other):
+        """Combines these Moments with another set, returning new Moments which
+        summarise both sets of values together. Merging is associative, so
+        any number of Moments can be combined in any grouping.
+
+        :param Moments other: The Moments to merge with.
+        :raises TypeError: if something other than Moments is given.
+        :rtype: ``Moments``"""
+
+        if not isinstance(other, Moments):
+            raise TypeError("{} is not Moments".format(other))
+        if not other._length: return Moments(**self.to_dict())
+        if not self._length: return Moments(**other.to_dict())
+        length = self._length + other._length
+        delta = other._mean - self._mean
+        return Moments(
+         length=length,
+         sum=self._sum + other._sum,
+         mean=self._mean + delta * other._length / length,
+         square_deviations=self._square_deviations + other._square_deviations
+          + delta ** 2 * self._length * other._length / length,
+         min=min(self._min, other._min),
+         max=max(self._max, other._max)
+        )
+
+
+    def to_dict(self):
+        """Returns the Moments as a ``dict`` of plain values, suitable for
+        serialising. It can be turned back into Moments with
+        :py:meth:`from_dict`.
+
+        :rtype: ``dict``"""
+
+        return {
+         "length": self._length, "sum": self._sum, "mean": self._mean,
+         "square_deviations": self._square_deviations,
+         "min": self._min, "max": self._max
+        }
+
+
+    @staticmethod
+    def from_dict(d):
+        """Creates Moments from a ``dict`` produced by :py:meth:`to_dict`.
+
+        :param dict d: The serialised Moments.
+        :rtype: ``Moments``"""
+
+        return Moments(**d)
+
+
+    def _check_not_empty(self):
+        if not self._length:
+            raise EmptyVariableError("No values have been summarised")
+
+
+    @property
+    def length(self):
+        """The number of values summarised.
+
+        :rtype: ``int``"""
+
+        return len(self)
+
+
+    @property
+    def max(self):
+        """Returns the largest value.
+
+        :raises EmptyVariableError: if no values have been summarised."""
+
+        self._check_not_empty()
+        return self._max
+
+
+    @property
+    def min(self):
+        """Returns the smallest value.
+
+        :raises EmptyVariableError: if no values have been summarised."""
+
+        self._check_not_empty()
+        return self._min
+
+
+    @property
+    def sum(self):
+        """Returns the sum of the values."""
+
+        return self._sum
+
+
+    @property
+    def mean(self):
+        """Returns the mean of the values.
+
+        :raises EmptyVariableError: if no values have been summarised."""
+
+        self._check_not_empty()
+        return self._sum / self._length
+
+
+    @property
+    def range(self):
+        """Returns the difference between the largest and smallest values.
+
+        :raises EmptyVariableError: if no values have been summarised."""
+
+        return self.max - self.min
+
+
+    @property
+    def square_deviations(self):
+        """Returns the sum of the squared deviations of the values from their
+        mean."""
+
+        return self._square_deviations
+
+
+    def variance(self, population=False):
+        """Returns the variance of the values.
+
+        :param bool population: If ``True``, the population variance will be\
+        returned (default is ``False``).
+        :raises EmptyVariableError: if no values have been summarised.
+        :rtype: ``float``"""
+
+        self._check_not_empty()
+        return self._square_deviations / (self._length - (not population))
+
+
+    def st_dev(self, population=False):
+        """Returns the standard deviation of the values, the square root of
+        the :py:meth:`.variance`.
+
+        :param bool population: If ``True``, the population deviation will be\
+        returned (default is ``False``).
+        :raises EmptyVariableError: if no values have been summarised.
+        :rtype: ``float``"""
+
+        return sqrt(self.variance(population=population))
+
+
+
+class CoMoments:
+    """A summary of a set of paired numerical values, from which the
+    covariance and correlation of the two series can be calculated without the
+    values themselves. Like :py:class:`.Moments`, they can be merged.
+
+    :param Moments x: The Moments of the first series.
+    :param Moments y: The Moments of the second series.
+    :param co_deviations: The sum of the products of each pair's deviations\
+    from their means.
+    :raises ValueError: if the two Moments have different lengths."""
+
+    def __init__(self, x=None, y=None, co_deviations=0):
+        self._x = Moments() if x is None else x
+        self._y = Moments() if y is None else y
+        if self._x._length != self._y._length:
+            raise ValueError("length {} is not length {}".format(
+             self._x._length, self._y._length
+            ))
+        self._co_deviations = co_deviations
+
+
+    def __repr__(self):
+        return "<CoMoments ({} pairs)>".format(self._x._length)
+
+
+    def __len__(self):
+        return self._x._length
+
+
+    def __eq__(self, other):
+        return isinstance(other, CoMoments) and (
+         self.to_dict() == other.to_dict()
+        )
+
+
+    def update(self, pairs):
+        """Updates the CoMoments with every pair of values in an iterable,
+        consuming it in a single pass.
+
+        :param pairs: The ``(x, y)`` pairs to add."""
+
+        x, y, co_deviations = self._x, self._y, self._co_deviations
+        for value, other in pairs:
+            x_delta = value - x._mean
+            x.update((value,))
+            y.update((other,))
+            co_deviations += x_delta * (other - y._mean)
+        self._co_deviations = co_deviations
+
+
+    def merge(self, other):
+        """Combines these CoMoments with another set, returning new CoMoments
+        which summarise both sets of pairs together.
+
+        :param CoMoments other: The CoMoments to merge with.
+        :raises TypeError: if something other than CoMoments is given.
+        :rtype: ``CoMoments``"""
+
+        if not isinstance(other, CoMoments):
+            raise TypeError("{} is not CoMoments".format(other))
+        length = len(self) + len(other)
+        co_deviations = self._co_deviations + other._co_deviations
+        if len(self) and len(other):
+            co_deviations += (other._x._mean - self._x._mean) * (
+             other._y._mean - self._y._mean
+            ) * len(self) * len(other) / length
+        return CoMoments(
+         self._x.merge(other._x), self._y.merge(other._y), co_deviations
+        )
+
+
+    def to_dict(self):
+        """Returns the CoMoments as a ``dict`` of plain values, suitable for
+        serialising.
+
+        :rtype: ``dict``"""
+
+        return {
+         "x": self._x.to_dict(), "y": self._y.to_dict(),
+         "co_deviations": self._co_deviations
+        }
+
+
+    @staticmethod
+    def from_dict(d):
+        """Creates CoMoments from a ``dict`` produced by :py:meth:`to_dict`.
+
+        :param dict d: The serialised CoMoments.
+        :rtype: ``CoMoments``"""
+
+        return CoMoments(
+         Moments.from_dict(d["x"]), Moments.from_dict(d["y"]),
+         d["co_deviations"]
+        )
+
+
+    @property
+    def x(self):
+        """The :py:class:`.Moments` of the first series.
+
+        :rtype: ``Moments``"""
+
+        return self._x
+
+
+    @property
+    def y(self):
+        """The :py:class:`.Moments` of the second series.
+
+        :rtype: ``Moments``"""
+
+        return self._y
+
+
+    def covariance(self, population=False):
+        """Returns the covariance between the two series.
+
+        :param bool population: If ``True``, the population covariance will be\
+        returned (default is ``False``).
+        :raises EmptyVariableError: if no pairs have been summarised.
+        :rtype: ``float``"""
+
+        self._x._check_not_empty()
+        return self._co_deviations / (len(self) - (not population))
+
+
+    def correlation(self):
+        """Returns the correlation between the two series, normalised to be
+        between -1 and 1.
+
+        :raises EmptyVariableError: if no pairs have been summarised.
+        :rtype: ``float``"""
+
+        self._x._check_not_empty()
+        return self._co_deviations / sqrt(
+         self._x._square_deviations * self._y._square_deviations
+        )
@@ -0,0 +1,66 @@
+"""Contains tools for spreading work across processes."""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+_shared = None
+
+def parallel_map(function, tasks, workers=None, executor=None, shared=None):
+    """Applies a function to every task in an iterable and returns the
+    results in order, optionally spreading the tasks across several
+    processes.
+
+    If an executor is given - any object with a ``map`` method like those in
+    ``concurrent.futures`` - it will be used. Otherwise, if more than one
+    worker is asked for, a process pool of that size is created for the
+    duration of the call. Otherwise the tasks are run in this process.
+
+    The function must be defined at the top level of a module, and the tasks
+    and results must be picklable, for them to be sent to other processes.
+
+    Data which every task needs, such as the values being worked on, can be
+    given as ``shared``, and the function is then called with it before each
+    task. A process pool created here sends it to each worker process just
+    once, when the process starts, rather than with every task. A given
+    executor can't be set up this way, so it is sent with each task.
+
+    :param function: The function to apply.
+    :param tasks: The arguments to apply the function to.
+    :param int workers: The number of processes to use.
+    :param executor: An executor to run the tasks with.
+    :param shared: Data to give the function along with every task.
+    :raises ValueError: if workers is less than 1.
+    :rtype: ``list``"""
+
+    if workers is not None and workers < 1:
+        raise ValueError("workers {} must be at least 1".format(workers))
+    arguments = (tasks,) if shared is None else (repeat(shared), tasks)
+    if executor is not None:
+        return list(executor.map(function, *arguments))
+    if workers is None or workers == 1:
+        return list(map(function, *arguments))
+    if shared is None:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, tasks))
+    with ProcessPoolExecutor(
+     max_workers=workers, initializer=_share, initargs=(shared,)
+    ) as executor:
+        return list(executor.map(_call_with_shared, repeat(function), tasks))
+
+
+def _share(shared):
+    """Stores the shared data in a worker process, as it starts.
+
+    :param shared: The data given to :py:func:`parallel_map`."""
+
+    global _shared
+    _shared = shared
+
+
+def _call_with_shared(function, task):
+    """Calls a function with the worker process's shared data and a task.
+
+    :param function: The function to call.
+    :param task: The task to give it."""
+
+    return function(_shared, task)
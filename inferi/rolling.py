@@ -0,0 +1,268 @@
+"""Contains the Rolling class, for statistics over a moving window."""
+
+from collections import Counter, deque
+from heapq import heappop, heappush
+from math import sqrt
+
+class Rolling:
+    """A Rolling object calculates statistics of a :py:class:`.Variable` over
+    a window of consecutive values which moves along it one value at a time.
+    It is made by calling :py:meth:`.Variable.rolling`:
+
+        >>> variable.rolling(3).mean()
+        <Variable (4.0, 5.0, 6.0)>
+
+    Each statistic is returned as a new Variable with one value per window
+    position - ``length - window + 1`` values in all. Rather than each window
+    being summarised from scratch, the statistics are updated as each value
+    enters the window and each value leaves it, so a whole pass takes linear
+    time (or ``n log window`` for the median).
+
+    Missing values are skipped. If a window has no values which aren't
+    missing, its statistic is missing too.
+
+    :param Variable variable: The Variable to roll over.
+    :param int window: The number of values in each window.
+    :raises ValueError: if the window isn't between 1 and the Variable's\
+    length."""
+
+    def __init__(self, variable, window):
+        if not 1 <= window <= len(variable):
+            raise ValueError("Window {} doesn't fit {}".format(window, variable))
+        self._variable, self._window = variable, window
+
+
+    def __repr__(self):
+        return "<Rolling (window {})>".format(self._window)
+
+
+    @property
+    def window(self):
+        """Returns the number of values in each window.
+
+        :rtype: ``int``"""
+
+        return self._window
+
+
+    def _pairs(self):
+        """Returns an iterator of the values entering the window, along with
+        the values leaving it to make room - ``None`` until the window is
+        full.
+
+        :rtype: ``iterator``"""
+
+        values = list(self._variable)
+        return zip(values, [None] * self._window + values)
+
+
+    def _steps(self):
+        """Returns an iterator like :py:meth:`_pairs`, but with a third item -
+        every ``window`` positions, the values now in the window, and ``None``
+        otherwise. Running totals are recalculated from these, so that
+        rounding errors from updating them can't build up over the whole
+        Variable.
+
+        :rtype: ``iterator``"""
+
+        values, window = list(self._variable), self._window
+        windows = (
+         values[max(end - window, 0):end] if not end % window else None
+         for end in range(1, len(values) + 1)
+        )
+        return zip(values, [None] * window + values, windows)
+
+
+    def _collect(self, results):
+        """Creates a Variable from the statistic of each window, discarding
+        the results from before the first window was full.
+
+        :param results: The statistic after each value entered the window.
+        :rtype: ``Variable``"""
+
+        from .variables import Variable
+        results = list(results)[self._window - 1:]
+        return Variable(results, name=self._variable.name)
+
+
+    def sum(self):
+        """Returns the sum of each window, keeping a running total.
+
+        :rtype: ``Variable``"""
+
+        return self._collect(self._sums(mean=False))
+
+
+    def mean(self):
+        """Returns the mean of each window, keeping a running total.
+
+        :rtype: ``Variable``"""
+
+        return self._collect(self._sums(mean=True))
+
+
+    def _sums(self, mean):
+        total, count = 0, 0
+        for entering, leaving, window in self._steps():
+            if window is not None:
+                present = [value for value in window if value is not None]
+                total, count = sum(present), len(present)
+                entering = leaving = None
+            if entering is not None: total, count = total + entering, count + 1
+            if leaving is not None: total, count = total - leaving, count - 1
+            if not count:
+                yield None
+            else:
+                yield total / count if mean else total
+
+
+    def variance(self, population=False):
+        """Returns the variance of each window. The mean and sum of squared
+        deviations are updated by Welford's algorithm as each value enters,
+        and by its reverse as each value leaves. Every ``window`` values they
+        are recalculated from the window itself, so that rounding errors left
+        behind by large values which have since left don't persist.
+
+        :param bool population: If ``True``, the population variance will be\
+        returned (default is ``False``).
+        :rtype: ``Variable``"""
+
+        return self._collect(self._variances(population))
+
+
+    def st_dev(self, population=False):
+        """Returns the standard deviation of each window, the square root of
+        the :py:meth:`variance`.
+
+        :param bool population: If ``True``, the population deviation will be\
+        returned (default is ``False``).
+        :rtype: ``Variable``"""
+
+        return self._collect(
+         None if variance is None else sqrt(variance)
+         for variance in self._variances(population)
+        )
+
+
+    def _variances(self, population):
+        count, mean, square_deviations = 0, 0, 0
+        for entering, leaving, window in self._steps():
+            if window is not None:
+                present = [value for value in window if value is not None]
+                count = len(present)
+                mean = sum(present) / count if count else 0
+                square_deviations = sum(
+                 (value - mean) ** 2 for value in present
+                )
+                entering = leaving = None
+            if entering is not None:
+                count += 1
+                delta = entering - mean
+                mean += delta / count
+                square_deviations += delta * (entering - mean)
+            if leaving is not None:
+                count -= 1
+                if count:
+                    delta = leaving - mean
+                    mean -= delta / count
+                    square_deviations -= delta * (leaving - mean)
+                else:
+                    mean, square_deviations = 0, 0
+            if count - (not population) > 0:
+                yield max(square_deviations, 0) / (count - (not population))
+            else:
+                yield None
+
+
+    def min(self):
+        """Returns the smallest value in each window, using a deque of the
+        values which could still become the smallest.
+
+        :rtype: ``Variable``"""
+
+        return self._collect(self._extremes(lambda a, b: a <= b))
+
+
+    def max(self):
+        """Returns the largest value in each window, using a deque of the
+        values which could still become the largest.
+
+        :rtype: ``Variable``"""
+
+        return self._collect(self._extremes(lambda a, b: a >= b))
+
+
+    def _extremes(self, keeps):
+        """Yields the extreme value of each window. The deque holds the
+        positions of values in order, each of which beats every value after
+        it, so the extreme is always at the front and each value enters and
+        leaves the deque once.
+
+        :param keeps: A function which is ``True`` if its first argument\
+        should be kept over its second."""
+
+        candidates = deque()
+        for position, value in enumerate(self._variable):
+            if value is not None:
+                while candidates and not keeps(candidates[-1][1], value):
+                    candidates.pop()
+                candidates.append((position, value))
+            if candidates and candidates[0][0] <= position - self._window:
+                candidates.popleft()
+            yield candidates[0][1] if candidates else None
+
+
+    def median(self):
+        """Returns the median of each window. The smaller half of the window
+        is kept in a max-heap and the larger half in a min-heap, so the median
+        is always at the top of one or both. Values leaving the window are
+        only removed from a heap once they reach its top.
+
+        :rtype: ``Variable``"""
+
+        return self._collect(self._medians())
+
+
+    def _medians(self):
+        lower, upper, leaving_values = [], [], Counter()
+        sizes = [0, 0]
+
+        def prune(heap, sign):
+            while heap and leaving_values[sign * heap[0]]:
+                leaving_values[sign * heap[0]] -= 1
+                heappop(heap)
+
+        def balance():
+            if sizes[0] > sizes[1] + 1:
+                heappush(upper, -heappop(lower))
+                sizes[0], sizes[1] = sizes[0] - 1, sizes[1] + 1
+                prune(lower, -1)
+            elif sizes[0] < sizes[1]:
+                heappush(lower, -heappop(upper))
+                sizes[0], sizes[1] = sizes[0] + 1, sizes[1] - 1
+                prune(upper, 1)
+
+        for entering, leaving in self._pairs():
+            if entering is not None:
+                if not lower or entering <= -lower[0]:
+                    heappush(lower, -entering)
+                    sizes[0] += 1
+                else:
+                    heappush(upper, entering)
+                    sizes[1] += 1
+                balance()
+            if leaving is not None:
+                leaving_values[leaving] += 1
+                if leaving <= -lower[0]:
+                    sizes[0] -= 1
+                    prune(lower, -1)
+                else:
+                    sizes[1] -= 1
+                    prune(upper, 1)
+                balance()
+            if not sizes[0]:
+                yield None
+            elif sizes[0] > sizes[1]:
+                yield -lower[0]
+            else:
+                yield (upper[0] - lower[0]) / 2
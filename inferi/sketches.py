@@ -0,0 +1,214 @@
+"""Contains approximate summaries of data too large to hold in memory."""
+
+import random
+from math import ceil
+
+class QuantileSketch:
+    """A QuantileSketch estimates the median, percentiles and quantiles of a
+    set of values while storing only a small, bounded sample of them. It is
+    an implementation of the KLL sketch of Karnin, Lang and Liberty.
+
+    Values are kept in a hierarchy of compactors. When a compactor fills up,
+    its values are sorted and every other one is promoted to the compactor
+    above, where each stands in for twice as many of the original values.
+    The number of values stored depends on ``k`` rather than the number of
+    values seen, and the error in the rank of any estimate is of the order of
+    ``1 / k`` of the total count.
+
+    Sketches built from different sets of values can be merged.
+
+    :param values: An iterable of initial values. It will be consumed once.
+    :param int k: The size of the largest compactor, which controls the\
+    accuracy of the sketch (default is 200).
+    :param seed: An optional seed for the random choices made when compacting.
+    :raises TypeError: if k is not an integer.
+    :raises ValueError: if k is less than 8."""
+
+    _RATIO = 2 / 3
+
+    def __init__(self, values=(), k=200, seed=None):
+        if not isinstance(k, int):
+            raise TypeError("k {} must be integer".format(k))
+        if k < 8: raise ValueError("k {} must be at least 8".format(k))
+        self._k, self._random = k, random.Random(seed)
+        self._compactors, self._capacities = [], []
+        self._length, self._size, self._min, self._max = 0, 0, None, None
+        self._grow()
+        self.update(values)
+
+
+    def __repr__(self):
+        return "<QuantileSketch ({} values)>".format(self._length)
+
+
+    def __len__(self):
+        return self._length
+
+
+    def _grow(self):
+        """Adds a new compactor to the top of the hierarchy, shrinking the
+        capacities of those below it."""
+
+        self._compactors.append([])
+        height = len(self._compactors)
+        self._capacities = [
+         int(ceil(self._RATIO ** (height - level - 1) * self._k)) + 1
+         for level in range(height)
+        ]
+        self._max_size = sum(self._capacities)
+
+
+    def _compress(self):
+        """Compacts the lowest compactor that is over capacity, promoting half
+        of its values to the compactor above."""
+
+        for level, compactor in enumerate(self._compactors):
+            if len(compactor) >= self._capacities[level]:
+                if level + 1 == len(self._compactors): self._grow()
+                compactor.sort()
+                leftover = [compactor.pop()] if len(compactor) % 2 else []
+                offset = self._random.random() < 0.5
+                self._compactors[level + 1].extend(compactor[offset::2])
+                compactor[:] = leftover
+                self._size = sum(map(len, self._compactors))
+                if self._size < self._max_size: return
+
+
+    def add(self, value):
+        """Adds a single value to the sketch.
+
+        :param value: The value to add."""
+
+        self.update((value,))
+
+
+    def update(self, values):
+        """Adds every value in an iterable to the sketch, consuming it once.
+
+        :param values: The values to add."""
+
+        bottom = self._compactors[0]
+        for value in values:
+            if self._min is None or value < self._min: self._min = value
+            if self._max is None or value > self._max: self._max = value
+            bottom.append(value)
+            self._length += 1
+            self._size += 1
+            if self._size >= self._max_size:
+                self._compress()
+                bottom = self._compactors[0]
+
+
+    def merge(self, other):
+        """Combines this sketch with another, returning a new sketch of both
+        sets of values together.
+
+        :param QuantileSketch other: The sketch to merge with.
+        :raises TypeError: if something other than a QuantileSketch is given.
+        :raises ValueError: if the sketches have different values of k.
+        :rtype: ``QuantileSketch``"""
+
+        if not isinstance(other, QuantileSketch):
+            raise TypeError("{} is not a QuantileSketch".format(other))
+        if other._k != self._k:
+            raise ValueError("k {} is not k {}".format(other._k, self._k))
+        merged = QuantileSketch(k=self._k)
+        merged._random.setstate(self._random.getstate())
+        while len(merged._compactors) < max(
+         len(self._compactors), len(other._compactors)
+        ): merged._grow()
+        for sketch in (self, other):
+            for level, compactor in enumerate(sketch._compactors):
+                merged._compactors[level].extend(compactor)
+        merged._length = self._length + other._length
+        merged._size = sum(map(len, merged._compactors))
+        extremes = [v for v in (self._min, self._max, other._min, other._max)
+         if v is not None]
+        if extremes: merged._min, merged._max = min(extremes), max(extremes)
+        while merged._size >= merged._max_size: merged._compress()
+        return merged
+
+
+    def quantile(self, q):
+        """Returns an estimate of the value below which a given fraction of the
+        values lie.
+
+        :param q: The fraction, between 0 and 1.
+        :raises ValueError: if q is not between 0 and 1.
+        :raises ValueError: if the sketch is empty."""
+
+        return self._quantiles([q])[0]
+
+
+    def _quantiles(self, qs):
+        if any(q < 0 or q > 1 for q in qs):
+            raise ValueError("Quantiles must be between 0 and 1")
+        if not self._length:
+            raise ValueError("Cannot get quantiles of an empty sketch")
+        weighted = sorted(
+         (value, 2 ** level) for level, compactor in enumerate(self._compactors)
+         for value in compactor
+        )
+        total, results = sum(w for _, w in weighted), []
+        for q in qs:
+            if q == 0: results.append(self._min)
+            elif q == 1: results.append(self._max)
+            else:
+                target, cumulative = q * total, 0
+                for value, weight in weighted:
+                    cumulative += weight
+                    if cumulative >= target: break
+                results.append(value)
+        return results
+
+
+    @property
+    def length(self):
+        """The number of values the sketch has seen.
+
+        :rtype: ``int``"""
+
+        return len(self)
+
+
+    @property
+    def min(self):
+        """Returns the smallest value seen - this is exact."""
+
+        return self._min
+
+
+    @property
+    def max(self):
+        """Returns the largest value seen - this is exact."""
+
+        return self._max
+
+
+    @property
+    def median(self):
+        """Returns an estimate of the median value."""
+
+        return self.quantile(0.5)
+
+
+    def percentile(self, p):
+        """Returns an estimate of the value below which a given percentage of
+        the values lie.
+
+        :param p: The percentage, between 0 and 100.
+        :raises ValueError: if p is not between 0 and 100."""
+
+        return self.quantile(p / 100)
+
+
+    def quantiles(self, n=4):
+        """Returns estimates of the ``n - 1`` cut points which divide the values
+        into ``n`` groups of equal size - the quartiles by default.
+
+        :param int n: The number of groups (default is 4).
+        :raises ValueError: if n is less than 1.
+        :rtype: ``list``"""
+
+        if n < 1: raise ValueError("n {} must be at least 1".format(n))
+        return self._quantiles([i / n for i in range(1, n)])
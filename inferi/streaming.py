@@ -0,0 +1,332 @@
+"""Contains the StreamingVariable and ExponentialVariable classes."""
+
+from math import sqrt
+from .moments import Moments
+from .exceptions import EmptyVariableError
+
+class StreamingVariable:
+    """A StreamingVariable calculates the summary statistics of a sequence of
+    measurements without storing the measurements themselves. This makes it
+    suitable for data which is too large to fit in memory, or which arrives
+    over time.
+
+    It has the same statistics as a :py:class:`.Variable`, but as the values
+    are not kept, it is not a container of them. Only a handful of running
+    totals, held as :py:class:`.Moments`, are stored however many values are
+    seen.
+
+    :param values: An iterable of initial values. It will be consumed once.
+    :param str name: The name of the StreamingVariable.
+    :raises TypeError: if the name given isn't a string."""
+
+    def __init__(self, values=(), name=""):
+        if not isinstance(name, str):
+            raise TypeError("name '{}' is not a str".format(name))
+        self._name = name
+        self._moments = Moments()
+        self.update(values)
+
+
+    def __repr__(self):
+        if self._name:
+            return "<StreamingVariable '{}' ({} values)>".format(
+             self._name, len(self)
+            )
+        return "<StreamingVariable ({} values)>".format(len(self))
+
+
+    def __len__(self):
+        return len(self._moments)
+
+
+    def add(self, value):
+        """Updates the statistics with a single new value.
+
+        :param value: The value to add."""
+
+        self._moments.update((value,))
+
+
+    def update(self, values):
+        """Updates the statistics with every value in an iterable, consuming it
+        in a single pass.
+
+        :param values: The values to add."""
+
+        self._moments.update(values)
+
+
+    def moments(self):
+        """Returns the :py:class:`.Moments` summarising the values seen so far,
+        which can be serialised or merged with those of other streams.
+
+        :rtype: ``Moments``"""
+
+        return Moments(**self._moments.to_dict())
+
+
+    @property
+    def name(self):
+        """Returns the name of the StreamingVariable.
+
+        :raises TypeError: if the name set is not a string."""
+
+        return self._name
+
+
+    @name.setter
+    def name(self, name):
+        if not isinstance(name, str):
+            raise TypeError("name '{}' is not a str".format(name))
+        self._name = name
+
+
+    @property
+    def length(self):
+        """The number of values seen so far.
+
+        :rtype: ``int``"""
+
+        return len(self)
+
+
+    @property
+    def max(self):
+        """Returns the largest value seen.
+
+        :raises EmptyVariableError: if no values have been seen."""
+
+        return self._moments.max
+
+
+    @property
+    def min(self):
+        """Returns the smallest value seen.
+
+        :raises EmptyVariableError: if no values have been seen."""
+
+        return self._moments.min
+
+
+    @property
+    def sum(self):
+        """Returns the sum of the values seen."""
+
+        return self._moments.sum
+
+
+    @property
+    def mean(self):
+        """Returns the mean of the values seen.
+
+        :raises EmptyVariableError: if no values have been seen."""
+
+        return self._moments.mean
+
+
+    @property
+    def range(self):
+        """Returns the difference between the largest and smallest values
+        seen.
+
+        :raises EmptyVariableError: if no values have been seen."""
+
+        return self._moments.range
+
+
+    def variance(self, population=False):
+        """Returns the variance of the values seen, using the same running
+        totals as :py:meth:`.Variable.variance`.
+
+        :param bool population: If ``True``, the population variance will be\
+        returned (default is ``False``).
+        :raises EmptyVariableError: if no values have been seen.
+        :rtype: ``float``"""
+
+        return self._moments.variance(population=population)
+
+
+    def st_dev(self, population=False):
+        """Returns the standard deviation of the values seen, the square root
+        of the :py:meth:`.variance`.
+
+        :param bool population: If ``True``, the population deviation will be\
+        returned (default is ``False``).
+        :raises EmptyVariableError: if no values have been seen.
+        :rtype: ``float``"""
+
+        return self._moments.st_dev(population=population)
+
+
+
+class ExponentialVariable:
+    """An ExponentialVariable keeps an exponentially weighted mean and
+    variance of a sequence of measurements, in which each value counts for
+    less the older it is. This makes it suitable for monitoring a live stream,
+    where the recent values matter most. Each new value updates the
+    statistics in constant time, and nothing else is stored.
+
+    How quickly old values fade is given either as a half-life - the number of
+    values after which a value's weight has halved - or directly as the
+    weight ``alpha`` of each new value.
+
+    Missing values (``None``) are skipped.
+
+    :param values: An iterable of initial values. It will be consumed once.
+    :param half_life: The number of values it takes for a weight to halve.
+    :param alpha: The weight given to each new value, between 0 and 1.
+    :param str name: The name of the ExponentialVariable.
+    :raises ValueError: if neither or both of half_life and alpha are given,\
+    or if they are out of range.
+    :raises TypeError: if the name given isn't a string."""
+
+    def __init__(self, values=(), half_life=None, alpha=None, name=""):
+        if (half_life is None) == (alpha is None):
+            raise ValueError("Give exactly one of half_life and alpha")
+        if half_life is not None:
+            if half_life <= 0:
+                raise ValueError("half_life {} isn't positive".format(half_life))
+            alpha = 1 - 0.5 ** (1 / half_life)
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha {} isn't between 0 and 1".format(alpha))
+        if not isinstance(name, str):
+            raise TypeError("name '{}' is not a str".format(name))
+        self._alpha, self._name = alpha, name
+        self._length, self._mean, self._variance = 0, None, 0
+        self.update(values)
+
+
+    def __repr__(self):
+        if self._name:
+            return "<ExponentialVariable '{}' ({} values)>".format(
+             self._name, len(self)
+            )
+        return "<ExponentialVariable ({} values)>".format(len(self))
+
+
+    def __len__(self):
+        return self._length
+
+
+    def add(self, value):
+        """Updates the statistics with a single new value.
+
+        :param value: The value to add."""
+
+        self.update((value,))
+
+
+    def update(self, values):
+        """Updates the statistics with every value in an iterable, consuming it
+        in a single pass.
+
+        :param values: The values to add."""
+
+        for _ in self._means(values): pass
+
+
+    def smooth(self, values):
+        """Updates the statistics with every value in an iterable, and returns
+        a :py:class:`.Variable` of the weighted mean after each one - a
+        smoothed version of the values, made in a single pass.
+
+        :param values: The values to add.
+        :rtype: ``Variable``"""
+
+        from .variables import Variable
+        return Variable(list(self._means(values)), name=self._name)
+
+
+    def _means(self, values):
+        """Adds each value in turn, yielding the weighted mean after each. The
+        variance is updated incrementally as described by Finch (2009).
+
+        :param values: The values to add."""
+
+        alpha, length = self._alpha, self._length
+        mean, variance = self._mean, self._variance
+        try:
+            for value in values:
+                if value is not None:
+                    length += 1
+                    if mean is None:
+                        mean = value
+                    else:
+                        difference = value - mean
+                        increment = alpha * difference
+                        mean += increment
+                        variance = (1 - alpha) * (
+                         variance + difference * increment
+                        )
+                yield mean
+        finally:
+            self._length, self._mean, self._variance = length, mean, variance
+
+
+    def _check_not_empty(self):
+        if not self._length:
+            raise EmptyVariableError("No values have been seen")
+
+
+    @property
+    def name(self):
+        """Returns the name of the ExponentialVariable.
+
+        :raises TypeError: if the name set is not a string."""
+
+        return self._name
+
+
+    @name.setter
+    def name(self, name):
+        if not isinstance(name, str):
+            raise TypeError("name '{}' is not a str".format(name))
+        self._name = name
+
+
+    @property
+    def alpha(self):
+        """Returns the weight given to each new value.
+
+        :rtype: ``float``"""
+
+        return self._alpha
+
+
+    @property
+    def length(self):
+        """The number of values seen so far.
+
+        :rtype: ``int``"""
+
+        return len(self)
+
+
+    @property
+    def mean(self):
+        """Returns the exponentially weighted mean of the values seen.
+
+        :raises EmptyVariableError: if no values have been seen."""
+
+        self._check_not_empty()
+        return self._mean
+
+
+    def variance(self):
+        """Returns the exponentially weighted variance of the values seen.
+
+        :raises EmptyVariableError: if no values have been seen.
+        :rtype: ``float``"""
+
+        self._check_not_empty()
+        return self._variance
+
+
+    def st_dev(self):
+        """Returns the exponentially weighted standard deviation of the values
+        seen, the square root of the :py:meth:`.variance`.
+
+        :raises EmptyVariableError: if no values have been seen.
+        :rtype: ``float``"""
+
+        return sqrt(self.variance())
@@ -1,8 +1,52 @@
 """Contains the base Variable class."""
 
+from array import array
+from bisect import bisect_right, insort
+import builtins
 from collections import Counter
+from functools import wraps
+from itertools import compress, groupby, repeat
 from math import sqrt
+import mmap
+import operator
+import os
+from operator import and_, is_not, lt, not_
+import random
 from .exceptions import EmptyVariableError
+from .moments import Moments, CoMoments
+from .sketches import QuantileSketch
+from .indexes import SortedIndex, FrequencyTable
+from .histograms import Histogram
+from .bootstrap import bootstrap
+from .expressions import Expression
+from .rolling import Rolling
+from .streaming import ExponentialVariable
+
+TYPECODES = {
+ "f8": "d", "f4": "f", "i8": "q", "i4": "i", "i2": "h", "i1": "b",
+ "u8": "Q", "u4": "I", "u2": "H", "u1": "B"
+}
+
+def _cached(method):
+    """Decorator for Variable statistics which stores the result in the
+    Variable's statistics cache, so that it is only calculated again once the
+    values have changed.
+
+    :param method: The method to wrap.
+    :rtype: ``function``"""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = method.__name__
+        if args or kwargs: key = (key, args, tuple(sorted(kwargs.items())))
+        try:
+            return self._cache[key]
+        except KeyError:
+            result = self._cache[key] = method(self, *args, **kwargs)
+            return result
+    return wrapper
+
+
 
 class Variable:
     """A Variable represents an ordered sequence of measurements. It is `not`
@@ -12,32 +56,136 @@ class Variable:
     A Variable is a container `and` an iterable of its values, and in many
     respects behaves like a ``list``.
 
+    Arithmetic (``+``, ``-``, ``*``, ``/``, ``**``), ordering comparisons
+    (``<``, ``<=``, ``>``, ``>=``), negation and ``abs`` work elementwise,
+    between two Variables of the same length or between a Variable and a
+    constant, producing a new Variable. The in-place forms (``+=`` etc.)
+    replace the Variable's values. Equality is not elementwise - two Variables
+    are only equal if they are the same object.
+
     :param \*values: The values to go into the Variable. These will usually be\
     numerical, but can be any type. If you provide one value, which is iterable,\
     and which isn't a string, the values of that iterable will become the values\
     of the Variable.
     :param str name: The name of the Variable.
+    :param str dtype: If given, the values will be stored in a compact typed\
+    array rather than a list. This must be one of the keys of ``TYPECODES``,\
+    such as ``"f8"`` for 64-bit floats or ``"i4"`` for 32-bit integers, or\
+    ``"category"`` for categorical storage.
+    :param bool indexed: If ``True``, a :py:class:`.SortedIndex` of the values\
+    will be kept, making the median, percentiles and ranks quick to look up.
     :raises EmptyVariableError: if no values are given.
-    :raises TypeError: if the name given isn't a string."""
-
-    def __init__(self, *values, name=""):
+    :raises TypeError: if the name given isn't a string.
+    :raises ValueError: if an unknown dtype is given.
+
+    Summary statistics are cached once calculated, and the cache is kept up to
+    date as the Variable is modified, so asking for the same statistic twice
+    doesn't mean going through all the values twice.
+
+    ``None`` is treated as a missing value. Missing values keep their place
+    in the Variable, but every statistic skips them. Alongside the values, a
+    validity mask of one byte per value records which are present, so that
+    typed storage (which can't hold ``None``) can have gaps too. The mask is
+    only created once a value is missing, so complete Variables pay nothing
+    for it.
+
+    Categorical storage suits Variables with only a few distinct values, such
+    as regions or statuses. Each distinct value is stored once, in a list of
+    categories, and the Variable itself is a compact array of integer codes
+    into that list - one byte per value while there are no more than 256
+    categories. Counting frequencies, finding :py:meth:`positions` and
+    sorting a :py:class:`.Dataset` then work on the codes rather than the
+    values."""
+
+    def __init__(self, *values, name="", dtype=None, indexed=False):
         if len(values) == 0:
             raise EmptyVariableError("Cannot create Variable with no values")
         if len(values) == 1 and not isinstance(values[0], str):
             try:
-                self._values = list(values[0])
-                return
-            except: pass
-        self._values = list(values)
+                values = iter(values[0])
+            except TypeError: pass
+        if dtype is not None and dtype not in TYPECODES and dtype != "category":
+            raise ValueError("'{}' is not a valid dtype".format(dtype))
         if not isinstance(name, str):
             raise TypeError("name '{}' is not a str".format(name))
         self._name = name
+        self._dtype = dtype
+        self._categories = [] if dtype == "category" else None
+        self._category_codes = {}
+        self._values, self._valid, self._missing = self._store(values)
+        self._cache = {}
+        self._index = SortedIndex(self._present()) if indexed else None
+        self._frequency_table = None
+
+
+    @staticmethod
+    def from_file(path, dtype, offset=0, name=""):
+        """Creates a Variable from a binary file of packed numbers, by mapping
+        the file into memory rather than reading it. The values are read
+        straight from the file's pages by the operating system as they are
+        needed, so there is no copying and files larger than memory can be
+        used.
+
+        The Variable is read-only - values can't be added, removed or changed.
+        The file stays mapped until the Variable is garbage collected, or until
+        :py:meth:`close` is called.
+
+        :param str path: The location of the file.
+        :param str dtype: The type of the numbers in the file - one of the\
+        keys of ``TYPECODES``. They are assumed to be in the machine's byte\
+        order.
+        :param int offset: The number of bytes to skip at the start of the\
+        file, such as a header (default is 0).
+        :param str name: The name of the Variable.
+        :raises ValueError: if an unknown dtype is given.
+        :raises ValueError: if a negative offset is given.
+        :raises ValueError: if the data isn't a whole number of values.
+        :raises EmptyVariableError: if the file has no values.
+        :rtype: ``Variable``"""
+
+        if dtype not in TYPECODES:
+            raise ValueError("'{}' is not a valid dtype".format(dtype))
+        if offset < 0:
+            raise ValueError("offset {} is negative".format(offset))
+        with open(path, "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                raise EmptyVariableError("{} contains no values".format(path))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = memoryview(mapped)[offset:]
+        if len(data) % array(TYPECODES[dtype]).itemsize:
+            raise ValueError("{} doesn't contain whole {} values".format(
+             path, dtype
+            ))
+        if not len(data):
+            raise EmptyVariableError("{} contains no values".format(path))
+        variable = Variable(0, name=name, dtype=dtype)
+        variable._values = data.cast(TYPECODES[dtype])
+        return variable
+
+
+    def close(self):
+        """Releases the file behind a Variable made by :py:meth:`from_file`,
+        so that it is no longer mapped into memory. The values are first
+        copied into an in-memory array, so the Variable can still be used and
+        can be modified. Variables which aren't backed by a file are left as
+        they are.
+
+        :raises BufferError: if views of the file's values - from\
+        :py:meth:`buffer` or slicing - are still in use. The Variable will\
+        still have been copied into memory."""
+
+        if self.writable: return
+        mapped = self._values
+        self._values = array(mapped.format, mapped.tobytes())
+        mapping = mapped.obj
+        mapped.release()
+        mapping.close()
 
 
     def __repr__(self):
         if self._name:
-            return "<Variable '{}' {}>".format(self._name, tuple(self._values))
-        return "<Variable {}>".format(tuple(self._values))
+            return "<Variable '{}' {}>".format(self._name, tuple(self))
+        return "<Variable {}>".format(tuple(self))
 
 
     def __len__(self):
@@ -45,19 +193,494 @@ class Variable:
 
 
     def __contains__(self, member):
-        return member in self._values
+        if member is None: return self._missing > 0
+        if self._categories is None: return member in self._present()
+        code = self._category_codes.get(member)
+        if code is None: return False
+        if not self._missing: return code in self._values
+        return code in compress(self._values, self._valid)
 
 
     def __iter__(self):
-        return iter(self._values)
+        values = self._decode(self._values)
+        if not self._masked: return iter(values)
+        return map(_unmask, values, self._valid)
 
 
     def __getitem__(self, key):
-        return self._values[key]
+        if isinstance(key, slice):
+            values = self._values[key]
+            if self._categories is not None: values = list(self._decode(values))
+            if not self._masked: return values
+            return list(map(_unmask, values, self._valid[key]))
+        if self._masked and not self._valid[key]: return None
+        value = self._values[key]
+        return value if self._categories is None else self._categories[value]
 
 
     def __setitem__(self, key, value):
-        self._values[key] = value
+        self._check_writable()
+        if isinstance(key, slice):
+            values, valid, missing = self._store(value)
+            if valid is None and self._valid is not None:
+                valid = bytearray(b"\x01") * len(values)
+            if valid is not None and self._valid is None:
+                self._valid = bytearray(b"\x01") * len(self._values)
+            if self._categories is not None: self._widen()
+            self._values[key] = values
+            if valid is not None:
+                self._valid[key] = valid
+                self._missing = self._valid.count(0)
+                if not self._missing: self._valid = None
+            self._reset()
+        else:
+            old_value = self[key]
+            self._values[key] = self._placeholder(value)
+            self._set_valid(key, value is not None)
+            self._cache = {}
+            if old_value is not None: self._track_removal(old_value)
+            if value is not None: self._track_addition(self[key])
+
+
+    def _store(self, values):
+        """Turns some values into the Variable's kind of storage, along with
+        a validity mask and a count of the missing values. Missing values are
+        kept as ``None`` in a list, and as 0 in typed and categorical storage.
+
+        :param values: The values to store.
+        :returns: ``(storage, mask, missing)``, where the mask is ``None`` if\
+        no values are missing."""
+
+        values = list(values)
+        missing = values.count(None)
+        valid = bytearray(map(is_not, values, repeat(None))) if missing else None
+        if self._dtype is None: return values, valid, missing
+        if self._categories is not None:
+            return self._encode(values), valid, missing
+        if missing: values = [0 if value is None else value for value in values]
+        return array(TYPECODES[self._dtype], values), valid, missing
+
+
+    def _placeholder(self, value):
+        """Returns what should be stored for a value - the value itself, or 0
+        if it is missing and the storage is typed. For categorical storage it
+        is the value's code, and a value not seen before becomes a new
+        category.
+
+        :param value: The value to store."""
+
+        if self._categories is not None:
+            code = self._encode((value,))[0]
+            self._widen()
+            return code
+        return 0 if value is None and self._dtype is not None else value
+
+
+    def _encode(self, values):
+        """Turns values into an array of category codes, adding any values
+        not seen before to the end of the categories. Missing values are
+        given the code 0. The array is the narrowest that can hold a code for
+        every category.
+
+        :param list values: The values to encode.
+        :rtype: ``array``"""
+
+        codes = self._category_codes
+        for value in dict.fromkeys(values):
+            if value is not None and value not in codes:
+                codes[value] = len(self._categories)
+                self._categories.append(value)
+        return array(
+         _code_typecode(len(self._categories)),
+         map(codes.get, values, repeat(0))
+        )
+
+
+    def _decode(self, stored):
+        """Returns stored values as the values they stand for. For categorical
+        storage each code is looked up among the categories, and otherwise the
+        stored values are returned as they are.
+
+        :param stored: The stored values.
+        :rtype: ``iterable``"""
+
+        if self._categories is None: return stored
+        return map(self._categories.__getitem__, stored)
+
+
+    def _widen(self):
+        """Widens the array of category codes, if there are now too many
+        categories for its current type."""
+
+        typecode = _code_typecode(len(self._categories))
+        if self._values.typecode != typecode:
+            self._values = array(typecode, self._values)
+
+
+    @property
+    def _masked(self):
+        """``True`` if the stored values can't be used as they are, because
+        some are missing and are stored as placeholders.
+
+        :rtype: ``bool``"""
+
+        return self._missing > 0 and self._dtype is not None
+
+
+    def _present(self):
+        """Returns the values which aren't missing. If none are missing this
+        is the storage itself, and otherwise it is the storage filtered through
+        the validity mask as it is iterated. Categorical codes are decoded as
+        they are iterated.
+
+        :rtype: ``iterable``"""
+
+        if not self._missing: return self._decode(self._values)
+        return self._decode(compress(self._values, self._valid))
+
+
+    def _check_present(self):
+        """Makes sure that the Variable has at least one value which isn't
+        missing, so that statistics of its values can be calculated.
+
+        :raises EmptyVariableError: if every value is missing."""
+
+        if self._missing == len(self._values):
+            raise EmptyVariableError("Every value in the Variable is missing")
+
+
+    def _set_valid(self, index, valid):
+        """Records whether the value at an index is present, creating the
+        validity mask if a value is missing for the first time and discarding
+        it once no values are missing.
+
+        :param int index: The index of the value.
+        :param bool valid: Whether the value is present."""
+
+        if self._valid is None:
+            if valid: return
+            self._valid = bytearray(b"\x01") * len(self._values)
+        self._missing += self._valid[index] - valid
+        self._valid[index] = valid
+        if not self._missing: self._valid = None
+
+
+    def _insert_valid(self, index, valid):
+        """Records whether a value is present, after it has been inserted
+        into the storage.
+
+        :param int index: The index the value was inserted at.
+        :param bool valid: Whether the value is present."""
+
+        if self._valid is None:
+            if valid: return
+            self._valid = bytearray(b"\x01") * (len(self._values) - 1)
+        self._valid.insert(index, valid)
+        self._missing += not valid
+
+
+    def _delete_valid(self, index):
+        """Removes the record of whether a value is present, after it has been
+        deleted from the storage, and returns whether it was.
+
+        :param int index: The index the value was deleted from.
+        :rtype: ``bool``"""
+
+        if self._valid is None: return True
+        valid = self._valid.pop(index)
+        self._missing -= not valid
+        if not self._missing: self._valid = None
+        return bool(valid)
+
+
+    @property
+    def count_missing(self):
+        """Returns the number of missing values. This is kept up to date as
+        the Variable changes, so it never needs counting.
+
+        :rtype: ``int``"""
+
+        return self._missing
+
+
+    def _elementwise(self, function, other, reverse=False):
+        """Applies a function of two arguments to each value of the Variable in
+        turn, with either the matching value of another Variable or a single
+        constant as the other argument. The loop is run by ``map``, so no
+        Python-level loop or intermediate list is involved. Where either value
+        is missing, the result is missing.
+
+        :param function: The function to apply.
+        :param other: A Variable or Expression of the same length, or a\
+        constant.
+        :param bool reverse: If ``True``, the other value will be the first\
+        argument.
+        :raises ValueError: if a Variable of a different length is given.
+        :rtype: ``map``"""
+
+        if isinstance(other, (Variable, Expression)):
+            if len(other) != len(self):
+                raise ValueError(
+                 "length {} is not length {}".format(len(self), len(other))
+                )
+            others = other._values if isinstance(other, Variable) else other
+            if isinstance(other, Variable) and other._missing:
+                function, others = _skip_missing(function), iter(other)
+            elif isinstance(other, Expression) and other._has_missing():
+                function = _skip_missing(function)
+            elif isinstance(other, Variable) and other._categories is not None:
+                others = iter(other)
+        else:
+            others = repeat(other, len(self._values))
+        values = self._values
+        if self._missing:
+            function, values = _skip_missing(function), iter(self)
+        elif self._categories is not None:
+            values = iter(self)
+        if reverse: return map(function, others, values)
+        return map(function, values, others)
+
+
+    def rolling(self, window):
+        """Returns a :py:class:`.Rolling` object, which calculates statistics
+        over a window of consecutive values as it moves along the Variable:
+
+            >>> Variable(2, 4, 6, 8, 10).rolling(3).mean()
+            <Variable (4.0, 6.0, 8.0)>
+
+        :param int window: The number of values in each window.
+        :raises ValueError: if the window isn't between 1 and the Variable's\
+        length.
+        :rtype: ``Rolling``"""
+
+        return Rolling(self, window)
+
+
+    def ewm(self, half_life=None, alpha=None):
+        """Returns an :py:class:`.ExponentialVariable` which has been given
+        this Variable's values, so that its exponentially weighted mean and
+        variance can be read, and new values can be added to it as they
+        arrive.
+
+        :param half_life: The number of values it takes for a weight to halve.
+        :param alpha: The weight given to each new value, between 0 and 1.
+        :rtype: ``ExponentialVariable``"""
+
+        return ExponentialVariable(
+         self, half_life=half_life, alpha=alpha, name=self._name
+        )
+
+
+    def smooth(self, half_life=None, alpha=None):
+        """Returns a new Variable of the exponentially weighted mean at each
+        value, calculated in a single pass.
+
+        :param half_life: The number of values it takes for a weight to halve.
+        :param alpha: The weight given to each new value, between 0 and 1.
+        :rtype: ``Variable``"""
+
+        return ExponentialVariable(
+         half_life=half_life, alpha=alpha, name=self._name
+        ).smooth(self)
+
+
+    def _operate(self, function, other, reverse=False):
+        """Applies an elementwise operation, returning a new Variable. If the
+        other value is an :py:class:`.Expression`, the result is an Expression
+        too, so that it stays unevaluated.
+
+        :param function: The function to apply.
+        :param other: A Variable or Expression of the same length, or a\
+        constant.
+        :param bool reverse: If ``True``, the other value will be the first\
+        argument.
+        :rtype: ``Variable``"""
+
+        if isinstance(other, Expression):
+            return self.lazy()._apply(function, other, reverse)
+        results = self._elementwise(function, other, reverse)
+        if function in (operator.lt, operator.le, operator.gt, operator.ge):
+            return Variable(list(results))
+        return self._from_results(results)
+
+
+    def lazy(self):
+        """Returns an :py:class:`.Expression` starting from this Variable's
+        values. Arithmetic on the Expression isn't carried out straight away,
+        but is evaluated all at once, in a single pass over the values, when
+        the result is needed:
+
+            >>> ((variable.lazy() - variable.mean) ** 2).sum
+            4.0
+
+        :rtype: ``Expression``"""
+
+        return Expression(self)
+
+
+    def _from_results(self, results):
+        """Creates a new Variable from the results of an elementwise operation,
+        keeping this Variable's dtype if the results fit in it.
+
+        :param results: The new values.
+        :rtype: ``Variable``"""
+
+        results = list(results)
+        if self._dtype is not None:
+            try:
+                return Variable(results, dtype=self._dtype)
+            except (TypeError, OverflowError): pass
+        return Variable(results)
+
+
+    def _in_place(self, function, other):
+        """Applies an elementwise operation and stores the results as the
+        Variable's new values, building the new storage straight from the
+        results.
+
+        :param function: The function to apply.
+        :param other: A Variable of the same length, or a constant.
+        :raises TypeError: if the results don't fit the Variable's dtype.
+        :rtype: ``Variable``"""
+
+        self._check_writable()
+        results = self._elementwise(function, other)
+        if self._categories is not None:
+            results = list(results)
+            self._categories, self._category_codes = [], {}
+        if self._missing or isinstance(other, Variable) and other._missing or (
+         self._categories is not None
+        ):
+            self._values, self._valid, self._missing = self._store(results)
+        elif self._dtype is None:
+            self._values = list(results)
+        else:
+            self._values = array(TYPECODES[self._dtype], results)
+        self._reset()
+        return self
+
+
+    def __add__(self, other):
+        return self._operate(operator.add, other)
+
+
+    def __radd__(self, other):
+        return self._operate(operator.add, other, True)
+
+
+    def __iadd__(self, other):
+        return self._in_place(operator.add, other)
+
+
+    def __sub__(self, other):
+        return self._operate(operator.sub, other)
+
+
+    def __rsub__(self, other):
+        return self._operate(operator.sub, other, True)
+
+
+    def __isub__(self, other):
+        return self._in_place(operator.sub, other)
+
+
+    def __mul__(self, other):
+        return self._operate(operator.mul, other)
+
+
+    def __rmul__(self, other):
+        return self._operate(operator.mul, other, True)
+
+
+    def __imul__(self, other):
+        return self._in_place(operator.mul, other)
+
+
+    def __truediv__(self, other):
+        return self._operate(operator.truediv, other)
+
+
+    def __rtruediv__(self, other):
+        return self._operate(operator.truediv, other, True)
+
+
+    def __itruediv__(self, other):
+        return self._in_place(operator.truediv, other)
+
+
+    def __pow__(self, other):
+        return self._operate(operator.pow, other)
+
+
+    def __rpow__(self, other):
+        return self._operate(operator.pow, other, True)
+
+
+    def __ipow__(self, other):
+        return self._in_place(operator.pow, other)
+
+
+    def __lt__(self, other):
+        return self._operate(operator.lt, other)
+
+
+    def __le__(self, other):
+        return self._operate(operator.le, other)
+
+
+    def __gt__(self, other):
+        return self._operate(operator.gt, other)
+
+
+    def __ge__(self, other):
+        return self._operate(operator.ge, other)
+
+
+    def __neg__(self):
+        if self._missing:
+            return self._from_results(map(_skip_missing(operator.neg), self))
+        return self._from_results(map(operator.neg, self._present()))
+
+
+    def __abs__(self):
+        if self._missing:
+            return self._from_results(map(_skip_missing(abs), self))
+        return self._from_results(map(abs, self._present()))
+
+
+    def __buffer__(self, flags):
+        return self.buffer()
+
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy
+        if self._dtype is None: return numpy.array(self._values, dtype=dtype)
+        if self._categories is not None:
+            return numpy.array(list(self), dtype=dtype)
+        buffer = self.buffer()
+        values = numpy.frombuffer(buffer, dtype=buffer.format)
+        return values if dtype is None else values.astype(dtype)
+
+
+    def buffer(self):
+        """Returns a read-only ``memoryview`` of the Variable's typed storage,
+        so that other numerical code can read the values without them being
+        copied. On Python 3.12 and above ``memoryview(variable)`` does the
+        same, and the Variable can be given directly to NumPy functions, which
+        use this buffer via ``__array__``.
+
+        While the view exists, values can't be added to or removed from the
+        Variable, as that could move the storage it points to. Missing values
+        appear in the view as 0.
+
+        :raises TypeError: if the Variable doesn't have typed storage.
+        :rtype: ``memoryview``"""
+
+        if self._dtype is None:
+            raise TypeError("Only Variables with a dtype have a buffer")
+        if self._categories is not None:
+            raise TypeError("Categorical Variables don't have a buffer")
+        return memoryview(self._values).toreadonly()
 
 
     @property
@@ -66,7 +689,49 @@ class Variable:
 
         :rtype: ``tuple``"""
 
-        return tuple(self._values)
+        return tuple(self)
+
+
+    @property
+    def dtype(self):
+        """Returns the dtype of the Variable's typed storage, or ``None`` if
+        the values are stored in an ordinary list.
+
+        :rtype: ``str``"""
+
+        return self._dtype
+
+
+    @property
+    def categories(self):
+        """Returns the distinct values of a categorical Variable, in the order
+        they were first seen, or ``None`` if the Variable isn't categorical.
+        Categories are never removed, so this can include values which no
+        longer occur.
+
+        :rtype: ``tuple``"""
+
+        if self._categories is not None: return tuple(self._categories)
+
+
+    @property
+    def indexed(self):
+        """Returns ``True`` if the Variable keeps a :py:class:`.SortedIndex` of
+        its values. Setting this to ``True`` builds the index, which is then
+        kept up to date as values are added, inserted, removed, popped and
+        changed. Setting it to ``False`` discards it.
+
+        :rtype: ``bool``"""
+
+        return self._index is not None
+
+
+    @indexed.setter
+    def indexed(self, indexed):
+        if not indexed:
+            self._index = None
+        elif self._index is None:
+            self._index = SortedIndex(self._present())
 
 
     def add(self, value):
@@ -74,7 +739,53 @@ class Variable:
 
         :param value: The value to add."""
 
-        self._values.append(value)
+        self._check_writable()
+        stored = self._placeholder(value)
+        self._values.append(stored)
+        self._insert_valid(len(self._values) - 1, value is not None)
+        if value is not None:
+            value = self[-1]
+            self._update_cache((value,))
+            self._track_addition(value)
+
+
+    def extend(self, values):
+        """Adds several values to the end of the Variable at once. The new
+        values are turned into storage together and appended in one go, and
+        the statistics cache, sorted index and frequency table are brought up
+        to date once for the whole batch rather than once per value.
+
+        :param values: The values to add.
+        :raises TypeError: if the values don't fit the Variable's dtype."""
+
+        self._check_writable()
+        self._append(*self._store(values))
+
+
+    def _append(self, stored, valid, missing):
+        """Appends values which have already been turned into storage by
+        :py:meth:`_store`, along with their validity mask. The statistics
+        are updated from the values as stored, which for typed storage may
+        have been rounded.
+
+        :param stored: The storage of the values.
+        :param bytearray valid: Their validity mask, or ``None``.
+        :param int missing: The number of them which are missing."""
+
+        if valid is not None and self._valid is None:
+            self._valid = bytearray(b"\x01") * len(self._values)
+        if self._valid is not None:
+            self._valid += valid or bytearray(b"\x01") * len(stored)
+        if self._categories is not None: self._widen()
+        self._values += stored
+        self._missing += missing
+        present = self._decode(stored)
+        present = list(compress(present, valid) if missing else present)
+        if present:
+            self._update_cache(present)
+            if self._index is not None: self._index.update(present)
+            if self._frequency_table is not None:
+                self._frequency_table.update(present)
 
 
     def insert(self, index, value):
@@ -83,7 +794,16 @@ class Variable:
         :param int index: The index to insert at.
         :param value: The value to insert."""
 
-        self._values.insert(index, value)
+        self._check_writable()
+        length = len(self._values)
+        if index < 0: index += length
+        index = min(max(index, 0), length)
+        stored = self._placeholder(value)
+        self._values.insert(index, stored)
+        self._insert_valid(index, value is not None)
+        if value is not None:
+            self._cache = {}
+            self._track_addition(self[index])
 
 
     def remove(self, value):
@@ -92,9 +812,24 @@ class Variable:
         :param value: The value to remove.
         :raises EmptyVariableError: if you try to remove the only value."""
 
+        self._check_writable()
         if len(self._values) == 1:
             raise EmptyVariableError("Cannot remove last value from Variable")
-        self._values.remove(value)
+        stored = value
+        if self._categories is not None and value is not None:
+            stored = self._category_codes.get(value, -1)
+        if not self._masked:
+            index = self._values.index(stored)
+        elif value is None:
+            index = self._valid.index(0)
+        else:
+            index = self._values.index(stored)
+            while not self._valid[index]:
+                index = self._values.index(stored, index + 1)
+        del self._values[index]
+        if self._delete_valid(index):
+            self._cache = {}
+            self._track_removal(value)
 
 
     def pop(self, index=-1):
@@ -105,9 +840,100 @@ class Variable:
         :raises EmptyVariableError: if you try to pop the only value.
         :returns: the specified value."""
 
+        self._check_writable()
         if len(self._values) == 1:
             raise EmptyVariableError("Cannot pop last value from Variable")
-        return self._values.pop(index)
+        value = self._values.pop(index)
+        if not self._delete_valid(index): return None
+        if self._categories is not None: value = self._categories[value]
+        self._cache = {}
+        self._track_removal(value)
+        return value
+
+
+    @property
+    def writable(self):
+        """Returns ``False`` if the Variable is read-only, as it is when it is
+        backed by a file.
+
+        :rtype: ``bool``"""
+
+        return not isinstance(self._values, memoryview)
+
+
+    def _check_writable(self):
+        if not self.writable:
+            raise TypeError("Cannot modify a read-only Variable")
+
+
+    def _reset(self):
+        """Discards the cache and frequency table, and rebuilds the sorted index
+        if there is one, after the values have been changed wholesale."""
+
+        self._cache = {}
+        self._frequency_table = None
+        if self._index is not None:
+            self._index = SortedIndex(self._present())
+
+
+    def _track_addition(self, value):
+        """Updates the sorted index and frequency table, if the Variable has
+        them, after a value has been added.
+
+        :param value: The value that was added."""
+
+        if self._index is not None: self._index.add(value)
+        if self._frequency_table is not None: self._frequency_table.add(value)
+
+
+    def _track_removal(self, value):
+        """Updates the sorted index and frequency table, if the Variable has
+        them, after a value has been removed.
+
+        :param value: The value that was removed."""
+
+        if self._index is not None: self._index.remove(value)
+        if self._frequency_table is not None:
+            self._frequency_table.remove(value)
+
+
+    def _reorder(self, indices):
+        """Rearranges the values into the order given by a sequence of indices,
+        keeping the Variable's storage type. Reordering doesn't change any
+        statistics, so the cache is kept.
+
+        A Variable backed by a file can't be reordered in place, so it will
+        be copied into an in-memory array.
+
+        :param indices: The index of each value's new position."""
+
+        values = map(self._values.__getitem__, indices)
+        if self._dtype is None:
+            self._values = list(values)
+        elif self._categories is not None:
+            self._values = array(self._values.typecode, values)
+        else:
+            self._values = array(TYPECODES[self._dtype], values)
+        if self._valid is not None:
+            self._valid = bytearray(map(self._valid.__getitem__, indices))
+
+
+    def _update_cache(self, values):
+        """Brings the statistics cache up to date after values have been added
+        to the end of the Variable. Statistics which can be extended by new
+        values are updated in place, and the rest are discarded.
+
+        :param list values: The values that were added, as they are stored,\
+        none of them missing."""
+
+        cache, self._cache = self._cache, {}
+        if "sum" in cache: self._cache["sum"] = cache["sum"] + sum(values)
+        if "min" in cache: self._cache["min"] = min(cache["min"], min(values))
+        if "max" in cache: self._cache["max"] = max(cache["max"], max(values))
+        if "_moment_totals" in cache:
+            self._cache["_moment_totals"] = _moments(
+             values, *cache["_moment_totals"]
+            )
 
 
     @property
@@ -128,7 +954,8 @@ class Variable:
 
     @property
     def length(self):
-        """The length of the Variable - the number of values it has.
+        """The length of the Variable - the number of values it has, including
+        any that are missing.
 
         :rtype: ``int``"""
 
@@ -136,54 +963,275 @@ class Variable:
 
 
     @property
+    @_cached
     def max(self):
-        """Returns the largest value."""
+        """Returns the largest value.
 
-        return max(self._values)
+        :raises EmptyVariableError: if every value is missing."""
+
+        self._check_present()
+        return max(self._present())
 
 
     @property
+    @_cached
     def min(self):
-        """Returns the smallest value."""
+        """Returns the smallest value.
+
+        :raises EmptyVariableError: if every value is missing."""
 
-        return min(self._values)
+        self._check_present()
+        return min(self._present())
 
 
     @property
+    @_cached
     def sum(self):
-        """Returns the sum of the values."""
+        """Returns the sum of the values.
 
-        return sum(self._values)
+        :raises EmptyVariableError: if every value is missing."""
+
+        self._check_present()
+        return sum(self._present())
 
 
     @property
     def mean(self):
         """Returns the mean of the values - their sum divided by the number of
-        values."""
+        values.
+
+        :raises EmptyVariableError: if every value is missing."""
 
-        return self.sum / self.length
+        return self.sum / (self.length - self._missing)
 
 
     @property
+    @_cached
     def median(self):
         """Returns the median value - the value that occurs midway through
         when the values are sorted. If there is an even number, the midpoint
-        between the two median values will be returned."""
+        between the two median values will be returned.
+
+        :raises EmptyVariableError: if every value is missing."""
+
+        return self.percentile(50)
+
+
+    @_cached
+    def percentile(self, p):
+        """Returns the value below which a given percentage of the values lie.
+        If this falls between two values, it is interpolated linearly between
+        them, so that the 50th percentile is the :py:attr:`median`.
+
+        The values are not sorted - the values needed are found by selection,
+        which takes linear time on average, or looked up in the Variable's
+        sorted index if it has one.
+
+        :param p: The percentage, between 0 and 100.
+        :raises ValueError: if p is not between 0 and 100.
+        :raises EmptyVariableError: if every value is missing."""
+
+        return self.percentiles([p])[0]
+
+
+    def percentiles(self, ps):
+        """Returns several percentiles at once. This is quicker than asking for
+        them one at a time, as the values are only partitioned once for all of
+        them.
+
+        :param ps: An iterable of percentages, each between 0 and 100.
+        :raises ValueError: if any percentage is not between 0 and 100.
+        :raises EmptyVariableError: if every value is missing.
+        :rtype: ``list``"""
+
+        ps = list(ps)
+        if any(p < 0 or p > 100 for p in ps):
+            raise ValueError("Percentiles must be between 0 and 100")
+        self._check_present()
+        count = len(self._values) - self._missing
+        positions = [p / 100 * (count - 1) for p in ps]
+        ranks = set()
+        for position in positions:
+            ranks.add(int(position))
+            if position % 1: ranks.add(int(position) + 1)
+        if self._index is None:
+            selected = _select(list(self._present()), sorted(ranks))
+        else:
+            selected = {rank: self._index[rank] for rank in ranks}
+        results = []
+        for position in positions:
+            rank, fraction = int(position), position - int(position)
+            if fraction:
+                results.append(selected[rank] * (1 - fraction)
+                 + selected[rank + 1] * fraction)
+            else:
+                results.append(selected[rank])
+        return results
+
+
+    def quantiles(self, n=4):
+        """Returns the ``n - 1`` cut points which divide the values into ``n``
+        groups of equal size - the quartiles by default.
+
+        :param int n: The number of groups (default is 4).
+        :raises ValueError: if n is less than 1.
+        :rtype: ``list``"""
+
+        if n < 1: raise ValueError("n {} must be at least 1".format(n))
+        return self.percentiles([i * 100 / n for i in range(1, n)])
+
+
+    def count_below(self, value):
+        """Returns the number of values less than a given value. If the
+        Variable is indexed, this is a binary search rather than a scan.
+
+        :param value: The value to compare against.
+        :rtype: ``int``"""
+
+        if self._index is not None: return self._index.count_below(value)
+        return sum(map(lt, self._present(), repeat(value)))
 
-        values = sorted(self._values)
-        if len(values) % 2:
-            return values[int((len(values) - 1) / 2)]
-        midway = int(self.length / 2)
-        return (values[midway - 1] + values[midway]) / 2
+
+    def rank(self, value):
+        """Returns the position a value has, or would have, among the sorted
+        values, counting from 1. Any values equal to it are placed after it.
+
+        :param value: The value to rank.
+        :rtype: ``int``"""
+
+        return self.count_below(value) + 1
+
+
+    @property
+    @_cached
+    def iqr(self):
+        """Returns the interquartile range - the difference between the upper
+        and lower quartiles, which contain the middle half of the values."""
+
+        lower, upper = self.percentiles([25, 75])
+        return upper - lower
+
+
+    def sketch(self, k=200, seed=None):
+        """Returns a :py:class:`.QuantileSketch` of the values, which can
+        estimate the median and percentiles using a fixed amount of memory,
+        and can be merged with sketches of other Variables or streams.
+
+        :param int k: The accuracy parameter of the sketch (default is 200).
+        :param seed: An optional seed for the sketch's random choices.
+        :rtype: ``QuantileSketch``"""
+
+        return QuantileSketch(self._present(), k=k, seed=seed)
+
+
+    def histogram(self, bins=10, range=None):
+        """Returns a :py:class:`.Histogram` of the values, which can be
+        updated with more values or merged with the histograms of other
+        Variables.
+
+        :param bins: Either the number of equal-width bins (default is 10),\
+        or a sequence of bin edges.
+        :param tuple range: The lowest and highest edges of equal-width bins.\
+        By default these are the smallest and largest values.
+        :raises ValueError: if bins isn't a positive int or a sequence of\
+        edges.
+        :raises ValueError: if the range is the wrong way round, or isn't\
+        given and every value is missing.
+        :rtype: ``Histogram``"""
+
+        if isinstance(bins, int) and not isinstance(bins, bool):
+            if bins < 1:
+                raise ValueError("bins {} must be at least 1".format(bins))
+            if range is None and self._missing == len(self._values):
+                raise ValueError("Can't find the range of only missing values")
+            low, high = (self.min, self.max) if range is None else range
+            if low > high:
+                raise ValueError("Range {} is the wrong way round".format(
+                 (low, high)
+                ))
+            if low == high: low, high = low - 0.5, high + 0.5
+            width = (high - low) / bins
+            bins = [low + index * width for index in builtins.range(bins)]
+            bins.append(high)
+        elif isinstance(bins, str) or not hasattr(bins, "__iter__"):
+            raise ValueError(
+             "bins {!r} isn't a number of bins or a sequence of edges".format(
+              bins
+             )
+            )
+        return Histogram(bins, self._present())
 
 
     @property
     def frequencies(self):
         """Returns the frequencies of the values in the Variable.
 
+        The first time this (or the :py:attr:`mode`) is needed, a
+        :py:class:`.FrequencyTable` is built, which is then kept up to date as
+        the Variable changes rather than being recounted. For a categorical
+        Variable it is built by counting the codes, so the values themselves
+        are only looked at once per category.
+
         :rtype: ``Counter``"""
 
-        return Counter(self._values)
+        return self._get_frequency_table().counts
+
+
+    def _get_frequency_table(self):
+        """Returns the Variable's frequency table, building it if it hasn't
+        been needed before.
+
+        :rtype: ``FrequencyTable``"""
+
+        if self._frequency_table is None:
+            if self._categories is None:
+                self._frequency_table = FrequencyTable(self._present())
+            else:
+                counts = _bincount(self._values, len(self._categories))
+                if self._missing: counts[0] -= self._missing
+                self._frequency_table = FrequencyTable({
+                 category: count for category, count
+                 in zip(self._categories, counts) if count
+                })
+        return self._frequency_table
+
+
+    def positions(self, value):
+        """Returns the positions at which a value occurs, in order. Giving
+        ``None`` finds the missing values.
+
+        For a categorical Variable, the value is looked up among the
+        categories once, and then only the integer codes are compared.
+
+        :param value: The value to look for.
+        :rtype: ``list``"""
+
+        rows = range(len(self._values))
+        if value is None:
+            if not self._missing: return []
+            return list(compress(rows, map(not_, self._valid)))
+        if self._categories is not None:
+            value = self._category_codes.get(value)
+            if value is None: return []
+        matches = map(operator.eq, self._values, repeat(value))
+        if self._masked: matches = map(and_, matches, self._valid)
+        return list(compress(rows, matches))
+
+
+    def _category_ranks(self):
+        """Returns, for each position of a categorical Variable, the rank of
+        its category among the sorted categories. Each category is only
+        compared while sorting the categories, so sorting the positions by
+        these ranks only compares integers.
+
+        :rtype: ``list``"""
+
+        order = sorted(
+         range(len(self._categories)), key=self._categories.__getitem__
+        )
+        ranks = [0] * len(order)
+        for rank, code in enumerate(order): ranks[code] = rank
+        return list(map(ranks.__getitem__, self._values))
 
 
     @property
@@ -191,10 +1239,8 @@ class Variable:
         """Returns the mode value - the value that occurs the most often. If
         more than one value meets this criteria, ``None`` is returned."""
 
-        values = self.frequencies
-        highest_frequency = max(values.values())
-        if len([v for v in values if values[v] == highest_frequency]) == 1:
-            return values.most_common()[0][0]
+        most_frequent = self._get_frequency_table().most_frequent
+        if len(most_frequent) == 1: return most_frequent.pop()
 
 
     @property
@@ -213,13 +1259,21 @@ class Variable:
         You can elect to get the population variance if you wish, which uses `N`
         rather than `N - 1` as the denominator.
 
+        The variance is calculated in a single pass over the values using
+        Welford's algorithm, so it takes linear time and is numerically stable
+        even when the values are large relative to their spread.
+
         :param bool population: If ``True``, the population variance will be\
         returned (default is ``False``).
         :rtype: ``float``"""
 
-        return sum([
-         (value - self.mean) ** 2 for value in self._values
-        ]) / (self.length - (not population))
+        count, mean, square_deviations = self._moment_totals()
+        return square_deviations / (count - (not population))
+
+
+    @_cached
+    def _moment_totals(self):
+        return _moments(self._present())
 
 
     def st_dev(self, population=False):
@@ -248,6 +1302,218 @@ class Variable:
         return (value - self.mean) / self.st_dev(population=population)
 
 
+    def zscores(self, population=False):
+        """Standardises the whole Variable, returning a new Variable of the
+        z-score of every value. The mean and standard deviation are only
+        calculated once.
+
+        :param bool population: If ``True``, the population deviation will be\
+        used (default is ``False``).
+        :rtype: ``Variable``"""
+
+        return self.zscore_many(self, population=population)
+
+
+    def zscore_many(self, values, population=False):
+        """Returns a new Variable of the z-scores of many values, relative to
+        this Variable's mean and standard deviation, which are only calculated
+        once.
+
+        :param values: An iterable of the values to score. Missing values\
+        have missing z-scores.
+        :param bool population: If ``True``, the population deviation will be\
+        used (default is ``False``).
+        :rtype: ``Variable``"""
+
+        mean, st_dev = self.mean, self.st_dev(population=population)
+        return Variable([
+         None if value is None else (value - mean) / st_dev for value in values
+        ], name=self._name)
+
+
+    def moments(self):
+        """Returns the :py:class:`.Moments` of the Variable - a compact summary
+        from which its mean, variance and extremes can be calculated. Moments
+        from different Variables can be serialised and merged, so statistics
+        of data split across many places can be combined without moving the
+        values themselves.
+
+        :rtype: ``Moments``"""
+
+        length, mean, square_deviations = self._moment_totals()
+        return Moments(
+         length, self.sum, mean, square_deviations, self.min, self.max
+        )
+
+
+    def co_moments_with(self, variable):
+        """Returns the :py:class:`.CoMoments` of this Variable and another -
+        a compact, mergeable summary from which their covariance and
+        correlation can be calculated.
+
+        :param Variable variable: The other Variable. It must be the same\
+        length as this one.
+        :raises TypeError: if something other than a Variable is given.
+        :raises ValueError: if Variables of different length are given.
+        :rtype: ``CoMoments``"""
+
+        if not isinstance(variable, Variable):
+            raise TypeError("{} is not a Variable".format(str(variable)))
+        if self.length != variable.length:
+            raise ValueError(
+             "length {} is not length {}".format(self.length, variable.length)
+            )
+        if self._missing or variable._missing:
+            xs, ys = self._complete_pairs(variable)
+            x, y = Moments(), Moments()
+            x.update(xs)
+            y.update(ys)
+        else:
+            xs, ys = self._present(), variable._present()
+            x, y = self.moments(), variable.moments()
+        this_mean, other_mean = x._mean, y._mean
+        co_deviations = sum([(value - this_mean) * (other - other_mean)
+         for value, other in zip(xs, ys)])
+        return CoMoments(x, y, co_deviations)
+
+
+    def spearman_with(self, variable):
+        """Returns Spearman's rank correlation of this Variable with another -
+        the correlation of their ranks, rather than their values, so that it
+        measures how well one increases with the other even when the
+        relationship isn't linear. Tied values share the average of their
+        ranks.
+
+        The values are ranked by sorting them once, so this takes
+        ``n log n`` time. Pairs where either value is missing are skipped.
+
+        :param Variable variable: The other Variable. It must be the same\
+        length as this one.
+        :raises TypeError: if something other than a Variable is given.
+        :raises ValueError: if Variables of different length are given.
+        :rtype: ``float``"""
+
+        xs, ys = self._paired_with(variable)
+        middle = (len(xs) + 1) / 2
+        x_deviations = list(map(operator.sub, _ranks(xs), repeat(middle)))
+        y_deviations = list(map(operator.sub, _ranks(ys), repeat(middle)))
+        return sum(map(operator.mul, x_deviations, y_deviations)) / sqrt(
+         sum(map(operator.mul, x_deviations, x_deviations))
+         * sum(map(operator.mul, y_deviations, y_deviations))
+        )
+
+
+    def kendall_with(self, variable):
+        """Returns Kendall's tau-b rank correlation of this Variable with
+        another - the balance of pairs of positions which the two Variables
+        put in the same order over those they put in opposite orders,
+        adjusted for ties.
+
+        Rather than comparing every pair of positions, the pairs are sorted by
+        one Variable and the number of swaps a merge sort needs to put the
+        other in order is counted, as described by Knight (1966), so this
+        takes ``n log n`` time. Pairs where either value is missing are
+        skipped.
+
+        :param Variable variable: The other Variable. It must be the same\
+        length as this one.
+        :raises TypeError: if something other than a Variable is given.
+        :raises ValueError: if Variables of different length are given.
+        :rtype: ``float``"""
+
+        xs, ys = self._paired_with(variable)
+        order = sorted(range(len(xs)), key=ys.__getitem__)
+        order.sort(key=xs.__getitem__)
+        total = len(xs) * (len(xs) - 1) // 2
+        x_ties, y_ties = _tied_pairs(xs), _tied_pairs(ys)
+        joint_ties = _tied_pairs(zip(xs, ys)) if x_ties and y_ties else 0
+        swaps = _count_swaps(list(map(ys.__getitem__, order)))
+        return (total - x_ties - y_ties + joint_ties - 2 * swaps) / sqrt(
+         (total - x_ties) * (total - y_ties)
+        )
+
+
+    def _paired_with(self, variable):
+        """Checks that another Variable can be paired with this one, and
+        returns the values of both where neither is missing.
+
+        :param Variable variable: The other Variable.
+        :raises TypeError: if something other than a Variable is given.
+        :raises ValueError: if Variables of different length are given.
+        :rtype: ``tuple``"""
+
+        if not isinstance(variable, Variable):
+            raise TypeError("{} is not a Variable".format(str(variable)))
+        if self.length != variable.length:
+            raise ValueError(
+             "length {} is not length {}".format(self.length, variable.length)
+            )
+        return self._complete_pairs(variable)
+
+
+    def bootstrap(self, statistic="mean", other=None, resamples=10000,
+                  batch_size=1000, seed=None, workers=None, executor=None):
+        """Bootstraps a statistic of the Variable, returning a
+        :py:class:`.Bootstrap` from which its standard error and confidence
+        intervals can be found:
+
+            >>> variable.bootstrap("median", seed=1).interval(0.95)
+            (171.5, 179.0)
+
+        The values are resampled with replacement many times, in batches,
+        and the statistic is calculated for each resample directly from the
+        resampled values. The batches can be spread across several
+        processes, and giving a seed makes the result the same whatever the
+        number of processes.
+
+        :param str statistic: The statistic - ``"mean"`` (the default),\
+        ``"median"``, ``"variance"``, ``"st_dev"`` or ``"correlation"``.
+        :param Variable other: The other Variable, for the correlation. Pairs\
+        are resampled together, and pairs with a missing value are skipped.
+        :param int resamples: The number of resamples (default is 10000).
+        :param int batch_size: The number of resamples in each batch.
+        :param seed: The seed for the random resampling.
+        :param int workers: The number of processes to use.
+        :param executor: A ``concurrent.futures`` style executor to use.
+        :raises ValueError: if an unknown statistic is given, or the other\
+        Variable is missing or a different length.
+        :raises ValueError: if every value (or every pair) has a missing value.
+        :rtype: ``Bootstrap``"""
+
+        if other is None:
+            xs, ys = list(self._present()), None
+        else:
+            if not isinstance(other, Variable):
+                raise TypeError("{} is not a Variable".format(other))
+            if len(other) != len(self):
+                raise ValueError(
+                 "length {} is not length {}".format(len(self), len(other))
+                )
+            xs, ys = self._complete_pairs(other)
+        return bootstrap(
+         xs, statistic, ys, resamples=resamples, batch_size=batch_size,
+         seed=seed, workers=workers, executor=executor
+        )
+
+
+    def _complete_pairs(self, variable):
+        """Returns the values of this Variable and another at the positions
+        where neither is missing.
+
+        :param Variable variable: The other Variable.
+        :rtype: ``tuple``"""
+
+        if not self._missing and not variable._missing:
+            return list(self._present()), list(variable._present())
+        valid = bytes(map(and_, *[
+         repeat(1) if v._valid is None else v._valid for v in (self, variable)
+        ]))
+        return (
+         list(compress(self._decode(self._values), valid)),
+         list(compress(variable._decode(variable._values), valid))
+        )
+
+
     def covariance_with(self, variable):
         """Returns the covariance between this Variable and another Variable.
         This is a measure of how the variance of the two series reflect each
@@ -264,9 +1530,11 @@ class Variable:
             raise ValueError(
              "length {} is not length {}".format(self.length, variable.length)
             )
+        if self._missing or variable._missing:
+            return self.co_moments_with(variable).covariance()
         this_mean, other_mean = self.mean, variable.mean
         square_deviations = sum([(value - this_mean) * (other - other_mean)
-         for value, other in zip(self._values, variable._values)])
+         for value, other in zip(self._present(), variable._present())])
         mean_square_deviation = square_deviations / (self.length - 1)
         return mean_square_deviation
 
@@ -283,6 +1551,208 @@ class Variable:
         :param Variable variable: The other Variable. It must be the same\
         length as this one."""
 
+        if self._missing or variable._missing:
+            return self.co_moments_with(variable).correlation()
         covariance = self.covariance_with(variable)
         sd_product = self.st_dev() * variable.st_dev()
         return covariance / sd_product
+
+
+
+def _unmask(value, valid):
+    """Returns a stored value, or ``None`` if it is missing.
+
+    :param value: The stored value.
+    :param valid: Whether the value is present."""
+
+    return value if valid else None
+
+
+
+def _skip_missing(function):
+    """Wraps a function so that it returns ``None`` if any of its arguments
+    are ``None``, so that missing values stay missing through arithmetic.
+
+    :param function: The function to wrap.
+    :rtype: ``function``"""
+
+    def wrapper(*args):
+        if None in args: return None
+        return function(*args)
+    return wrapper
+
+
+
+def _code_typecode(categories):
+    """Returns the typecode of the narrowest array which can hold a code for
+    each of a number of categories.
+
+    :param int categories: The number of categories.
+    :rtype: ``str``"""
+
+    if categories <= 0x100: return "B"
+    if categories <= 0x10000: return "H"
+    return "I"
+
+
+def _bincount(codes, size):
+    """Counts how many times each code from 0 up to some size occurs in an
+    array of codes. With only a few codes, each is counted by scanning the raw
+    bytes, and otherwise they are all counted in one pass.
+
+    :param array codes: The codes to count.
+    :param int size: The number of possible codes.
+    :rtype: ``list``"""
+
+    if codes.typecode == "B" and size <= 32:
+        data = codes.tobytes()
+        return [data.count(code) for code in range(size)]
+    counts = Counter(codes)
+    return [counts[code] for code in range(size)]
+
+
+def _ranks(values):
+    """Returns the rank of each value, counting from 1, with tied values all
+    given the average of the ranks they span.
+
+    :param list values: The values to rank.
+    :rtype: ``list``"""
+
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0] * len(values)
+    for rank, index in enumerate(order, 1): ranks[index] = rank
+    if len(set(values)) < len(values):
+        position = 0
+        for value, group in groupby(map(values.__getitem__, order)):
+            size = sum(1 for _ in group)
+            if size > 1:
+                rank = position + (size + 1) / 2
+                for index in order[position:position + size]:
+                    ranks[index] = rank
+            position += size
+    return ranks
+
+
+
+def _tied_pairs(values):
+    """Returns the number of pairs of equal values in some values.
+
+    :param values: The values, which must be hashable.
+    :rtype: ``int``"""
+
+    sizes = Counter(Counter(values).values())
+    return sum(size * (size - 1) // 2 * count for size, count in sizes.items())
+
+
+
+def _count_swaps(values, block_size=128):
+    """Sorts a list in place with a bottom-up merge sort, returning the number
+    of swaps of adjacent values an exchange sort would need - the number of
+    pairs which are out of order.
+
+    Small blocks are sorted by insertion first. When two sorted runs are then
+    merged, the number of values in the left run greater than each value in
+    the right run is found by binary search, and the merge itself is left to
+    ``list.sort``, which recognises the two runs.
+
+    :param list values: The values to sort.
+    :param int block_size: The size of the blocks sorted by insertion.
+    :rtype: ``int``"""
+
+    swaps, length, source = 0, len(values), []
+    for start in range(0, length, block_size):
+        block = []
+        for position, value in enumerate(values[start:start + block_size]):
+            swaps += position - bisect_right(block, value)
+            insort(block, value)
+        source += block
+    width = block_size
+    while width < length:
+        merged = []
+        for start in range(0, length, 2 * width):
+            left = source[start:start + width]
+            right = source[start + width:start + 2 * width]
+            swaps += len(left) * len(right) - sum(
+             map(bisect_right, repeat(left, len(right)), right)
+            )
+            left += right
+            left.sort()
+            merged += left
+        source, width = merged, width * 2
+    values[:] = source
+    return swaps
+
+
+
+def _moments(values, count=0, mean=0, square_deviations=0):
+    """Calculates the count, mean and sum of squared deviations from the mean
+    of some values in a single pass, using Welford's algorithm. Existing totals
+    can be given, in which case they will be extended by the new values.
+
+    :param values: The values to use.
+    :param int count: The number of values already seen.
+    :param mean: The mean of the values already seen.
+    :param square_deviations: The sum of squared deviations already seen.
+    :rtype: ``tuple``"""
+
+    for value in values:
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        square_deviations += delta * (value - mean)
+    return count, mean, square_deviations
+
+
+
+def _select(values, ranks):
+    """Finds the values which would be at the given positions if the values
+    were sorted, without sorting them, in expected linear time.
+
+    Large partitions are first narrowed Floyd-Rivest style - a small sorted
+    sample is used to pick bounds which almost certainly enclose all the
+    wanted ranks, and only the values between them are kept. Partitions are
+    otherwise split around a pivot as in quickselect, and only the parts
+    containing wanted ranks are split further. Partitions which are small,
+    which contain so many wanted ranks that sorting is cheaper, or which have
+    been split unevenly too many times, are just sorted.
+
+    :param list values: The values to select from. This may be reordered.
+    :param list ranks: The sorted positions wanted.
+    :rtype: ``dict``"""
+
+    selected, generator = {}, random.Random(len(values))
+    stack = [(values, ranks, 0, 2 * len(values).bit_length())]
+    while stack:
+        values, ranks, offset, depth = stack.pop()
+        if len(values) <= 32 or len(ranks) > 16 or depth == 0:
+            values.sort()
+            for rank in ranks: selected[rank] = values[rank - offset]
+            continue
+        if len(values) > 4096:
+            size = int(len(values) ** (2 / 3))
+            sample = sorted(generator.sample(values, size))
+            scale, gap = size / len(values), int(size ** 0.5)
+            first = int((ranks[0] - offset) * scale) - gap
+            last = int((ranks[-1] - offset) * scale) + gap
+            if first > 0 or last < size - 1:
+                low, high = sample[max(first, 0)], sample[min(last, size - 1)]
+                below = sum(map(lt, values, repeat(low)))
+                band = [value for value in values if low <= value <= high]
+                if below <= ranks[0] - offset and (
+                 ranks[-1] - offset < below + len(band)
+                ):
+                    stack.append((band, ranks, offset + below, depth - 1))
+                    continue
+            pivot = sample[int((ranks[len(ranks) // 2] - offset) * scale)]
+        else:
+            pivot = sorted((values[0], values[len(values) // 2], values[-1]))[1]
+        lower = [value for value in values if value < pivot]
+        upper = [value for value in values if value > pivot]
+        start, end = offset + len(lower), offset + len(values) - len(upper)
+        lower_ranks = [rank for rank in ranks if rank < start]
+        upper_ranks = [rank for rank in ranks if rank >= end]
+        for rank in ranks:
+            if start <= rank < end: selected[rank] = pivot
+        if lower_ranks: stack.append((lower, lower_ranks, offset, depth - 1))
+        if upper_ranks: stack.append((upper, upper_ranks, end, depth - 1))
+    return selected
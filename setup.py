@@ -14,9 +14,10 @@ setup(
   "License :: OSI Approved :: MIT License",
   "Topic :: Scientific/Engineering :: Mathematics",
   "Programming Language :: Python :: 3",
-  "Programming Language :: Python :: 3.6",
+  "Programming Language :: Python :: 3.8",
  ],
  keywords="statistics probability data-science",
  packages=["inferi"],
+ python_requires=">=3.8",
  install_requires=[]
 )
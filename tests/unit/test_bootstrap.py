@@ -0,0 +1,187 @@
+from unittest import TestCase
+from unittest.mock import patch
+from inferi.bootstrap import Bootstrap, bootstrap, _resample_batch
+from inferi.variables import Variable
+
+class BootstrapTests(TestCase):
+
+    def test_can_create_bootstrap(self):
+        result = Bootstrap(5, [4, 6, 5])
+        self.assertEqual(result._estimate, 5)
+        self.assertEqual(result._replicates, (4, 6, 5))
+        self.assertEqual(result.estimate, 5)
+        self.assertEqual(result.replicates, (4, 6, 5))
+
+
+    def test_bootstrap_repr(self):
+        result = Bootstrap(5, [4, 6])
+        self.assertEqual(str(result), "<Bootstrap (2 resamples)>")
+        self.assertEqual(len(result), 2)
+
+
+    def test_standard_error(self):
+        result = Bootstrap(5, [2, 4, 4, None, 4, 5, 5, 7, 9])
+        self.assertAlmostEqual(result.standard_error, (32 / 7) ** 0.5)
+
+
+    def test_undefined_statistic_has_no_error_or_interval(self):
+        result = Bootstrap(None, [None, None])
+        with self.assertRaises(ValueError):
+            result.standard_error
+        with self.assertRaises(ValueError):
+            result.interval()
+        with self.assertRaises(ValueError):
+            Variable(3).bootstrap("variance", resamples=5).interval()
+
+
+    def test_interval(self):
+        result = Bootstrap(50, range(101))
+        lower, upper = result.interval()
+        self.assertAlmostEqual(lower, 2.5)
+        self.assertAlmostEqual(upper, 97.5)
+        self.assertEqual(result.interval(0.5), (25, 75))
+        with self.assertRaises(ValueError):
+            result.interval(1)
+
+
+
+class BootstrappingTests(TestCase):
+
+    def setUp(self):
+        self.values = [2, 4, 4, 4, 5, 5, 7, 9]
+
+
+    def test_resample_batch(self):
+        data, task = (self.values, None), ("mean", 5, 1)
+        results = _resample_batch(data, task)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results, _resample_batch(data, task))
+        for result in results:
+            self.assertGreaterEqual(result, 2)
+            self.assertLessEqual(result, 9)
+
+
+    def test_resamples_of_one_value(self):
+        self.assertEqual(
+         _resample_batch(([3], None), ("median", 2, 1)), [3, 3]
+        )
+        self.assertEqual(
+         _resample_batch(([3], None), ("variance", 2, 1)), [None, None]
+        )
+
+
+    def test_undefined_correlations_are_missing(self):
+        results = _resample_batch(([1, 2], [1, 2]), ("correlation", 20, 1))
+        self.assertIn(None, results)
+        self.assertEqual(set(results), {None, 1})
+
+
+    def test_bootstrap_statistics(self):
+        for statistic, estimate in (
+         ("mean", 5), ("median", 4.5), ("variance", 32 / 7),
+         ("st_dev", (32 / 7) ** 0.5)
+        ):
+            result = bootstrap(self.values, statistic, resamples=20, seed=1)
+            self.assertAlmostEqual(result.estimate, estimate)
+            self.assertEqual(len(result), 20)
+
+
+    def test_bootstrap_correlation(self):
+        result = bootstrap(
+         [1, 2, 3, 4], "correlation", [2, 4, 6, 9], resamples=10, seed=1
+        )
+        self.assertAlmostEqual(result.estimate, 0.9944, delta=0.0001)
+
+
+    def test_only_correlation_needs_pairs(self):
+        with self.assertRaises(ValueError):
+            bootstrap([1, 2, 3, 4], "correlation")
+        with self.assertRaises(ValueError):
+            bootstrap([1, 2, 3, 4], "mean", [2, 4, 6, 9])
+
+
+    def test_batch_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            bootstrap(self.values, "mean", batch_size=0)
+
+
+    def test_values_must_be_given(self):
+        with self.assertRaises(ValueError):
+            bootstrap([], "mean")
+
+
+    def test_bootstrap_with_worker_processes(self):
+        result = bootstrap(self.values, "mean", resamples=6, batch_size=2,
+         seed=2, workers=2)
+        self.assertEqual(
+         result.replicates,
+         bootstrap(self.values, "mean", resamples=6, batch_size=2,
+          seed=2).replicates
+        )
+
+
+    def test_unknown_statistic(self):
+        with self.assertRaises(ValueError):
+            bootstrap(self.values, "mode")
+
+
+    def test_seed_is_reproducible(self):
+        result1 = bootstrap(self.values, "mean", resamples=25, batch_size=10,
+         seed=3)
+        result2 = bootstrap(self.values, "mean", resamples=25, batch_size=10,
+         seed=3)
+        self.assertEqual(result1.replicates, result2.replicates)
+
+
+    @patch("inferi.bootstrap.parallel_map")
+    def test_batches_are_sent_to_parallel_map(self, mock_map):
+        mock_map.return_value = [[1, 2], [3]]
+        result = bootstrap(
+         self.values, "mean", resamples=3, batch_size=2, seed=1, workers=4
+        )
+        tasks = mock_map.call_args[0][1]
+        self.assertEqual(
+         [task[:2] for task in tasks], [("mean", 2), ("mean", 1)]
+        )
+        self.assertNotEqual(tasks[0][2], tasks[1][2])
+        self.assertEqual(mock_map.call_args[1], {
+         "workers": 4, "executor": None, "shared": (self.values, None)
+        })
+        self.assertEqual(result.replicates, (1, 2, 3))
+
+
+
+class VariableBootstrapTests(TestCase):
+
+    def test_variable_bootstrap(self):
+        var = Variable(2, 4, None, 4, 4, 5, 5, 7, 9)
+        result = var.bootstrap("median", resamples=50, seed=1)
+        self.assertIsInstance(result, Bootstrap)
+        self.assertEqual(result.estimate, 4.5)
+        self.assertEqual(len(result), 50)
+        self.assertEqual(
+         result.replicates,
+         var.bootstrap("median", resamples=50, seed=1).replicates
+        )
+
+
+    def test_variable_correlation_bootstrap(self):
+        var1 = Variable(1, 2, 3, 4, None)
+        var2 = Variable(2, 4, 6, 9, 10)
+        result = var1.bootstrap("correlation", var2, resamples=10, seed=1)
+        self.assertAlmostEqual(result.estimate, 0.9944, delta=0.0001)
+
+
+    def test_other_must_be_matching_variable(self):
+        var = Variable(1, 2, 3, 4)
+        with self.assertRaises(TypeError):
+            var.bootstrap("correlation", [1, 2, 3, 4])
+        with self.assertRaises(ValueError):
+            var.bootstrap("correlation", Variable(1, 2, 3))
+
+
+    def test_variable_must_have_present_values(self):
+        with self.assertRaises(ValueError):
+            Variable(None, None).bootstrap("mean")
+        with self.assertRaises(ValueError):
+            Variable(1, None).bootstrap("correlation", Variable(None, 2))
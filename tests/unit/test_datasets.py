@@ -1,7 +1,12 @@
+from array import array
+import os
+import tempfile
 from unittest import TestCase
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 from inferi.variables import Variable
-from inferi.datasets import Dataset
+from inferi.datasets import Dataset, Rows, _summarise, _frequency_median
 
 class DatasetTest(TestCase):
 
@@ -9,6 +14,8 @@ class DatasetTest(TestCase):
         self.variables = [Mock(Variable), Mock(Variable), Mock(Variable)]
         for var in self.variables:
             var.length = 4
+            var._missing = 0
+            var._categories = None
 
 
 
@@ -134,13 +141,161 @@ class DatasetVariablePoppingTests(DatasetTest):
 
 
 
-class DatasetRowsTests(DatasetTest):
+class DatasetRowsTests(TestCase):
+
+    def setUp(self):
+        self.dataset = Dataset(
+         Variable(5, 7), Variable(15, 17, dtype="i4"), Variable(25, 27)
+        )
+
 
     def test_can_get_dataset_rows(self):
-        for index, var in enumerate(self.variables):
-            var._values = (index * 10 + 5, index * 10 + 7)
-        dataset = Dataset(*self.variables)
-        self.assertEqual(dataset.rows, ((5, 15, 25), (7, 17, 27)))
+        rows = self.dataset.rows
+        self.assertIsInstance(rows, Rows)
+        self.assertIs(rows._dataset, self.dataset)
+        self.assertEqual(rows, ((5, 15, 25), (7, 17, 27)))
+
+
+    def test_rows_repr(self):
+        self.assertEqual(str(self.dataset.rows), "<Rows (2 rows)>")
+        self.assertEqual(len(self.dataset.rows), 2)
+        self.assertEqual(len(Dataset().rows), 0)
+
+
+    def test_can_index_rows(self):
+        rows = self.dataset.rows
+        self.assertEqual(rows[0], (5, 15, 25))
+        self.assertEqual(rows[-1], (7, 17, 27))
+        self.assertEqual(rows[1:], ((7, 17, 27),))
+        with self.assertRaises(IndexError):
+            rows[2]
+
+
+    def test_rows_are_iterated_lazily(self):
+        iterator = iter(self.dataset.rows)
+        self.assertEqual(next(iterator), (5, 15, 25))
+        self.dataset.variables[2][1] = 30
+        self.assertEqual(next(iterator), (7, 17, 30))
+
+
+    def test_rows_reflect_changes(self):
+        rows = self.dataset.rows
+        self.dataset.add_row([9, 19, 29])
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[2], (9, 19, 29))
+
+
+    def test_can_get_single_row(self):
+        self.assertEqual(self.dataset.row(1), (7, 17, 27))
+        self.assertEqual(self.dataset.row(-2), (5, 15, 25))
+        with self.assertRaises(IndexError):
+            self.dataset.row(2)
+
+
+
+class DatasetBulkAdditionTests(TestCase):
+
+    def setUp(self):
+        self.dataset = Dataset(
+         Variable(1, 2, dtype="i4"), Variable("a", "b", dtype="category"),
+         Variable(0.5, 1.5)
+        )
+
+
+    def test_can_extend_columns(self):
+        self.dataset.extend_columns([[3, 4], ("c", None), iter([2.5, 3.5])])
+        self.assertEqual(tuple(self.dataset.rows), (
+         (1, "a", 0.5), (2, "b", 1.5), (3, "c", 2.5), (4, None, 3.5)
+        ))
+
+
+    def test_columns_must_match_variables(self):
+        with self.assertRaises(ValueError):
+            self.dataset.extend_columns([[3], ["c"]])
+        with self.assertRaises(ValueError):
+            self.dataset.extend_columns([[3], ["c"], [2.5, 3.5]])
+
+
+    def test_failed_extension_changes_nothing(self):
+        with self.assertRaises(TypeError):
+            self.dataset.extend_columns([["x"], ["c"], [2.5]])
+        self.assertEqual(
+         [len(variable) for variable in self.dataset.variables], [2, 2, 2]
+        )
+
+
+    def test_failed_extension_forgets_new_categories(self):
+        dataset = Dataset(
+         Variable("x", "y", dtype="category"), Variable(1, 2, dtype="i4")
+        )
+        with self.assertRaises(TypeError):
+            dataset.extend_columns([["z"], ["bad"]])
+        self.assertEqual(dataset.variables[0].categories, ("x", "y"))
+        dataset.extend_columns([["w"], [3]])
+        self.assertEqual(dataset.variables[0].categories, ("x", "y", "w"))
+        self.assertEqual(dataset.row(-1), ("w", 3))
+
+
+    def test_can_add_rows_in_chunks(self):
+        rows = ((n, str(n), n / 2) for n in range(3, 8))
+        with patch.object(
+         self.dataset, "extend_columns", wraps=self.dataset.extend_columns
+        ) as mock_extend:
+            self.dataset.add_rows(rows, chunk_size=2)
+        self.assertEqual(mock_extend.call_count, 3)
+        self.assertEqual(
+         mock_extend.call_args_list[0][0][0], [(3, 4), ("3", "4"), (1.5, 2)]
+        )
+        self.assertEqual(len(self.dataset.rows), 7)
+        self.assertEqual(self.dataset.row(-1), (7, "7", 3.5))
+
+
+    def test_rows_must_be_correct_length(self):
+        rows = [[3, "c", 2.5], [4, "d", 3.5], [5, "e"]]
+        with self.assertRaises(ValueError):
+            self.dataset.add_rows(rows, chunk_size=2)
+        self.assertEqual(len(self.dataset.rows), 4)
+        self.assertEqual(self.dataset.row(3), (4, "d", 3.5))
+
+
+    def test_chunk_size_must_be_positive(self):
+        for chunk_size in (0, -1):
+            with self.assertRaises(ValueError):
+                self.dataset.add_rows([[3, "c", 2.5]], chunk_size=chunk_size)
+        self.assertEqual(len(self.dataset.rows), 2)
+
+
+    def test_can_add_no_rows(self):
+        self.dataset.add_rows([])
+        self.assertEqual(len(self.dataset.rows), 2)
+
+
+
+class DatasetBufferTests(TestCase):
+
+    def test_can_get_buffers(self):
+        dataset = Dataset(
+         Variable(1, 2, 3, dtype="i8", name="a"), Variable(4, 5, 6, dtype="f8")
+        )
+        buffers = dataset.buffers()
+        self.assertEqual(list(buffers), ["a", 1])
+        self.assertEqual(buffers["a"].tolist(), [1, 2, 3])
+        self.assertEqual(buffers[1].tolist(), [4, 5, 6])
+
+
+    def test_all_variables_must_be_typed(self):
+        dataset = Dataset(Variable(1, 2, 3, dtype="i8"), Variable(4, 5, 6))
+        with self.assertRaises(TypeError):
+            dataset.buffers()
+
+
+    def test_variable_names_must_be_unique(self):
+        dataset = Dataset(
+         Variable(1, 2, dtype="i8", name="a"),
+         Variable(3, 4, dtype="i8", name="a")
+        )
+        with self.assertRaises(ValueError):
+            dataset.buffers()
 
 
 
@@ -175,17 +330,15 @@ class DatasetSortingTests(DatasetTest):
     def test_can_sort_dataset(self):
         dataset = Dataset(*self.variables)
         dataset.sort()
-        self.assertEqual(self.variables[0]._values, [1, 2, 4, 6])
-        self.assertEqual(self.variables[1]._values, [-1, 0.7, 0.9, 0.2])
-        self.assertEqual(self.variables[2]._values, [200, 100, 90, 900])
+        for variable in self.variables:
+            variable._reorder.assert_called_with([3, 0, 2, 1])
 
 
     def test_can_sort_dataset_by_column(self):
         dataset = Dataset(*self.variables)
         dataset.sort(self.variables[2])
-        self.assertEqual(self.variables[0]._values, [4, 2, 1, 6])
-        self.assertEqual(self.variables[1]._values, [0.9, 0.7, -1, 0.2])
-        self.assertEqual(self.variables[2]._values, [90, 100, 200, 900])
+        for variable in self.variables:
+            variable._reorder.assert_called_with([2, 0, 3, 1])
 
 
     def test_column_must_be_variable(self):
@@ -198,3 +351,215 @@ class DatasetSortingTests(DatasetTest):
         dataset = Dataset(*self.variables)
         with self.assertRaises(ValueError):
             dataset.sort(Mock(Variable))
+
+
+
+class DatasetMissingValueTests(TestCase):
+
+    def test_rows_show_missing_values(self):
+        dataset = Dataset(Variable(1, None, dtype="i8"), Variable(None, 4))
+        self.assertEqual(dataset.rows, ((1, None), (None, 4)))
+
+
+    def test_sort_puts_missing_values_last(self):
+        var1 = Variable(5, None, 2, None, 7, dtype="f8")
+        var2 = Variable("a", "b", "c", "d", "e")
+        Dataset(var1, var2).sort()
+        self.assertEqual(var1.values, (2, 5, 7, None, None))
+        self.assertEqual(var2.values, ("c", "a", "e", "b", "d"))
+
+
+    def test_describe_skips_missing_values(self):
+        dataset = Dataset(Variable(1, None, 3, 3, dtype="i8", name="a"))
+        description = dataset.describe(chunk_size=2)["a"]
+        self.assertEqual(description["length"], 4)
+        self.assertEqual(description["mean"], 7 / 3)
+        self.assertEqual(description["median"], 3)
+        self.assertEqual(description["frequencies"], {1: 1, 3: 2})
+
+
+    def test_covariance_matrix_needs_complete_variables(self):
+        dataset = Dataset(Variable(1, None, 3), Variable(1, 2, 3))
+        with self.assertRaises(ValueError):
+            dataset.covariance_matrix()
+
+
+
+class DatasetCategoricalTests(TestCase):
+
+    def test_rows_decode_categories(self):
+        dataset = Dataset(Variable("x", "y", dtype="category"), Variable(1, 2))
+        self.assertEqual(dataset.rows, (("x", 1), ("y", 2)))
+
+
+    def test_sort_by_categorical_variable(self):
+        var1 = Variable("b", None, "c", "a", "b", dtype="category")
+        var2 = Variable(1, 2, 3, 4, 5)
+        with patch.object(var1, "_category_ranks") as mock_ranks:
+            mock_ranks.return_value = [1, 0, 2, 0, 1]
+            Dataset(var1, var2).sort(var1)
+        self.assertEqual(var1.values, ("a", "b", "b", "c", None))
+        self.assertEqual(var2.values, (4, 1, 5, 3, 2))
+        self.assertEqual(var1.categories, ("b", "c", "a"))
+
+
+
+class DatasetCovarianceMatrixTests(TestCase):
+
+    def setUp(self):
+        self.variables = [
+         Variable(2.1, 2.5, 4.0, 3.6, name="a"),
+         Variable(8, 12, 14, 10, name="b"),
+         Variable(1, 3, 2, 7, name="c")
+        ]
+        self.dataset = Dataset(*self.variables)
+
+
+    def test_can_get_covariance_matrix(self):
+        matrix = self.dataset.covariance_matrix()
+        self.assertEqual(matrix.names, ("a", "b", "c"))
+        for first in self.variables:
+            for second in self.variables:
+                self.assertAlmostEqual(
+                 matrix[first.name, second.name],
+                 first.covariance_with(second), delta=0.000001
+                )
+
+
+    def test_unnamed_variables_are_keyed_by_position(self):
+        self.variables[1].name = ""
+        matrix = self.dataset.covariance_matrix()
+        self.assertEqual(matrix.names, ("a", 1, "c"))
+        self.assertAlmostEqual(
+         matrix[1, "c"], self.variables[1].covariance_with(self.variables[2])
+        )
+        self.assertEqual(
+         self.dataset.correlation_matrix().names, ("a", 1, "c")
+        )
+
+
+    def test_variable_names_must_be_unique(self):
+        self.variables[2].name = "a"
+        with self.assertRaises(ValueError):
+            self.dataset.covariance_matrix()
+
+
+    def test_categorical_variables_use_values(self):
+        self.variables[1] = Variable(8, 12, 14, 10, name="b", dtype="category")
+        matrix = Dataset(*self.variables).covariance_matrix(block_size=3)
+        self.assertAlmostEqual(
+         matrix["a", "b"], self.variables[0].covariance_with(
+          Variable(8, 12, 14, 10)
+         ), delta=0.000001
+        )
+
+
+    def test_blocks_give_same_result(self):
+        whole = self.dataset.covariance_matrix()
+        blocked = self.dataset.covariance_matrix(block_size=3)
+        for first, second in zip(whole._triangle, blocked._triangle):
+            self.assertAlmostEqual(first, second, delta=0.000001)
+
+
+    def test_can_get_population_covariance_matrix(self):
+        matrix = self.dataset.covariance_matrix(population=True)
+        self.assertAlmostEqual(matrix["a", "b"], 1.15, delta=0.000001)
+
+
+    def test_can_get_correlation_matrix(self):
+        matrix = self.dataset.correlation_matrix()
+        self.assertAlmostEqual(matrix["a", "a"], 1, delta=0.000001)
+        self.assertAlmostEqual(
+         matrix["b", "c"], self.variables[1].correlation_with(self.variables[2]),
+         delta=0.000001
+        )
+
+
+
+class DatasetDescriptionTests(TestCase):
+
+    def setUp(self):
+        self.dataset = Dataset(
+         Variable(4, 8, 15, 16, 23, 42, name="numbers"),
+         Variable("a", "b", "a", "c", "a", "b")
+        )
+
+
+    def test_can_describe_dataset(self):
+        description = self.dataset.describe(chunk_size=4)
+        self.assertEqual(description["numbers"]["length"], 6)
+        self.assertEqual(description["numbers"]["min"], 4)
+        self.assertEqual(description["numbers"]["max"], 42)
+        self.assertEqual(description["numbers"]["mean"], 18)
+        self.assertAlmostEqual(
+         description["numbers"]["variance"], 182, delta=0.000001
+        )
+        self.assertEqual(description["numbers"]["median"], 15.5)
+        self.assertEqual(description[1], {
+         "length": 6, "min": None, "max": None, "mean": None,
+         "variance": None, "median": None,
+         "frequencies": Counter({"a": 3, "b": 2, "c": 1})
+        })
+
+
+    def test_variable_names_must_be_unique(self):
+        dataset = Dataset(Variable(1, 2, name="a"), Variable(3, 4, name="a"))
+        with self.assertRaises(ValueError):
+            dataset.describe()
+
+
+    @patch("inferi.datasets.parallel_map")
+    def test_chunks_are_sent_to_workers(self, mock_map):
+        mock_map.side_effect = lambda f, tasks, **kwargs: list(map(f, tasks))
+        self.dataset.describe(workers=3, chunk_size=4)
+        args, kwargs = mock_map.call_args
+        self.assertEqual(args[0], _summarise)
+        self.assertEqual(args[1], [
+         [4, 8, 15, 16], [23, 42], ["a", "b", "a", "c"], ["a", "b"]
+        ])
+        self.assertEqual(kwargs, {"workers": 3, "executor": None})
+
+
+    def test_can_describe_with_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            description = self.dataset.describe(executor=executor, chunk_size=2)
+        self.assertEqual(description["numbers"]["median"], 15.5)
+
+
+    def test_can_describe_mapped_variable_with_process_pool(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "values.bin")
+            with open(path, "wb") as f:
+                array("i", [1, 4, 4, 2, 9]).tofile(f)
+            variable = Variable.from_file(path, "i4", name="mapped")
+            description = Dataset(variable).describe(workers=2, chunk_size=2)
+            variable.close()
+        self.assertEqual(description["mapped"]["mean"], 4)
+        self.assertEqual(description["mapped"]["frequencies"][4], 2)
+
+
+    def test_can_describe_with_process_pool(self):
+        description = self.dataset.describe(workers=2, chunk_size=3)
+        self.assertEqual(description["numbers"]["mean"], 18)
+        self.assertEqual(description[1]["frequencies"]["a"], 3)
+
+
+
+class SummaryTests(TestCase):
+
+    def test_can_summarise_numbers(self):
+        moments, frequencies = _summarise([4, 8, 4])
+        self.assertEqual(moments.length, 3)
+        self.assertEqual(frequencies, Counter({4: 2, 8: 1}))
+
+
+    def test_can_summarise_non_numbers(self):
+        moments, frequencies = _summarise(["a", "b"])
+        self.assertIsNone(moments)
+        self.assertEqual(frequencies, Counter({"a": 1, "b": 1}))
+
+
+    def test_can_get_median_from_frequencies(self):
+        self.assertEqual(_frequency_median(Counter({4: 2, 8: 1})), 4)
+        self.assertEqual(_frequency_median(Counter({4: 1, 8: 1})), 6)
+        self.assertEqual(_frequency_median(Counter({1: 1, 2: 2, 9: 1})), 2)
@@ -0,0 +1,176 @@
+from unittest import TestCase
+from inferi.expressions import Expression
+from inferi.variables import Variable
+from inferi.moments import Moments
+
+class ExpressionCreationTests(TestCase):
+
+    def test_can_create_expression(self):
+        var = Variable(4, 23, 10)
+        expression = Expression(var)
+        self.assertIsNone(expression._function)
+        self.assertEqual(expression._operands, (var,))
+        self.assertEqual(expression._length, 3)
+
+
+    def test_variables_can_make_expressions(self):
+        var = Variable(4, 23, 10)
+        expression = var.lazy()
+        self.assertIsInstance(expression, Expression)
+        self.assertEqual(expression._operands, (var,))
+
+
+    def test_expression_repr(self):
+        expression = Variable(4, 23, 10).lazy()
+        self.assertEqual(str(expression), "<Expression (3 values)>")
+
+
+    def test_expression_length(self):
+        expression = Variable(4, 23, 10).lazy()
+        self.assertEqual(len(expression), 3)
+        self.assertEqual(expression.length, 3)
+
+
+
+class ExpressionArithmeticTests(TestCase):
+
+    def setUp(self):
+        self.var1 = Variable(4, 23, 10)
+        self.var2 = Variable(5, 1, 2)
+
+
+    def test_operators_build_expressions(self):
+        expression = self.var1.lazy() + 1
+        self.assertIsInstance(expression, Expression)
+        self.assertEqual(expression._operands[1], 1)
+        self.assertIs(expression._operands[0]._operands[0], self.var1)
+
+
+    def test_operators_are_not_evaluated_until_needed(self):
+        expression = self.var1.lazy() * 2
+        self.var1[0] = 5
+        self.assertEqual(list(expression), [10, 46, 20])
+
+
+    def test_can_combine_expressions_and_variables(self):
+        expression = self.var1.lazy() + self.var2
+        self.assertEqual(list(expression), [9, 24, 12])
+        expression = self.var1 - self.var2.lazy()
+        self.assertIsInstance(expression, Expression)
+        self.assertEqual(list(expression), [-1, 22, 8])
+        expression = self.var1.lazy() * self.var2.lazy()
+        self.assertEqual(list(expression), [20, 23, 20])
+
+
+    def test_reflected_operators(self):
+        self.assertEqual(list(30 - self.var1.lazy()), [26, 7, 20])
+        self.assertEqual(list(46 / self.var1.lazy()), [11.5, 2, 4.6])
+        self.assertEqual(list(2 ** self.var2.lazy()), [32, 2, 4])
+        self.assertEqual(list(2 + self.var2.lazy()), [7, 3, 4])
+        self.assertEqual(list(2 * self.var2.lazy()), [10, 2, 4])
+
+
+    def test_unary_operators_and_comparisons(self):
+        self.assertEqual(list(-self.var1.lazy()), [-4, -23, -10])
+        self.assertEqual(list(abs(self.var1.lazy() - 10)), [6, 13, 0])
+        self.assertEqual(list(self.var1.lazy() < 10), [True, False, False])
+        self.assertEqual(list(self.var1.lazy() <= 10), [True, False, True])
+        self.assertEqual(list(self.var1.lazy() > 10), [False, True, False])
+        self.assertEqual(list(self.var1.lazy() >= 10), [False, True, True])
+
+
+    def test_lengths_must_match(self):
+        self.var2.pop()
+        with self.assertRaises(ValueError):
+            self.var1.lazy() + self.var2
+        with self.assertRaises(ValueError):
+            self.var1 + self.var2.lazy()
+
+
+    def test_can_chain_operations(self):
+        var = Variable(2, 4, 4, 4, 5, 5, 7, 9)
+        expression = ((var.lazy() - var.mean) / var.st_dev(True)) ** 2
+        self.assertEqual(list(expression), [
+         2.25, 0.25, 0.25, 0.25, 0, 0, 1, 4
+        ])
+
+
+
+class ExpressionEvaluationTests(TestCase):
+
+    def setUp(self):
+        self.var = Variable(2, 4, 4, 4, 5, 5, 7, 9)
+        self.expression = (self.var.lazy() - 5) ** 2
+
+
+    def test_can_compute_variable(self):
+        var = self.expression.compute()
+        self.assertIsInstance(var, Variable)
+        self.assertEqual(var._values, [9, 1, 1, 1, 0, 0, 4, 16])
+        var = self.expression.compute(name="squares", dtype="f8")
+        self.assertEqual(var.name, "squares")
+        self.assertEqual(var.dtype, "f8")
+
+
+    def test_reductions(self):
+        self.assertEqual(self.expression.sum, 32)
+        self.assertEqual(self.expression.mean, 4)
+        self.assertEqual(self.expression.max, 16)
+        self.assertEqual(self.expression.min, 0)
+
+
+    def test_moments(self):
+        moments = self.expression.moments()
+        self.assertIsInstance(moments, Moments)
+        self.assertEqual(moments.length, 8)
+        self.assertEqual(moments.sum, 32)
+
+
+    def test_variance(self):
+        self.assertAlmostEqual(self.expression.variance(), 228 / 7)
+        self.assertAlmostEqual(self.expression.variance(population=True), 28.5)
+        self.assertAlmostEqual(self.expression.st_dev(True), 28.5 ** 0.5)
+
+
+    def test_evaluation_is_a_single_pass(self):
+        reads = []
+        class Values(list):
+            def __iter__(self):
+                reads.append(1)
+                return super().__iter__()
+        expression = Expression(Values([1, 2, 3]))
+        self.assertEqual(((expression * 2 + 1) ** 2 - expression).sum, 77)
+        self.assertEqual(len(reads), 2)
+
+
+
+class ExpressionMissingValueTests(TestCase):
+
+    def setUp(self):
+        self.var = Variable(1, None, 3, 6, dtype="f8")
+        self.expression = self.var.lazy() + 1
+
+
+    def test_missing_values_stay_missing(self):
+        self.assertEqual(self.expression.compute().values, (2, None, 4, 7))
+        self.assertEqual(
+         (2 * self.expression - Variable(1, 1, None, 1)).compute().values,
+         (3, None, None, 13)
+        )
+        self.assertTrue(self.expression._has_missing())
+        self.assertFalse((Variable(1, 2).lazy() + 1)._has_missing())
+
+
+    def test_reductions_skip_missing_values(self):
+        self.assertEqual(self.expression.sum, 13)
+        self.assertAlmostEqual(self.expression.mean, 13 / 3)
+        self.assertEqual(self.expression.max, 7)
+        self.assertEqual(self.expression.min, 2)
+        self.assertEqual(self.expression.moments().length, 3)
+        self.assertAlmostEqual(self.expression.variance(), 19 / 3)
+
+
+    def test_variables_can_use_expressions_with_missing_values(self):
+        var = Variable(1, 2, 3, 4)
+        var += self.expression
+        self.assertEqual(var.values, (3, None, 7, 11))
@@ -0,0 +1,142 @@
+from unittest import TestCase
+from inferi.histograms import Histogram
+from inferi.variables import Variable
+
+class HistogramCreationTests(TestCase):
+
+    def test_can_create_empty_histogram(self):
+        histogram = Histogram([0, 1, 2, 3])
+        self.assertEqual(histogram._edges, (0, 1, 2, 3))
+        self.assertEqual(histogram._counts, [0, 0, 0])
+        self.assertEqual(histogram._below, 0)
+        self.assertEqual(histogram._above, 0)
+        self.assertTrue(histogram._uniform)
+
+
+    def test_uneven_edges_are_not_uniform(self):
+        self.assertFalse(Histogram([0, 1, 5])._uniform)
+
+
+    def test_edges_must_be_increasing(self):
+        with self.assertRaises(ValueError):
+            Histogram([0])
+        with self.assertRaises(ValueError):
+            Histogram([0, 2, 1])
+        with self.assertRaises(ValueError):
+            Histogram([0, 1, 1])
+
+
+    def test_histogram_repr(self):
+        self.assertEqual(str(Histogram([0, 1, 2])), "<Histogram (2 bins)>")
+
+
+    def test_histogram_length(self):
+        self.assertEqual(len(Histogram([0, 1, 2])), 2)
+
+
+
+class HistogramCountingTests(TestCase):
+
+    def test_uniform_bins(self):
+        histogram = Histogram([0, 0.1, 0.2, 0.3], [0.1, 0.2, 0.05, 0.3, 0.3])
+        self.assertEqual(histogram.counts, (1, 1, 3))
+
+
+    def test_custom_bins(self):
+        histogram = Histogram([0, 1, 5, 6], [0, 0.5, 1, 4.9, 5, 6, None])
+        self.assertEqual(histogram.counts, (2, 2, 2))
+
+
+    def test_values_outside_edges(self):
+        histogram = Histogram([0, 1, 2], [-1, 0, 2, 2.5, 3])
+        self.assertEqual(histogram.counts, (1, 1))
+        self.assertEqual(histogram.below, 1)
+        self.assertEqual(histogram.above, 2)
+        self.assertEqual(histogram.total, 2)
+
+
+    def test_can_add_values(self):
+        histogram = Histogram([0, 1, 2])
+        histogram.add(1.5)
+        histogram.update(iter([0.5, 1, 3]))
+        self.assertEqual(histogram.counts, (1, 2))
+        self.assertEqual(histogram.above, 1)
+
+
+    def test_bins(self):
+        histogram = Histogram([0, 1, 5], [0.5, 2])
+        self.assertEqual(histogram.edges, (0, 1, 5))
+        self.assertEqual(histogram.bins, ((0, 1, 1), (1, 5, 1)))
+
+
+
+class HistogramMergingTests(TestCase):
+
+    def test_can_merge_histograms(self):
+        histogram1 = Histogram([0, 1, 2], [0.5, 1.5, 3])
+        histogram2 = Histogram([0, 1, 2], [0.2, -1])
+        merged = histogram1.merge(histogram2)
+        self.assertEqual(merged.counts, (2, 1))
+        self.assertEqual(merged.below, 1)
+        self.assertEqual(merged.above, 1)
+        self.assertEqual(histogram1.counts, (1, 1))
+        self.assertEqual(merged, Histogram([0, 1, 2], [0.5, 1.5, 3, 0.2, -1]))
+
+
+    def test_can_only_merge_histograms(self):
+        with self.assertRaises(TypeError):
+            Histogram([0, 1]).merge([0, 1])
+
+
+    def test_edges_must_match(self):
+        with self.assertRaises(ValueError):
+            Histogram([0, 1]).merge(Histogram([0, 2]))
+
+
+
+class VariableHistogramTests(TestCase):
+
+    def test_default_histogram(self):
+        histogram = Variable(0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10).histogram()
+        self.assertEqual(len(histogram), 10)
+        self.assertEqual(histogram.edges[0], 0)
+        self.assertEqual(histogram.edges[-1], 10)
+        self.assertEqual(histogram.counts, (1,) * 9 + (2,))
+
+
+    def test_histogram_with_range(self):
+        histogram = Variable(1, 2, 3, 8, None).histogram(bins=2, range=(0, 4))
+        self.assertEqual(histogram.edges, (0, 2, 4))
+        self.assertEqual(histogram.counts, (1, 2))
+        self.assertEqual(histogram.above, 1)
+
+
+    def test_histogram_with_edges(self):
+        histogram = Variable(1, 2, 3, 8).histogram(bins=[0, 2.5, 10])
+        self.assertEqual(histogram.counts, (2, 2))
+
+
+    def test_single_value_histogram(self):
+        histogram = Variable(3, 3).histogram(bins=1)
+        self.assertEqual(histogram.edges, (2.5, 3.5))
+        self.assertEqual(histogram.counts, (2,))
+
+
+    def test_range_must_be_in_order(self):
+        with self.assertRaises(ValueError):
+            Variable(1, 2).histogram(range=(2, 1))
+
+
+    def test_bins_must_be_positive_int_or_edges(self):
+        var = Variable(1, 2, 3)
+        for bins in (0, -2, 3.0, "abc", None, True):
+            with self.assertRaises(ValueError):
+                var.histogram(bins=bins)
+        self.assertEqual(var.histogram(bins=(0, 2, 4)).counts, (1, 2))
+
+
+    def test_missing_values_need_range(self):
+        var = Variable(None, None, dtype="f8")
+        with self.assertRaises(ValueError):
+            var.histogram()
+        self.assertEqual(var.histogram(bins=2, range=(0, 1)).total, 0)
@@ -0,0 +1,198 @@
+import random
+from collections import Counter
+from unittest import TestCase
+from unittest.mock import patch
+from inferi.indexes import SortedIndex, FrequencyTable
+
+class SortedIndexCreationTests(TestCase):
+
+    def test_can_create_empty_index(self):
+        index = SortedIndex()
+        self.assertEqual(index._blocks, [])
+        self.assertEqual(index._length, 0)
+
+
+    def test_can_create_index_from_values(self):
+        index = SortedIndex([23, 5, 15])
+        self.assertEqual(index._blocks, [[5, 15, 23]])
+        self.assertEqual(index._maxes, [23])
+        self.assertEqual(index._length, 3)
+
+
+    def test_large_index_is_blocked(self):
+        index = SortedIndex(range(2500))
+        self.assertEqual([len(block) for block in index._blocks], [1000, 1000, 500])
+        self.assertEqual(index._maxes, [999, 1999, 2499])
+
+
+    def test_repr(self):
+        self.assertEqual(str(SortedIndex([1, 2])), "<SortedIndex (2 values)>")
+
+
+
+class SortedIndexLookupTests(TestCase):
+
+    def test_can_get_by_position(self):
+        index = SortedIndex(range(2500, 0, -1))
+        self.assertEqual(index[0], 1)
+        self.assertEqual(index[1000], 1001)
+        self.assertEqual(index[-1], 2500)
+        with self.assertRaises(IndexError):
+            index[2500]
+
+
+    def test_can_iterate(self):
+        self.assertEqual(list(SortedIndex([3, 1, 2])), [1, 2, 3])
+
+
+    def test_can_count_below(self):
+        index = SortedIndex([5, 15, 15, 23])
+        self.assertEqual(index.count_below(4), 0)
+        self.assertEqual(index.count_below(15), 1)
+        self.assertEqual(index.count_below(16), 3)
+        self.assertEqual(index.count_below(100), 4)
+
+
+
+class SortedIndexModificationTests(TestCase):
+
+    def test_can_add_values(self):
+        index = SortedIndex([5, 15])
+        index.add(10)
+        index.add(30)
+        index.add(1)
+        self.assertEqual(list(index), [1, 5, 10, 15, 30])
+        self.assertEqual(len(index), 5)
+
+
+    def test_can_add_to_empty_index(self):
+        index = SortedIndex()
+        index.add(10)
+        self.assertEqual(index._blocks, [[10]])
+
+
+    def test_full_blocks_are_split(self):
+        index = SortedIndex(range(0, 4000, 2))
+        for value in range(1, 2002, 2): index.add(value)
+        self.assertTrue(all(len(block) <= 2000 for block in index._blocks))
+        self.assertEqual(index[1000], 1000)
+
+
+    def test_can_update_with_few_values(self):
+        index = SortedIndex([5, 15])
+        with patch.object(index, "_fill") as mock_fill:
+            index.update([10, 1])
+            self.assertFalse(mock_fill.called)
+        self.assertEqual(list(index), [1, 5, 10, 15])
+
+
+    def test_can_update_with_many_values(self):
+        index = SortedIndex(range(0, 4000, 2))
+        index.update(range(3999, 0, -2))
+        self.assertEqual(list(index), list(range(4000)))
+        self.assertEqual(len(index), 4000)
+        self.assertTrue(all(len(block) == 1000 for block in index._blocks))
+        self.assertEqual(index[2500], 2500)
+
+
+    def test_can_remove_values(self):
+        index = SortedIndex([5, 10, 15])
+        index.remove(10)
+        self.assertEqual(list(index), [5, 15])
+        with self.assertRaises(ValueError):
+            index.remove(10)
+        with self.assertRaises(ValueError):
+            index.remove(100)
+
+
+    def test_empty_blocks_are_removed(self):
+        index = SortedIndex([5])
+        index.remove(5)
+        self.assertEqual(index._blocks, [])
+        self.assertEqual(index._maxes, [])
+
+
+    def test_index_stays_sorted(self):
+        generator = random.Random(3)
+        values = [generator.randint(0, 500) for _ in range(3000)]
+        index = SortedIndex(values[:1000])
+        for value in values[1000:]: index.add(value)
+        for value in values[:1500]: index.remove(value)
+        self.assertEqual(list(index), sorted(values[1500:]))
+        self.assertEqual(index[700], sorted(values[1500:])[700])
+
+
+
+class FrequencyTableCreationTests(TestCase):
+
+    def test_can_create_frequency_table(self):
+        table = FrequencyTable([1, 4, 4, 3, 4, 3])
+        self.assertEqual(table._counts, {1: 1, 4: 3, 3: 2})
+        self.assertEqual(table._groups, {1: {1}, 2: {3}, 3: {4}})
+        self.assertEqual(table._highest, 3)
+
+
+    def test_can_create_frequency_table_from_counts(self):
+        table = FrequencyTable({"a": 2, "b": 3})
+        self.assertEqual(table._counts, {"a": 2, "b": 3})
+        self.assertEqual(table._groups, {2: {"a"}, 3: {"b"}})
+        self.assertEqual(table._highest, 3)
+
+
+    def test_can_create_empty_frequency_table(self):
+        table = FrequencyTable()
+        self.assertEqual(table._groups, {})
+        self.assertEqual(table._highest, 0)
+
+
+    def test_repr(self):
+        self.assertEqual(
+         str(FrequencyTable([1, 1, 2])), "<FrequencyTable (2 values)>"
+        )
+        self.assertEqual(len(FrequencyTable([1, 1, 2])), 2)
+
+
+
+class FrequencyTableModificationTests(TestCase):
+
+    def test_can_add_values(self):
+        table = FrequencyTable([1, 4])
+        table.add(4)
+        table.add(5)
+        self.assertEqual(table.counts, {1: 1, 4: 2, 5: 1})
+        self.assertEqual(table._groups, {1: {1, 5}, 2: {4}})
+        self.assertEqual(table.highest, 2)
+
+
+    def test_can_update_with_values(self):
+        table = FrequencyTable([1, 4])
+        table.update([4, 5, 5, 5])
+        self.assertEqual(table.counts, {1: 1, 4: 2, 5: 3})
+        self.assertEqual(table._groups, {1: {1}, 2: {4}, 3: {5}})
+        self.assertEqual(table.most_frequent, {5})
+
+
+    def test_can_remove_values(self):
+        table = FrequencyTable([1, 4, 4, 3])
+        table.remove(4)
+        self.assertEqual(table.highest, 1)
+        self.assertEqual(table.most_frequent, {1, 3, 4})
+        table.remove(1)
+        self.assertEqual(table.counts, {4: 1, 3: 1})
+        with self.assertRaises(ValueError):
+            table.remove(1)
+
+
+    def test_table_stays_correct(self):
+        generator = random.Random(4)
+        values = [generator.randint(0, 20) for _ in range(500)]
+        table = FrequencyTable(values[:200])
+        for value in values[200:]: table.add(value)
+        for value in values[:300]: table.remove(value)
+        counts = Counter(values[300:])
+        self.assertEqual(table.counts, counts)
+        highest = max(counts.values())
+        self.assertEqual(table.highest, highest)
+        self.assertEqual(
+         table.most_frequent, {v for v in counts if counts[v] == highest}
+        )
@@ -0,0 +1,70 @@
+from unittest import TestCase
+from inferi.matrices import Matrix
+
+class MatrixTest(TestCase):
+
+    def setUp(self):
+        self.matrix = Matrix(["a", "b", "c"], [1, 2, 3, 4, 5, 6])
+
+
+
+class MatrixCreationTests(MatrixTest):
+
+    def test_can_create_matrix(self):
+        self.assertEqual(self.matrix._names, ("a", "b", "c"))
+        self.assertEqual(self.matrix._triangle, [1, 2, 3, 4, 5, 6])
+
+
+    def test_triangle_must_fit_names(self):
+        with self.assertRaises(ValueError):
+            Matrix(["a", "b", "c"], [1, 2, 3, 4, 5])
+
+
+    def test_names_must_be_unique(self):
+        with self.assertRaises(ValueError):
+            Matrix(["a", "b", "a"], [1, 2, 3, 4, 5, 6])
+
+
+    def test_repr(self):
+        self.assertEqual(str(self.matrix), "<Matrix (3x3)>")
+        self.assertEqual(len(self.matrix), 3)
+
+
+
+class MatrixLookupTests(MatrixTest):
+
+    def test_can_look_up_by_name(self):
+        self.assertEqual(self.matrix["a", "a"], 1)
+        self.assertEqual(self.matrix["a", "c"], 3)
+        self.assertEqual(self.matrix["c", "b"], 5)
+        self.assertEqual(self.matrix["c", "c"], 6)
+
+
+    def test_can_look_up_by_position(self):
+        self.assertEqual(self.matrix[1, 0], 2)
+        self.assertEqual(self.matrix[1, 1], 4)
+        self.assertEqual(self.matrix[-1, 1], 5)
+
+
+    def test_unknown_keys(self):
+        with self.assertRaises(KeyError):
+            self.matrix["a", "d"]
+        with self.assertRaises(KeyError):
+            self.matrix[0, 3]
+
+
+
+class MatrixRowsTests(MatrixTest):
+
+    def test_can_get_names(self):
+        self.assertEqual(self.matrix.names, ("a", "b", "c"))
+
+
+    def test_can_get_rows(self):
+        self.assertEqual(
+         self.matrix.rows, ((1, 2, 3), (2, 4, 5), (3, 5, 6))
+        )
+
+
+    def test_can_get_row(self):
+        self.assertEqual(self.matrix.row("b"), {"a": 2, "b": 4, "c": 5})
@@ -0,0 +1,153 @@
+import json
+from unittest import TestCase
+from inferi.moments import Moments, CoMoments
+from inferi.exceptions import EmptyVariableError
+
+class MomentsCreationTests(TestCase):
+
+    def test_can_create_empty_moments(self):
+        moments = Moments()
+        self.assertEqual(moments._length, 0)
+        self.assertIsNone(moments._min)
+
+
+    def test_can_create_moments_from_totals(self):
+        moments = Moments(3, 33, 11, 216, 5, 23)
+        self.assertEqual(moments._length, 3)
+        self.assertEqual(moments._sum, 33)
+        self.assertEqual(moments._mean, 11)
+        self.assertEqual(moments._square_deviations, 216)
+        self.assertEqual(moments._min, 5)
+        self.assertEqual(moments._max, 23)
+
+
+    def test_repr(self):
+        self.assertEqual(str(Moments(3, 33, 11, 216, 5, 23)), "<Moments (3 values)>")
+
+
+
+class MomentsUpdateTests(TestCase):
+
+    def test_can_update_moments(self):
+        moments = Moments()
+        moments.update(iter([23, 5, 5]))
+        self.assertEqual(moments.to_dict(), {
+         "length": 3, "sum": 33, "mean": 11, "square_deviations": 216,
+         "min": 5, "max": 23
+        })
+
+
+
+class MomentsStatisticsTests(TestCase):
+
+    def test_statistics(self):
+        moments = Moments()
+        moments.update((4, 8, 15, 16, 23, 42))
+        self.assertEqual(moments.length, 6)
+        self.assertEqual(moments.sum, 108)
+        self.assertEqual(moments.mean, 18)
+        self.assertEqual(moments.min, 4)
+        self.assertEqual(moments.max, 42)
+        self.assertEqual(moments.range, 38)
+        self.assertAlmostEqual(moments.variance(), 182, delta=0.005)
+        self.assertAlmostEqual(moments.st_dev(population=True), 12.32, delta=0.005)
+
+
+    def test_empty_statistics(self):
+        with self.assertRaises(EmptyVariableError):
+            Moments().mean
+        with self.assertRaises(EmptyVariableError):
+            Moments().variance()
+
+
+
+class MomentsMergingTests(TestCase):
+
+    def setUp(self):
+        self.shards = [(4, 8), (15, 16, 23), (42,)]
+        self.moments = []
+        for shard in self.shards:
+            moments = Moments()
+            moments.update(shard)
+            self.moments.append(moments)
+
+
+    def test_merging_matches_whole(self):
+        whole = self.moments[0].merge(self.moments[1]).merge(self.moments[2])
+        self.assertEqual(whole.length, 6)
+        self.assertEqual(whole.sum, 108)
+        self.assertEqual(whole.min, 4)
+        self.assertEqual(whole.max, 42)
+        self.assertAlmostEqual(whole.mean, 18, delta=0.000001)
+        self.assertAlmostEqual(whole.variance(), 182, delta=0.000001)
+
+
+    def test_merging_is_associative(self):
+        a, b, c = self.moments
+        left, right = a.merge(b).merge(c), a.merge(b.merge(c))
+        self.assertEqual(left.length, right.length)
+        self.assertAlmostEqual(
+         left.square_deviations, right.square_deviations, delta=0.000001
+        )
+
+
+    def test_merging_with_empty_moments(self):
+        self.assertEqual(self.moments[0].merge(Moments()), self.moments[0])
+        self.assertEqual(Moments().merge(self.moments[0]), self.moments[0])
+
+
+    def test_can_only_merge_moments(self):
+        with self.assertRaises(TypeError):
+            self.moments[0].merge((4, 8))
+
+
+
+class MomentsSerialisationTests(TestCase):
+
+    def test_moments_survive_json(self):
+        moments = Moments()
+        moments.update((4, 8, 15))
+        restored = Moments.from_dict(json.loads(json.dumps(moments.to_dict())))
+        self.assertEqual(restored, moments)
+
+
+
+class CoMomentsTests(TestCase):
+
+    def test_lengths_must_match(self):
+        x = Moments()
+        x.update((1, 2))
+        with self.assertRaises(ValueError):
+            CoMoments(x, Moments())
+
+
+    def test_can_update_co_moments(self):
+        co = CoMoments()
+        co.update(zip((2.1, 2.5, 4.0, 3.6), (8, 12, 14, 10)))
+        self.assertEqual(len(co), 4)
+        self.assertEqual(co.x.sum, 12.2)
+        self.assertEqual(co.y.sum, 44)
+        self.assertAlmostEqual(co.covariance(), 1.5333, delta=0.0001)
+        self.assertAlmostEqual(co.correlation(), 0.6626, delta=0.0001)
+
+
+    def test_merging_matches_whole(self):
+        a, b = CoMoments(), CoMoments()
+        a.update(zip((2.1, 2.5), (8, 12)))
+        b.update(zip((4.0, 3.6), (14, 10)))
+        merged = a.merge(b)
+        self.assertAlmostEqual(merged.covariance(), 1.5333, delta=0.0001)
+        self.assertAlmostEqual(
+         merged.covariance(population=True), 1.15, delta=0.0001
+        )
+
+
+    def test_can_serialise_co_moments(self):
+        co = CoMoments()
+        co.update(zip((2.1, 2.5), (8, 12)))
+        self.assertEqual(CoMoments.from_dict(co.to_dict()), co)
+
+
+    def test_empty_covariance(self):
+        with self.assertRaises(EmptyVariableError):
+            CoMoments().covariance()
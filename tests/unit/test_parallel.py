@@ -0,0 +1,72 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+from inferi.parallel import parallel_map, _share, _call_with_shared
+
+def square(x):
+    return x * x
+
+
+def scale(factor, x):
+    return factor * x
+
+
+
+class ParallelMapTests(TestCase):
+
+    def test_runs_in_process_by_default(self):
+        self.assertEqual(parallel_map(square, [1, 2, 3]), [1, 4, 9])
+        self.assertEqual(parallel_map(square, [1, 2, 3], workers=1), [1, 4, 9])
+
+
+    def test_can_use_executor(self):
+        executor = Mock()
+        executor.map.return_value = iter([1, 4, 9])
+        self.assertEqual(
+         parallel_map(square, [1, 2, 3], executor=executor), [1, 4, 9]
+        )
+        executor.map.assert_called_with(square, [1, 2, 3])
+
+
+    @patch("inferi.parallel.ProcessPoolExecutor")
+    def test_can_use_process_pool(self, mock_pool):
+        executor = mock_pool.return_value.__enter__.return_value
+        executor.map.return_value = iter([1, 4, 9])
+        self.assertEqual(parallel_map(square, [1, 2, 3], workers=4), [1, 4, 9])
+        mock_pool.assert_called_with(max_workers=4)
+        executor.map.assert_called_with(square, [1, 2, 3])
+
+
+    def test_can_give_shared_data(self):
+        self.assertEqual(
+         parallel_map(scale, [1, 2, 3], shared=10), [10, 20, 30]
+        )
+        executor = Mock()
+        executor.map.side_effect = lambda function, *args: map(function, *args)
+        self.assertEqual(
+         parallel_map(scale, [1, 2], executor=executor, shared=10), [10, 20]
+        )
+
+
+    @patch("inferi.parallel.ProcessPoolExecutor")
+    def test_shared_data_is_sent_once_per_worker(self, mock_pool):
+        executor = mock_pool.return_value.__enter__.return_value
+        executor.map.return_value = iter([10, 20])
+        parallel_map(scale, [1, 2], workers=2, shared=10)
+        mock_pool.assert_called_with(
+         max_workers=2, initializer=_share, initargs=(10,)
+        )
+        function, functions, tasks = executor.map.call_args[0]
+        self.assertIs(function, _call_with_shared)
+        self.assertEqual(next(functions), scale)
+        self.assertEqual(tasks, [1, 2])
+
+
+    def test_shared_data_in_worker_processes(self):
+        self.assertEqual(
+         parallel_map(scale, [1, 2, 3], workers=2, shared=10), [10, 20, 30]
+        )
+
+
+    def test_workers_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            parallel_map(square, [1, 2, 3], workers=0)
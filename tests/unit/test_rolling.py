@@ -0,0 +1,135 @@
+import random
+from unittest import TestCase
+from inferi.rolling import Rolling
+from inferi.variables import Variable
+
+class RollingCreationTests(TestCase):
+
+    def test_can_create_rolling(self):
+        var = Variable(4, 23, 10, 5)
+        rolling = Rolling(var, 3)
+        self.assertIs(rolling._variable, var)
+        self.assertEqual(rolling._window, 3)
+        self.assertEqual(rolling.window, 3)
+
+
+    def test_variables_can_make_rolling(self):
+        var = Variable(4, 23, 10, 5)
+        rolling = var.rolling(2)
+        self.assertIsInstance(rolling, Rolling)
+        self.assertIs(rolling._variable, var)
+
+
+    def test_window_must_fit_variable(self):
+        var = Variable(4, 23, 10, 5)
+        with self.assertRaises(ValueError):
+            var.rolling(0)
+        with self.assertRaises(ValueError):
+            var.rolling(5)
+
+
+    def test_rolling_repr(self):
+        self.assertEqual(
+         str(Variable(4, 23, 10, 5).rolling(2)), "<Rolling (window 2)>"
+        )
+
+
+
+class RollingStatisticsTests(TestCase):
+
+    def setUp(self):
+        self.var = Variable(2, 4, 4, 4, 5, 5, 7, 9, name="readings")
+        self.rolling = self.var.rolling(3)
+
+
+    def test_rolling_sum(self):
+        var = self.rolling.sum()
+        self.assertIsInstance(var, Variable)
+        self.assertEqual(var.name, "readings")
+        self.assertEqual(var.values, (10, 12, 13, 14, 17, 21))
+
+
+    def test_rolling_mean(self):
+        self.assertEqual(self.var.rolling(2).mean().values, (
+         3, 4, 4, 4.5, 5, 6, 8
+        ))
+
+
+    def test_rolling_variance(self):
+        values = self.rolling.variance().values
+        expected = (4 / 3, 0, 1 / 3, 1 / 3, 4 / 3, 4)
+        for value, expected in zip(values, expected):
+            self.assertAlmostEqual(value, expected)
+        values = self.rolling.variance(population=True).values
+        self.assertAlmostEqual(values[0], 8 / 9)
+        self.assertAlmostEqual(self.rolling.st_dev().values[-1], 2)
+
+
+    def test_rolling_min_and_max(self):
+        self.assertEqual(self.rolling.min().values, (2, 4, 4, 4, 5, 5))
+        self.assertEqual(self.rolling.max().values, (4, 4, 5, 5, 7, 9))
+        var = Variable(5, 3, 4, 1, 2, 6)
+        self.assertEqual(var.rolling(3).min().values, (3, 1, 1, 1))
+        self.assertEqual(var.rolling(3).max().values, (5, 4, 4, 6))
+
+
+    def test_rolling_median(self):
+        self.assertEqual(self.rolling.median().values, (4, 4, 4, 5, 5, 7))
+        self.assertEqual(self.var.rolling(4).median().values, (
+         4, 4, 4.5, 5, 6
+        ))
+
+
+    def test_window_of_one(self):
+        self.assertEqual(self.var.rolling(1).median().values, self.var.values)
+        self.assertEqual(self.var.rolling(1).max().values, self.var.values)
+
+
+    def test_whole_variable_window(self):
+        rolling = self.var.rolling(8)
+        self.assertEqual(rolling.mean().values, (5,))
+        self.assertEqual(rolling.median().values, (4.5,))
+        self.assertAlmostEqual(rolling.variance().values[0], 32 / 7)
+
+
+
+class RollingAccuracyTests(TestCase):
+
+    def test_large_values_leave_no_lasting_error(self):
+        generator = random.Random(1)
+        values = [1e8 + generator.random() for _ in range(1000)]
+        values += [generator.random() for _ in range(4000)]
+        rolling = Variable(values).rolling(50)
+        variances, sums = rolling.variance().values, rolling.sum().values
+        for start in range(1100, 4951, 7):
+            window = Variable(values[start:start + 50])
+            self.assertAlmostEqual(
+             variances[start], window.variance(), delta=1e-9
+            )
+            self.assertAlmostEqual(sums[start], window.sum, delta=1e-6)
+        self.assertAlmostEqual(
+         variances[-1], Variable(values[-50:]).variance(), delta=1e-9
+        )
+
+
+
+class RollingMissingValueTests(TestCase):
+
+    def setUp(self):
+        self.rolling = Variable(
+         1, None, 3, None, None, 8, 2, dtype="f8"
+        ).rolling(2)
+
+
+    def test_missing_values_are_skipped(self):
+        self.assertEqual(self.rolling.sum().values, (1, 3, 3, None, 8, 10))
+        self.assertEqual(self.rolling.mean().values, (1, 3, 3, None, 8, 5))
+        self.assertEqual(self.rolling.min().values, (1, 3, 3, None, 8, 2))
+        self.assertEqual(self.rolling.max().values, (1, 3, 3, None, 8, 8))
+        self.assertEqual(self.rolling.median().values, (1, 3, 3, None, 8, 5))
+
+
+    def test_variance_needs_two_values(self):
+        self.assertEqual(self.rolling.variance().values, (
+         None, None, None, None, None, 18
+        ))
@@ -0,0 +1,109 @@
+import random
+from unittest import TestCase
+from inferi.sketches import QuantileSketch
+
+class QuantileSketchCreationTests(TestCase):
+
+    def test_can_create_empty_sketch(self):
+        sketch = QuantileSketch()
+        self.assertEqual(sketch._k, 200)
+        self.assertEqual(sketch._compactors, [[]])
+        self.assertEqual(sketch._length, 0)
+
+
+    def test_can_create_sketch_from_iterable(self):
+        sketch = QuantileSketch(iter([23, 5, 15]), k=10)
+        self.assertEqual(sketch._compactors, [[23, 5, 15]])
+        self.assertEqual(sketch._length, 3)
+        self.assertEqual(sketch._min, 5)
+        self.assertEqual(sketch._max, 23)
+
+
+    def test_k_must_be_valid(self):
+        with self.assertRaises(TypeError):
+            QuantileSketch(k=10.5)
+        with self.assertRaises(ValueError):
+            QuantileSketch(k=4)
+
+
+    def test_repr(self):
+        self.assertEqual(
+         str(QuantileSketch([1, 2, 3])), "<QuantileSketch (3 values)>"
+        )
+
+
+
+class QuantileSketchUpdateTests(TestCase):
+
+    def test_memory_is_bounded(self):
+        sketch = QuantileSketch(range(100000), k=50, seed=1)
+        self.assertEqual(sketch.length, 100000)
+        self.assertLess(sum(map(len, sketch._compactors)), 250)
+
+
+    def test_can_add_values(self):
+        sketch = QuantileSketch(k=10)
+        for value in range(100): sketch.add(value)
+        self.assertEqual(sketch.length, 100)
+        self.assertEqual(sketch.min, 0)
+        self.assertEqual(sketch.max, 99)
+
+
+
+class QuantileSketchQueryTests(TestCase):
+
+    def setUp(self):
+        values = list(range(10000))
+        random.Random(2).shuffle(values)
+        self.sketch = QuantileSketch(values, seed=3)
+
+
+    def test_median(self):
+        self.assertAlmostEqual(self.sketch.median, 5000, delta=200)
+
+
+    def test_percentile(self):
+        self.assertAlmostEqual(self.sketch.percentile(10), 1000, delta=200)
+        self.assertEqual(self.sketch.percentile(0), 0)
+        self.assertEqual(self.sketch.percentile(100), 9999)
+        with self.assertRaises(ValueError):
+            self.sketch.percentile(101)
+
+
+    def test_quantiles(self):
+        quartiles = self.sketch.quantiles()
+        self.assertEqual(len(quartiles), 3)
+        for estimate, actual in zip(quartiles, (2500, 5000, 7500)):
+            self.assertAlmostEqual(estimate, actual, delta=200)
+        self.assertEqual(len(self.sketch.quantiles(10)), 9)
+
+
+    def test_empty_sketch_has_no_quantiles(self):
+        with self.assertRaises(ValueError):
+            QuantileSketch().median
+
+
+
+class QuantileSketchMergingTests(TestCase):
+
+    def test_can_merge_sketches(self):
+        first = QuantileSketch(range(0, 10000, 2), seed=1)
+        second = QuantileSketch(range(1, 10000, 2), seed=2)
+        merged = first.merge(second)
+        self.assertEqual(merged.length, 10000)
+        self.assertEqual(merged.min, 0)
+        self.assertEqual(merged.max, 9999)
+        self.assertAlmostEqual(merged.median, 5000, delta=200)
+        self.assertEqual(first.length, 5000)
+
+
+    def test_merging_empty_sketches(self):
+        merged = QuantileSketch().merge(QuantileSketch([4]))
+        self.assertEqual(merged.median, 4)
+
+
+    def test_can_only_merge_compatible_sketches(self):
+        with self.assertRaises(TypeError):
+            QuantileSketch().merge([1, 2])
+        with self.assertRaises(ValueError):
+            QuantileSketch(k=100).merge(QuantileSketch(k=200))
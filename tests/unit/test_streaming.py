@@ -0,0 +1,207 @@
+from unittest import TestCase
+from inferi.streaming import StreamingVariable, ExponentialVariable
+from inferi.variables import Variable
+from inferi.moments import Moments
+from inferi.exceptions import EmptyVariableError
+
+class StreamingVariableCreationTests(TestCase):
+
+    def test_can_create_empty_streaming_variable(self):
+        var = StreamingVariable()
+        self.assertEqual(var._moments, Moments())
+        self.assertEqual(var._name, "")
+
+
+    def test_can_create_streaming_variable_from_iterator(self):
+        var = StreamingVariable(iter([23, 5, 5]), name="heights")
+        self.assertEqual(var._moments._length, 3)
+        self.assertEqual(var._moments._sum, 33)
+        self.assertEqual(var._moments._min, 5)
+        self.assertEqual(var._moments._max, 23)
+        self.assertEqual(var._name, "heights")
+
+
+    def test_name_must_be_str(self):
+        with self.assertRaises(TypeError):
+            StreamingVariable(name=100)
+
+
+
+class StreamingVariableReprTests(TestCase):
+
+    def test_repr(self):
+        self.assertEqual(
+         str(StreamingVariable([1, 2])), "<StreamingVariable (2 values)>"
+        )
+        self.assertEqual(
+         str(StreamingVariable([1, 2], name="IQ")),
+         "<StreamingVariable 'IQ' (2 values)>"
+        )
+
+
+
+class StreamingVariableUpdateTests(TestCase):
+
+    def test_can_add_values(self):
+        var = StreamingVariable()
+        for value in (600, 470, 170, 430, 300): var.add(value)
+        self.assertEqual(var.length, 5)
+        self.assertEqual(len(var), 5)
+        self.assertEqual(var.min, 170)
+        self.assertEqual(var.max, 600)
+
+
+    def test_can_update_with_generator(self):
+        var = StreamingVariable([600, 470])
+        var.update(value for value in (170, 430, 300))
+        self.assertEqual(var.sum, 1970)
+
+
+
+class StreamingVariableStatisticsTests(TestCase):
+
+    def setUp(self):
+        self.var = StreamingVariable((4, 8, 15, 16, 23, 42))
+
+
+    def test_statistics(self):
+        self.assertEqual(self.var.sum, 108)
+        self.assertEqual(self.var.mean, 18)
+        self.assertEqual(self.var.range, 38)
+        self.assertAlmostEqual(self.var.variance(), 182, delta=0.005)
+        self.assertAlmostEqual(
+         self.var.variance(population=True), 151.67, delta=0.005
+        )
+        self.assertAlmostEqual(self.var.st_dev(), 13.49, delta=0.005)
+        self.assertAlmostEqual(
+         self.var.st_dev(population=True), 12.32, delta=0.005
+        )
+
+
+    def test_empty_statistics(self):
+        var = StreamingVariable()
+        self.assertEqual(var.sum, 0)
+        for statistic in ("min", "max", "mean", "range"):
+            with self.assertRaises(EmptyVariableError):
+                getattr(var, statistic)
+        with self.assertRaises(EmptyVariableError):
+            var.variance()
+
+
+
+class StreamingVariableMomentsTests(TestCase):
+
+    def test_can_get_moments(self):
+        var = StreamingVariable((4, 8, 15))
+        moments = var.moments()
+        self.assertEqual(moments, var._moments)
+        self.assertIsNot(moments, var._moments)
+
+
+
+class ExponentialVariableCreationTests(TestCase):
+
+    def test_can_create_with_half_life(self):
+        var = ExponentialVariable(half_life=1, name="load")
+        self.assertEqual(var._alpha, 0.5)
+        self.assertEqual(var.alpha, 0.5)
+        self.assertEqual(var._length, 0)
+        self.assertIsNone(var._mean)
+        self.assertEqual(var._name, "load")
+
+
+    def test_can_create_with_alpha(self):
+        var = ExponentialVariable([1, 2, 3], alpha=0.25)
+        self.assertEqual(var._alpha, 0.25)
+        self.assertEqual(var._length, 3)
+
+
+    def test_needs_one_of_half_life_or_alpha(self):
+        with self.assertRaises(ValueError):
+            ExponentialVariable()
+        with self.assertRaises(ValueError):
+            ExponentialVariable(half_life=2, alpha=0.5)
+
+
+    def test_weights_must_be_in_range(self):
+        with self.assertRaises(ValueError):
+            ExponentialVariable(half_life=0)
+        with self.assertRaises(ValueError):
+            ExponentialVariable(alpha=1.5)
+        with self.assertRaises(ValueError):
+            ExponentialVariable(alpha=0)
+
+
+    def test_name_must_be_str(self):
+        with self.assertRaises(TypeError):
+            ExponentialVariable(alpha=0.5, name=100)
+
+
+    def test_repr(self):
+        var = ExponentialVariable([1, 2], alpha=0.5)
+        self.assertEqual(str(var), "<ExponentialVariable (2 values)>")
+        var.name = "load"
+        self.assertEqual(str(var), "<ExponentialVariable 'load' (2 values)>")
+
+
+
+class ExponentialVariableStatisticsTests(TestCase):
+
+    def test_can_add_values(self):
+        var = ExponentialVariable(alpha=0.5)
+        var.add(1)
+        self.assertEqual(var.mean, 1)
+        self.assertEqual(var.variance(), 0)
+        var.add(2)
+        var.update(iter([3, 10]))
+        self.assertEqual(var.length, 4)
+        self.assertEqual(var.mean, 6.125)
+        self.assertEqual(var.variance(), 15.359375)
+        self.assertEqual(var.st_dev(), 15.359375 ** 0.5)
+
+
+    def test_missing_values_are_skipped(self):
+        var = ExponentialVariable([1, None, 2, None], alpha=0.5)
+        self.assertEqual(var.length, 2)
+        self.assertEqual(var.mean, 1.5)
+
+
+    def test_empty_statistics(self):
+        var = ExponentialVariable(alpha=0.5)
+        with self.assertRaises(EmptyVariableError):
+            var.mean
+        with self.assertRaises(EmptyVariableError):
+            var.variance()
+
+
+    def test_can_smooth_values(self):
+        var = ExponentialVariable([1], alpha=0.5, name="load")
+        smoothed = var.smooth([2, 3, None, 10])
+        self.assertIsInstance(smoothed, Variable)
+        self.assertEqual(smoothed.name, "load")
+        self.assertEqual(smoothed.values, (1.5, 2.25, 2.25, 6.125))
+        self.assertEqual(var.length, 4)
+        self.assertEqual(var.mean, 6.125)
+
+
+    def test_smoothing_starts_missing(self):
+        var = ExponentialVariable(alpha=0.5)
+        self.assertEqual(var.smooth([None, 4, 8]).values, (None, 4, 6))
+
+
+
+class VariableExponentialTests(TestCase):
+
+    def test_can_get_exponential_variable(self):
+        var = Variable(1, 2, 3, 10, name="load").ewm(half_life=1)
+        self.assertIsInstance(var, ExponentialVariable)
+        self.assertEqual(var.name, "load")
+        self.assertEqual(var.mean, 6.125)
+        var.add(6.125)
+        self.assertEqual(var.mean, 6.125)
+
+
+    def test_can_smooth_variable(self):
+        var = Variable(1, 2, 3, None, 10, name="load").smooth(alpha=0.5)
+        self.assertEqual(var.name, "load")
+        self.assertEqual(var.values, (1, 1.5, 2.25, 2.25, 6.125))
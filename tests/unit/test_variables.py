@@ -1,7 +1,12 @@
+from array import array
 from collections import Counter
+import os
+import sys
+import tempfile
 from unittest import TestCase
 from unittest.mock import Mock, patch, PropertyMock
-from inferi.variables import Variable
+from inferi.variables import Variable, _select
+from inferi.variables import _ranks, _tied_pairs, _count_swaps, _bincount
 from inferi.exceptions import EmptyVariableError
 
 class VariableCreationTests(TestCase):
@@ -42,6 +47,137 @@ class VariableCreationTests(TestCase):
             Variable(23, 5, 5, name=100)
 
 
+    def test_can_provide_name_with_iterable(self):
+        var = Variable([23, 5, 5], name="heights")
+        self.assertEqual(var._values, [23, 5, 5])
+        self.assertEqual(var._name, "heights")
+
+
+    def test_can_create_typed_variable(self):
+        var = Variable([23, 5, 5], dtype="f8")
+        self.assertEqual(var._values, array("d", [23, 5, 5]))
+        self.assertEqual(var._dtype, "f8")
+        var = Variable(23, 5, 5, dtype="i4")
+        self.assertEqual(var._values, array("i", [23, 5, 5]))
+
+
+    def test_dtype_must_be_valid(self):
+        with self.assertRaises(ValueError):
+            Variable(23, 5, 5, dtype="x9")
+
+
+    def test_typed_values_must_fit_dtype(self):
+        with self.assertRaises(TypeError):
+            Variable(23, "5", 5, dtype="f8")
+
+
+    def test_variable_starts_with_empty_cache(self):
+        var = Variable(23, 5, 5)
+        self.assertEqual(var._cache, {})
+
+
+
+class VariableFromFileTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "values.bin")
+        with open(self.path, "wb") as f:
+            f.write(b"HEAD")
+            array("d", [600, 470, 170, 430, 300]).tofile(f)
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def test_can_map_file(self):
+        var = Variable.from_file(self.path, "f8", offset=4, name="mapped")
+        self.assertIsInstance(var._values, memoryview)
+        self.assertEqual(var._values.format, "d")
+        self.assertEqual(var.values, (600, 470, 170, 430, 300))
+        self.assertEqual(var.name, "mapped")
+        self.assertEqual(var.dtype, "f8")
+
+
+    def test_mapped_statistics(self):
+        var = Variable.from_file(self.path, "f8", offset=4)
+        self.assertEqual(var.length, 5)
+        self.assertEqual(var.sum, 1970)
+        self.assertEqual(var.mean, 394)
+        self.assertEqual(var.min, 170)
+        self.assertEqual(var.max, 600)
+        self.assertEqual(var.median, 430)
+        self.assertAlmostEqual(var.variance(), 27130, delta=0.000001)
+
+
+    def test_mapped_slices_are_views(self):
+        var = Variable.from_file(self.path, "f8", offset=4)
+        self.assertIsInstance(var[1:3], memoryview)
+        self.assertEqual(list(var[1:3]), [470, 170])
+
+
+    def test_mapped_variables_are_read_only(self):
+        var = Variable.from_file(self.path, "f8", offset=4)
+        self.assertFalse(var.writable)
+        self.assertTrue(Variable(1, 2).writable)
+        for change in (
+         lambda: var.add(1), lambda: var.insert(0, 1), lambda: var.remove(600),
+         lambda: var.pop(), lambda: var.__setitem__(0, 1)
+        ):
+            with self.assertRaises(TypeError):
+                change()
+
+
+    def test_mapped_variables_can_be_reordered(self):
+        var = Variable.from_file(self.path, "f8", offset=4)
+        var._reorder([4, 3, 2, 1, 0])
+        self.assertEqual(var._values, array("d", [300, 430, 170, 470, 600]))
+        self.assertTrue(var.writable)
+
+
+    def test_file_must_hold_whole_values(self):
+        with self.assertRaises(ValueError):
+            Variable.from_file(self.path, "f8")
+        with self.assertRaises(ValueError):
+            Variable.from_file(self.path, "x9")
+
+
+    def test_offset_must_not_be_negative(self):
+        with self.assertRaises(ValueError):
+            Variable.from_file(self.path, "f8", offset=-8)
+
+
+    def test_file_must_have_values(self):
+        with self.assertRaises(EmptyVariableError):
+            Variable.from_file(self.path, "f8", offset=44)
+        empty = os.path.join(self.directory.name, "empty.bin")
+        open(empty, "wb").close()
+        with self.assertRaises(EmptyVariableError):
+            Variable.from_file(empty, "f8")
+
+
+    def test_can_close_mapped_variable(self):
+        var = Variable.from_file(self.path, "f8", offset=4)
+        mapping = var._values.obj
+        var.close()
+        self.assertTrue(mapping.closed)
+        self.assertEqual(var._values, array("d", [600, 470, 170, 430, 300]))
+        self.assertTrue(var.writable)
+        var.add(100)
+        self.assertEqual(var.length, 6)
+        var.close()
+
+
+    def test_cannot_close_while_views_are_in_use(self):
+        var = Variable.from_file(self.path, "f8", offset=4)
+        buffer = var.buffer()
+        with self.assertRaises(BufferError):
+            var.close()
+        self.assertEqual(var.values, (600, 470, 170, 430, 300))
+        buffer.release()
+
+
 
 class VariableReprTests(TestCase):
 
@@ -101,6 +237,163 @@ class VariableSetTests(TestCase):
 
 
 
+class VariableArithmeticTests(TestCase):
+
+    def setUp(self):
+        self.var1 = Variable(4, 23, 10)
+        self.var2 = Variable(5, 1, 2)
+
+
+    def test_can_add_variables(self):
+        var = self.var1 + self.var2
+        self.assertIsInstance(var, Variable)
+        self.assertEqual(var._values, [9, 24, 12])
+
+
+    def test_can_add_numbers(self):
+        self.assertEqual((self.var1 + 10)._values, [14, 33, 20])
+        self.assertEqual((10 + self.var1)._values, [14, 33, 20])
+
+
+    def test_can_subtract(self):
+        self.assertEqual((self.var1 - self.var2)._values, [-1, 22, 8])
+        self.assertEqual((self.var1 - 4)._values, [0, 19, 6])
+        self.assertEqual((30 - self.var1)._values, [26, 7, 20])
+
+
+    def test_can_multiply(self):
+        self.assertEqual((self.var1 * self.var2)._values, [20, 23, 20])
+        self.assertEqual((2 * self.var1)._values, [8, 46, 20])
+
+
+    def test_can_divide(self):
+        self.assertEqual((self.var1 / self.var2)._values, [0.8, 23, 5])
+        self.assertEqual((self.var1 / 2)._values, [2, 11.5, 5])
+        self.assertEqual((46 / self.var1)._values, [11.5, 2, 4.6])
+
+
+    def test_can_raise_to_power(self):
+        self.assertEqual((self.var2 ** 2)._values, [25, 1, 4])
+        self.assertEqual((2 ** self.var2)._values, [32, 2, 4])
+        self.assertEqual((self.var2 ** self.var2)._values, [3125, 1, 4])
+
+
+    def test_can_negate_and_get_absolute_values(self):
+        self.assertEqual((-self.var1)._values, [-4, -23, -10])
+        self.assertEqual(abs(self.var1 - 10)._values, [6, 13, 0])
+
+
+    def test_can_compare(self):
+        self.assertEqual((self.var1 < 10)._values, [True, False, False])
+        self.assertEqual((self.var1 <= 10)._values, [True, False, True])
+        self.assertEqual((self.var1 > self.var2)._values, [False, True, True])
+        self.assertEqual((self.var1 >= 10)._values, [False, True, True])
+
+
+    def test_equality_is_identity(self):
+        self.assertNotEqual(self.var1, Variable(4, 23, 10))
+        self.assertEqual(self.var1, self.var1)
+
+
+    def test_variables_must_be_same_length(self):
+        self.var2.pop()
+        with self.assertRaises(ValueError):
+            self.var1 + self.var2
+
+
+    def test_typed_results_keep_dtype_if_possible(self):
+        var = Variable(4, 23, 10, dtype="i8")
+        self.assertEqual((var + 1)._values, array("q", [5, 24, 11]))
+        self.assertEqual((var / 2)._values, [2, 11.5, 5])
+        self.assertIsNone((var / 2).dtype)
+
+
+
+class VariableInPlaceArithmeticTests(TestCase):
+
+    def test_can_modify_in_place(self):
+        var = Variable(4, 23, 10)
+        original = var
+        var += 1
+        var -= Variable(1, 2, 3)
+        var *= 2
+        var /= 2
+        var **= 2
+        self.assertIs(var, original)
+        self.assertEqual(var._values, [16, 484, 64])
+
+
+    def test_in_place_resets_derived_data(self):
+        var = Variable(4, 23, 10, indexed=True)
+        var.sum, var.mode
+        var += 1
+        self.assertEqual(var._cache, {})
+        self.assertIsNone(var._frequency_table)
+        self.assertEqual(list(var._index), [5, 11, 24])
+        self.assertEqual(var.sum, 40)
+
+
+    def test_in_place_keeps_typed_storage(self):
+        var = Variable(4, 23, 10, dtype="f8")
+        var *= 2
+        self.assertEqual(var._values, array("d", [8, 46, 20]))
+        var = Variable(4, 23, 10, dtype="i8")
+        with self.assertRaises(TypeError):
+            var /= 2
+
+
+
+class VariableBufferTests(TestCase):
+
+    def test_can_get_buffer(self):
+        var = Variable(23, 5, 15, dtype="i4")
+        buffer = var.buffer()
+        self.assertIsInstance(buffer, memoryview)
+        self.assertEqual(buffer.format, "i")
+        self.assertEqual(buffer.tolist(), [23, 5, 15])
+        self.assertTrue(buffer.readonly)
+
+
+    def test_buffer_is_not_a_copy(self):
+        var = Variable(23, 5, 15, dtype="f8")
+        buffer = var.buffer()
+        var[1] = 6
+        self.assertEqual(buffer[1], 6)
+
+
+    def test_list_variables_have_no_buffer(self):
+        with self.assertRaises(TypeError):
+            Variable(23, 5, 15).buffer()
+
+
+    def test_buffer_protocol(self):
+        var = Variable(23, 5, 15, dtype="f4")
+        self.assertEqual(var.__buffer__(0).tolist(), [23, 5, 15])
+        if sys.version_info >= (3, 12):
+            self.assertEqual(memoryview(var).tolist(), [23, 5, 15])
+
+
+    def test_array_interface_uses_buffer(self):
+        numpy = Mock()
+        with patch.dict(sys.modules, {"numpy": numpy}):
+            var = Variable(23, 5, 15, dtype="f8")
+            self.assertIs(var.__array__(), numpy.frombuffer.return_value)
+            buffer, = numpy.frombuffer.call_args[0]
+            self.assertEqual(buffer.tolist(), [23, 5, 15])
+            self.assertEqual(numpy.frombuffer.call_args[1], {"dtype": "d"})
+            var.__array__(dtype="f4")
+            numpy.frombuffer.return_value.astype.assert_called_with("f4")
+
+
+    def test_array_interface_copies_lists(self):
+        numpy = Mock()
+        with patch.dict(sys.modules, {"numpy": numpy}):
+            var = Variable(23, 5, 15)
+            self.assertIs(var.__array__(), numpy.array.return_value)
+            numpy.array.assert_called_with([23, 5, 15], dtype=None)
+
+
+
 class VariableValuesTests(TestCase):
 
     def test_can_get_values(self):
@@ -109,6 +402,14 @@ class VariableValuesTests(TestCase):
 
 
 
+class VariableDtypeTests(TestCase):
+
+    def test_can_get_dtype(self):
+        self.assertEqual(Variable(23, 5, 5, dtype="f4").dtype, "f4")
+        self.assertIsNone(Variable(23, 5, 5).dtype)
+
+
+
 class VariableValueAdditionTests(TestCase):
 
     def test_can_add_value(self):
@@ -118,6 +419,76 @@ class VariableValueAdditionTests(TestCase):
 
 
 
+class VariableExtensionTests(TestCase):
+
+    def test_can_extend_variable(self):
+        var = Variable(23, 5, 5)
+        var.extend(iter([17, 4]))
+        self.assertEqual(var._values, [23, 5, 5, 17, 4])
+
+
+    def test_can_extend_typed_variable(self):
+        var = Variable(23, 5, dtype="i4")
+        var.extend([17, 4])
+        self.assertEqual(var._values, array("i", [23, 5, 17, 4]))
+        with self.assertRaises(TypeError):
+            var.extend([1, "a"])
+        self.assertEqual(var.values, (23, 5, 17, 4))
+
+
+    def test_can_extend_with_missing_values(self):
+        var = Variable(23, 5, dtype="f8")
+        var.extend([None, 4])
+        self.assertEqual(var.values, (23, 5, None, 4))
+        self.assertEqual(var._valid, bytearray([1, 1, 0, 1]))
+        var.extend([1])
+        self.assertEqual(var._valid, bytearray([1, 1, 0, 1, 1]))
+        self.assertEqual(var.count_missing, 1)
+
+
+    def test_can_extend_categorical_variable(self):
+        var = Variable("a", "b", dtype="category")
+        var.extend([str(n) for n in range(300)] + ["a"])
+        self.assertEqual(var._values.typecode, "H")
+        self.assertEqual(var[-1], "a")
+        self.assertEqual(var[-2], "299")
+
+
+    def test_extending_updates_cache_once(self):
+        var = Variable(23, 5, 5, indexed=True)
+        var.sum, var.max, var.min, var.variance(), var.median, var.frequencies
+        with patch.object(var, "_update_cache") as mock_update:
+            var.extend([17, None, 4])
+            mock_update.assert_called_once_with([17, 4])
+        var = Variable(23, 5, 5, indexed=True)
+        var.sum, var.max, var.min, var.variance(), var.median, var.frequencies
+        var.extend([17, None, 4])
+        self.assertEqual(var._cache["sum"], 54)
+        self.assertEqual(var._cache["max"], 23)
+        self.assertEqual(var._cache["min"], 4)
+        self.assertNotIn("median", var._cache)
+        self.assertAlmostEqual(
+         var.variance(), Variable(23, 5, 5, 17, 4).variance()
+        )
+        self.assertEqual(var.median, 5)
+        self.assertEqual(var.frequencies, {23: 1, 5: 2, 17: 1, 4: 1})
+
+
+    def test_extending_with_only_missing_values_keeps_cache(self):
+        var = Variable(23, 5, 5)
+        median = var.median
+        var.extend([None, None])
+        self.assertEqual(var._cache["median"], median)
+
+
+    def test_cannot_extend_read_only_variable(self):
+        var = Variable(1)
+        var._values = memoryview(array("i", [1]))
+        with self.assertRaises(TypeError):
+            var.extend([2])
+
+
+
 class VariableValueInsertionTests(TestCase):
 
     def test_can_insert_value(self):
@@ -126,6 +497,27 @@ class VariableValueInsertionTests(TestCase):
         self.assertEqual(var._values, [23, 17, 5, 5])
 
 
+    def test_can_insert_at_negative_index(self):
+        var = Variable(1, 2, 3, indexed=True)
+        var.frequencies
+        var.insert(-1, 9)
+        self.assertEqual(var.values, (1, 2, 9, 3))
+        self.assertEqual(list(var._index), [1, 2, 3, 9])
+        self.assertEqual(var.frequencies, Counter([1, 2, 9, 3]))
+        var.insert(-10, 0)
+        self.assertEqual(var.values, (0, 1, 2, 9, 3))
+        self.assertEqual(list(var._index), [0, 1, 2, 3, 9])
+
+
+    def test_can_insert_past_end(self):
+        var = Variable(1, 2, 3, indexed=True)
+        var.frequencies
+        var.insert(10, 4)
+        self.assertEqual(var.values, (1, 2, 3, 4))
+        self.assertEqual(list(var._index), [1, 2, 3, 4])
+        self.assertEqual(var.frequencies, Counter([1, 2, 3, 4]))
+
+
 
 class VariableRemovalTests(TestCase):
 
@@ -165,6 +557,54 @@ class VariablePoppingTests(TestCase):
 
 
 
+class VariableTypedStorageTests(TestCase):
+
+    def test_typed_variable_acts_like_list(self):
+        var = Variable(23, 5, 15, dtype="i8")
+        self.assertEqual(var[1], 5)
+        var.add(17)
+        var.insert(0, 4)
+        var[1] = 24
+        self.assertEqual(var.pop(), 17)
+        self.assertEqual(var.values, (4, 24, 5, 15))
+        self.assertIsInstance(var._values, array)
+
+
+    def test_typed_variable_rejects_wrong_types(self):
+        var = Variable(23, 5, 15, dtype="i8")
+        with self.assertRaises(TypeError):
+            var.add(1.5)
+
+
+    def test_typed_variable_statistics(self):
+        var = Variable(600, 470, 170, 430, 300, dtype="f8")
+        self.assertEqual(var.sum, 1970)
+        self.assertEqual(var.mean, 394)
+        self.assertEqual(var.min, 170)
+        self.assertEqual(var.max, 600)
+        self.assertAlmostEqual(var.variance(), 27130, delta=0.000001)
+        var2 = Variable(1, 2, 3, 4, 5, dtype="i2")
+        self.assertAlmostEqual(var.covariance_with(var2), -160, delta=0.000001)
+
+
+
+class VariableReorderingTests(TestCase):
+
+    def test_can_reorder_values(self):
+        var = Variable(23, 5, 15)
+        var.sum
+        var._reorder([1, 2, 0])
+        self.assertEqual(var._values, [5, 15, 23])
+        self.assertEqual(var._cache, {"sum": 43})
+
+
+    def test_reordering_keeps_typed_storage(self):
+        var = Variable(23, 5, 15, dtype="u2")
+        var._reorder([1, 2, 0])
+        self.assertEqual(var._values, array("H", [5, 15, 23]))
+
+
+
 class VariableNameTests(TestCase):
 
     def test_can_get_variable_name(self):
@@ -248,6 +688,162 @@ class VariableMedianTests(TestCase):
 
 
 
+class VariablePercentileTests(TestCase):
+
+    def test_can_get_percentile(self):
+        var = Variable(15, 20, 35, 40, 50)
+        self.assertEqual(var.percentile(0), 15)
+        self.assertEqual(var.percentile(50), 35)
+        self.assertEqual(var.percentile(100), 50)
+        self.assertEqual(var.percentile(40), 29)
+
+
+    def test_percentile_must_be_in_range(self):
+        var = Variable(15, 20, 35, 40, 50)
+        with self.assertRaises(ValueError):
+            var.percentile(-1)
+        with self.assertRaises(ValueError):
+            var.percentile(100.5)
+
+
+    def test_percentiles_are_cached(self):
+        var = Variable(15, 20, 35, 40, 50)
+        var.percentile(40)
+        self.assertEqual(var._cache[("percentile", (40,), ())], 29)
+
+
+
+class VariableBatchPercentileTests(TestCase):
+
+    def test_can_get_many_percentiles(self):
+        var = Variable(15, 20, 35, 40, 50)
+        self.assertEqual(var.percentiles([0, 40, 50, 100]), [15, 29, 35, 50])
+
+
+    @patch("inferi.variables._select")
+    def test_values_are_selected_once(self, mock_select):
+        mock_select.return_value = {0: 15, 1: 20, 2: 35, 4: 50}
+        var = Variable(15, 20, 35, 40, 50)
+        self.assertEqual(var.percentiles([0, 40, 50, 100]), [15, 29, 35, 50])
+        mock_select.assert_called_once_with([15, 20, 35, 40, 50], [0, 1, 2, 4])
+
+
+
+class VariableQuantilesTests(TestCase):
+
+    def test_can_get_quartiles(self):
+        var = Variable(range(1, 10))
+        self.assertEqual(var.quantiles(), [3, 5, 7])
+
+
+    def test_can_get_other_quantiles(self):
+        var = Variable(range(0, 11))
+        self.assertEqual(var.quantiles(5), [2, 4, 6, 8])
+        self.assertEqual(var.quantiles(1), [])
+        with self.assertRaises(ValueError):
+            var.quantiles(0)
+
+
+
+class VariableIndexTests(TestCase):
+
+    def test_variables_are_not_indexed_by_default(self):
+        var = Variable(23, 5, 15)
+        self.assertIsNone(var._index)
+        self.assertFalse(var.indexed)
+
+
+    def test_can_create_indexed_variable(self):
+        var = Variable(23, 5, 15, indexed=True)
+        self.assertEqual(list(var._index), [5, 15, 23])
+        self.assertTrue(var.indexed)
+
+
+    def test_can_turn_index_on_and_off(self):
+        var = Variable(23, 5, 15)
+        var.indexed = True
+        self.assertEqual(list(var._index), [5, 15, 23])
+        var.indexed = False
+        self.assertIsNone(var._index)
+
+
+    def test_index_follows_changes(self):
+        var = Variable(23, 5, 15, 8, indexed=True)
+        var.add(4)
+        var.insert(0, 30)
+        var.remove(15)
+        var.pop(1)
+        var[0] = 10
+        var[1:3] = [6, 7]
+        self.assertEqual(list(var._index), sorted(var._values))
+
+
+    @patch("inferi.variables._select")
+    def test_indexed_percentiles_use_index(self, mock_select):
+        var = Variable(15, 20, 35, 40, 50, indexed=True)
+        self.assertEqual(var.percentiles([0, 40, 50, 100]), [15, 29, 35, 50])
+        self.assertEqual(var.median, 35)
+        self.assertFalse(mock_select.called)
+
+
+
+class VariableRankTests(TestCase):
+
+    def test_can_count_below(self):
+        for indexed in (False, True):
+            var = Variable(15, 20, 20, 40, 50, indexed=indexed)
+            self.assertEqual(var.count_below(20), 1)
+            self.assertEqual(var.count_below(21), 3)
+            self.assertEqual(var.count_below(0), 0)
+
+
+    def test_can_get_rank(self):
+        var = Variable(15, 20, 20, 40, 50)
+        self.assertEqual(var.rank(15), 1)
+        self.assertEqual(var.rank(40), 4)
+        self.assertEqual(var.rank(100), 6)
+
+
+
+class VariableIqrTests(TestCase):
+
+    def test_can_get_iqr(self):
+        var = Variable(range(1, 10))
+        self.assertEqual(var.iqr, 4)
+
+
+
+class SelectionTests(TestCase):
+
+    def test_selection_matches_sorting(self):
+        import random
+        generator = random.Random(1)
+        for size in (1, 10, 100, 10000):
+            for values in (
+             [generator.random() for _ in range(size)],
+             [generator.randint(0, 5) for _ in range(size)],
+             list(range(size))
+            ):
+                ranks = sorted(set((0, size // 3, size // 2, size - 1)))
+                selected = _select(list(values), ranks)
+                values.sort()
+                self.assertEqual(
+                 selected, {rank: values[rank] for rank in ranks}
+                )
+
+
+
+class VariableSketchTests(TestCase):
+
+    def test_can_get_sketch(self):
+        var = Variable(range(1001))
+        sketch = var.sketch(k=50, seed=1)
+        self.assertEqual(sketch.length, 1001)
+        self.assertEqual(sketch._k, 50)
+        self.assertAlmostEqual(sketch.median, 500, delta=30)
+
+
+
 class FrequencyTests(TestCase):
 
     def test_can_get_frequencies(self):
@@ -257,21 +853,60 @@ class FrequencyTests(TestCase):
         )
 
 
+    def test_frequency_table_is_built_when_needed(self):
+        var = Variable(1, 4, 7, 3, 1, 6, 4, 4)
+        self.assertIsNone(var._frequency_table)
+        var.frequencies
+        self.assertEqual(var._frequency_table._counts, var.frequencies)
+
+
+    def test_frequencies_follow_changes(self):
+        var = Variable(1, 4, 7, 3, 1, 6, 4, 4)
+        var.frequencies
+        var.add(6)
+        var.insert(0, 9)
+        var.remove(7)
+        var.pop()
+        var[0] = 3
+        self.assertEqual(var.frequencies, Counter(var._values))
+        var[0:2] = [5, 5]
+        self.assertIsNone(var._frequency_table)
+        self.assertEqual(var.frequencies, Counter(var._values))
+
+
+    def test_unhashable_values_are_fine_until_counted(self):
+        var = Variable([[1], [2]])
+        var.add([3])
+        with self.assertRaises(TypeError):
+            var.frequencies
+
+
 
 class VariableModeTests(TestCase):
 
-    @patch("inferi.variables.Variable.frequencies", new_callable=PropertyMock)
-    def test_can_get_mode(self, mock_frequencies):
-        mock_frequencies.return_value = Counter({1: 2, 4: 3, 3: 1, 7: 1, 6: 1})
-        var = Variable(1, 1, 1)
+    def test_can_get_mode(self):
+        var = Variable(1, 4, 7, 3, 1, 6, 4, 4)
         self.assertEqual(var.mode, 4)
 
 
-    @patch("inferi.variables.Variable.frequencies", new_callable=PropertyMock)
-    def test_no_mode_when_multi_mode(self, mock_frequencies):
-        mock_frequencies.return_value = Counter({1: 2, 4: 3, 3: 3, 7: 1, 6: 1})
-        var = Variable(1, 4, 7, 3, 1, 6, 4)
+    def test_no_mode_when_multi_mode(self):
+        var = Variable(1, 4, 7, 3, 1, 6, 4, 4, 3, 3)
+        self.assertEqual(var.mode, None)
+
+
+    def test_mode_follows_changes(self):
+        var = Variable(1, 4, 7, 3, 1, 6, 4, 4)
+        var.mode
+        var.add(1)
         self.assertEqual(var.mode, None)
+        var.insert(0, 1)
+        self.assertEqual(var.mode, 1)
+        var.remove(1)
+        var.pop(0)
+        self.assertEqual(var.mode, 4)
+        var[0] = 7
+        var[2] = 7
+        self.assertEqual(var.mode, 7)
 
 
 
@@ -286,24 +921,94 @@ class VariableRangeTests(TestCase):
 
 
 
+class VariableCacheTests(TestCase):
+
+    def test_statistics_are_cached(self):
+        var = Variable(23, 5, 5)
+        self.assertEqual(var.sum, 33)
+        var._values[0] = 100
+        self.assertEqual(var.sum, 33)
+        self.assertEqual(var._cache["sum"], 33)
+
+
+    def test_cached_frequencies_are_copied(self):
+        var = Variable(23, 5, 5)
+        var.frequencies[5] = 100
+        self.assertEqual(var.frequencies[5], 2)
+
+
+    def test_adding_updates_cache(self):
+        var = Variable(23, 5, 5)
+        var.sum, var.min, var.max, var.median, var.variance()
+        var.add(1)
+        self.assertEqual(var._cache["sum"], 34)
+        self.assertEqual(var._cache["min"], 1)
+        self.assertEqual(var._cache["max"], 23)
+        self.assertNotIn("median", var._cache)
+        self.assertAlmostEqual(var.variance(), 97, delta=0.000001)
+
+
+    def test_changing_values_clears_cache(self):
+        var = Variable(23, 5, 5, 4)
+        for change in (
+         lambda: var.__setitem__(0, 6), lambda: var.insert(0, 7),
+         lambda: var.remove(7), lambda: var.pop()
+        ):
+            var.sum
+            change()
+            self.assertEqual(var._cache, {})
+        self.assertEqual(var.sum, 16)
+
+
+    def test_cache_is_updated_from_stored_values(self):
+        expected = Variable([0.1, 0.2, 0.3, 0.7, 0.9], dtype="f4")
+        for extend in (
+         lambda var: [var.add(value) for value in (0.3, 0.7, 0.9)],
+         lambda var: var.extend([0.3, None, 0.7, 0.9])
+        ):
+            var = Variable([0.1, 0.2], dtype="f4", indexed=True)
+            var.sum, var.min, var.max, var.variance()
+            extend(var)
+            self.assertEqual(var.sum, expected.sum)
+            self.assertEqual(var.max, expected.max)
+            self.assertEqual(var.mean, expected.mean)
+            self.assertEqual(var.variance(), expected.variance())
+            self.assertEqual(list(var._index), sorted(expected))
+
+
+    def test_index_holds_stored_values(self):
+        var = Variable([0.1, 0.2], dtype="f4", indexed=True)
+        var.insert(0, 0.3)
+        var[1] = 0.7
+        var.remove(var[0])
+        self.assertEqual(list(var._index), [var[1], var[0]])
+
+
+
 class VariableVarianceTests(TestCase):
 
-    @patch("inferi.variables.Variable.mean", new_callable=PropertyMock)
-    @patch("inferi.variables.Variable.length", new_callable=PropertyMock)
-    def test_can_get_variance(self, mock_len, mock_mean):
-        mock_mean.return_value = 394
-        mock_len.return_value = 5
+    def test_can_get_variance(self):
+        var = Variable(600, 470, 170, 430, 300)
+        self.assertAlmostEqual(var.variance(), 27130, delta=0.000001)
+
+
+    def test_can_get_population_variance(self):
         var = Variable(600, 470, 170, 430, 300)
-        self.assertEqual(var.variance(), 27130)
+        self.assertAlmostEqual(
+         var.variance(population=True), 21704, delta=0.000001
+        )
+
+
+    def test_variance_is_stable_for_large_offsets(self):
+        var = Variable(1e9 + 4, 1e9 + 7, 1e9 + 13, 1e9 + 16)
+        self.assertAlmostEqual(var.variance(), 30, delta=0.000001)
 
 
     @patch("inferi.variables.Variable.mean", new_callable=PropertyMock)
-    @patch("inferi.variables.Variable.length", new_callable=PropertyMock)
-    def test_can_get_population_variance(self, mock_len, mock_mean):
-        mock_mean.return_value = 394
-        mock_len.return_value = 5
+    def test_variance_does_not_use_mean_property(self, mock_mean):
         var = Variable(600, 470, 170, 430, 300)
-        self.assertEqual(var.variance(population=True), 21704)
+        var.variance()
+        self.assertFalse(mock_mean.called)
 
 
 
@@ -349,6 +1054,75 @@ class VariableZscoreTests(TestCase):
 
 
 
+class VariableBatchZscoreTests(TestCase):
+
+    @patch("inferi.variables.Variable.mean", new_callable=PropertyMock)
+    @patch("inferi.variables.Variable.st_dev")
+    def test_can_get_zscores(self, mock_sd, mock_mean):
+        var = Variable(350, 650, 950, name="scores")
+        mock_sd.return_value = 300
+        mock_mean.return_value = 650
+        zscores = var.zscores()
+        self.assertIsInstance(zscores, Variable)
+        self.assertEqual(zscores.values, (-1, 0, 1))
+        self.assertEqual(zscores.name, "scores")
+        self.assertEqual(mock_mean.call_count, 1)
+        mock_sd.assert_called_once_with(population=False)
+
+
+    @patch("inferi.variables.Variable.mean", new_callable=PropertyMock)
+    @patch("inferi.variables.Variable.st_dev")
+    def test_can_get_population_zscores(self, mock_sd, mock_mean):
+        var = Variable(350, 650, 950)
+        mock_sd.return_value = 200
+        mock_mean.return_value = 650
+        self.assertEqual(var.zscores(population=True).values, (-1.5, 0, 1.5))
+        mock_sd.assert_called_once_with(population=True)
+
+
+    @patch("inferi.variables.Variable.mean", new_callable=PropertyMock)
+    @patch("inferi.variables.Variable.st_dev")
+    def test_can_score_many_values(self, mock_sd, mock_mean):
+        var = Variable(600, 470, 170, 430, 300)
+        mock_sd.return_value = 300
+        mock_mean.return_value = 650
+        zscores = var.zscore_many(iter([200, 650, 1100]))
+        self.assertEqual(zscores.values, (-1.5, 0, 1.5))
+        self.assertEqual(mock_mean.call_count, 1)
+        mock_sd.assert_called_once_with(population=False)
+
+
+
+class VariableMomentsTests(TestCase):
+
+    def test_can_get_moments(self):
+        var = Variable(600, 470, 170, 430, 300)
+        moments = var.moments()
+        self.assertEqual(moments.length, 5)
+        self.assertEqual(moments.sum, 1970)
+        self.assertEqual(moments.min, 170)
+        self.assertEqual(moments.max, 600)
+        self.assertAlmostEqual(moments.variance(), 27130, delta=0.000001)
+
+
+    def test_can_get_co_moments(self):
+        var1 = Variable(2.1, 2.5, 4.0, 3.6)
+        var2 = Variable(8, 12, 14, 10)
+        co = var1.co_moments_with(var2)
+        self.assertEqual(co.x.sum, var1.sum)
+        self.assertEqual(co.y.sum, var2.sum)
+        self.assertAlmostEqual(co.covariance(), 1.5333, delta=0.0001)
+
+
+    def test_co_moments_require_variables_of_equal_length(self):
+        var = Variable(2.1, 2.5, 4.0, 3.6)
+        with self.assertRaises(TypeError):
+            var.co_moments_with("variable")
+        with self.assertRaises(ValueError):
+            var.co_moments_with(Variable(1, 2))
+
+
+
 class VariableCovarianceTests(TestCase):
 
     @patch("inferi.variables.Variable.length", new_callable=PropertyMock)
@@ -360,7 +1134,9 @@ class VariableCovarianceTests(TestCase):
         var2 = Mock(Variable)
         var2.mean = 11
         var2._values = [8, 12, 14, 10]
+        var2._present.return_value = var2._values
         var2.length = 4
+        var2._missing = 0
         self.assertAlmostEqual(var1.covariance_with(var2), 1.53, delta=0.005)
 
 
@@ -391,11 +1167,361 @@ class VariableCorrelationTests(TestCase):
         var1 = Variable(2.1, 2.5, 4.0, 3.6)
         var2 = Mock(Variable)
         var2.st_dev.return_value = 3
+        var2._missing = 0
         self.assertEqual(var1.correlation_with(var2), 7)
         mock_cov.assert_called_with(var2)
 
 
 
+class VariableRankCorrelationTests(TestCase):
+
+    def setUp(self):
+        self.var1 = Variable(1, 2, 3, 4, 5)
+        self.var2 = Variable(5, 6, 7, 8, 7)
+
+
+    def test_ranks_average_ties(self):
+        self.assertEqual(_ranks([10, 30, 20]), [1, 3, 2])
+        self.assertEqual(_ranks([5, 6, 7, 8, 7]), [1, 2, 3.5, 5, 3.5])
+        self.assertEqual(_ranks([1, 1, 1]), [2, 2, 2])
+
+
+    def test_tied_pairs(self):
+        self.assertEqual(_tied_pairs([1, 2, 3]), 0)
+        self.assertEqual(_tied_pairs([1, 1, 2, 1, 2]), 4)
+
+
+    def test_count_swaps(self):
+        values = [3, 1, 2, 2, 0]
+        self.assertEqual(_count_swaps(values), 7)
+        self.assertEqual(values, [0, 1, 2, 2, 3])
+        values = list(range(300, 0, -1))
+        self.assertEqual(_count_swaps(values, block_size=4), 300 * 299 // 2)
+        self.assertEqual(values, list(range(1, 301)))
+
+
+    def test_spearman(self):
+        self.assertAlmostEqual(
+         self.var1.spearman_with(self.var2), 0.8208, delta=0.0001
+        )
+        self.assertAlmostEqual(
+         self.var1.spearman_with(Variable(1, 4, 9, 16, 25)), 1
+        )
+        self.assertAlmostEqual(
+         self.var1.spearman_with(Variable(25, 16, 9, 4, 1)), -1
+        )
+
+
+    def test_kendall(self):
+        self.assertAlmostEqual(
+         self.var1.kendall_with(self.var2), 0.7379, delta=0.0001
+        )
+        self.assertAlmostEqual(
+         self.var1.kendall_with(Variable(2, 1, 4, 3, 5)), 0.6
+        )
+        self.assertAlmostEqual(
+         self.var1.kendall_with(Variable(25, 16, 9, 4, 1)), -1
+        )
+
+
+    def test_rank_correlations_skip_missing_pairs(self):
+        var1 = Variable(1, 2, None, 3, 4, 5)
+        var2 = Variable(5, 6, 1, 7, 8, None)
+        self.assertAlmostEqual(var1.spearman_with(var2), 1)
+        self.assertAlmostEqual(var1.kendall_with(var2), 1)
+
+
+    def test_rank_correlations_need_matching_variable(self):
+        for method in (self.var1.spearman_with, self.var1.kendall_with):
+            with self.assertRaises(TypeError):
+                method([5, 6, 7, 8, 7])
+            with self.assertRaises(ValueError):
+                method(Variable(1, 2))
+
+
+
+class VariableCategoricalTests(TestCase):
+
+    def setUp(self):
+        self.var = Variable(
+         "up", "down", "up", None, "idle", "up", dtype="category"
+        )
+
+
+    def test_values_are_stored_as_codes(self):
+        self.assertEqual(self.var._categories, ["up", "down", "idle"])
+        self.assertEqual(
+         self.var._category_codes, {"up": 0, "down": 1, "idle": 2}
+        )
+        self.assertEqual(self.var._values, array("B", [0, 1, 0, 0, 2, 0]))
+        self.assertEqual(self.var.categories, ("up", "down", "idle"))
+        self.assertEqual(self.var.dtype, "category")
+        self.assertIsNone(Variable(1, 2).categories)
+
+
+    def test_values_are_decoded(self):
+        self.assertEqual(
+         self.var.values, ("up", "down", "up", None, "idle", "up")
+        )
+        self.assertEqual(self.var[1], "down")
+        self.assertIsNone(self.var[3])
+        self.assertEqual(self.var[2:5], ["up", None, "idle"])
+        self.assertEqual(
+         str(Variable("a", "b", dtype="category")), "<Variable ('a', 'b')>"
+        )
+
+
+    def test_membership(self):
+        self.assertIn("idle", self.var)
+        self.assertIn(None, self.var)
+        self.assertNotIn("off", self.var)
+        self.var[4] = "up"
+        self.assertNotIn("idle", self.var)
+
+
+    def test_codes_widen_with_more_categories(self):
+        var = Variable(range(256), dtype="category")
+        self.assertEqual(var._values.typecode, "B")
+        self.assertEqual(
+         Variable(range(257), dtype="category")._values.typecode, "H"
+        )
+        var.add(256)
+        self.assertEqual(var._values.typecode, "H")
+        self.assertEqual(var[255], 255)
+        self.assertEqual(var[256], 256)
+
+
+    def test_modifying_categorical_variable(self):
+        self.var.add("off")
+        self.var.insert(0, "down")
+        self.var[2] = None
+        self.var[4:6] = ["idle", "on"]
+        self.assertEqual(self.var.values, (
+         "down", "up", None, "up", "idle", "on", "up", "off"
+        ))
+        self.assertEqual(self.var.count_missing, 1)
+        self.var.remove("idle")
+        self.assertEqual(self.var.pop(), "off")
+        self.assertEqual(
+         self.var.values, ("down", "up", None, "up", "on", "up")
+        )
+        with self.assertRaises(ValueError):
+            self.var.remove("idle")
+
+
+    def test_frequencies_count_codes(self):
+        self.var.remove("idle")
+        self.assertEqual(self.var.frequencies, {"up": 3, "down": 1})
+        self.assertEqual(self.var.mode, "up")
+        self.var.add("down")
+        self.assertEqual(self.var.frequencies, {"up": 3, "down": 2})
+
+
+    def test_bincount(self):
+        self.assertEqual(_bincount(array("B", [0, 2, 2, 0, 2]), 3), [2, 0, 3])
+        self.assertEqual(_bincount(array("B", [1, 40, 1]), 41)[:2], [0, 2])
+        self.assertEqual(_bincount(array("H", [300, 1, 300]), 301)[300], 2)
+
+
+    def test_positions(self):
+        self.assertEqual(self.var.positions("up"), [0, 2, 5])
+        self.assertEqual(self.var.positions(None), [3])
+        self.assertEqual(self.var.positions("off"), [])
+        self.assertEqual(Variable(1, None, 0, dtype="i4").positions(0), [2])
+        self.assertEqual(Variable(1, 0, 1).positions(1), [0, 2])
+        self.assertEqual(Variable(1, 0, 1).positions(None), [])
+
+
+    def test_category_ranks(self):
+        self.assertEqual(self.var._category_ranks(), [2, 0, 2, 2, 1, 2])
+
+
+    def test_statistics_use_values(self):
+        var = Variable(3, 1, 3, None, 2, dtype="category")
+        self.assertEqual(var.mean, 2.25)
+        self.assertEqual(var.max, 3)
+        self.assertEqual(var.median, 2.5)
+        self.assertEqual((var * 2).values, (6, 2, 6, None, 4))
+        var += 1
+        self.assertEqual(var.values, (4, 2, 4, None, 3))
+        self.assertEqual(var.categories, (4, 2, 3))
+
+
+    def test_unary_operators_use_values(self):
+        var = Variable([10, -20, 10, 30], dtype="category")
+        self.assertEqual((-var).values, (-10, 20, -10, -30))
+        self.assertEqual(abs(var).values, (10, 20, 10, 30))
+
+
+    def test_covariance_uses_values(self):
+        var = Variable([10, 20, 30, 40], dtype="category")
+        other = Variable([1, 2, 3, 4])
+        expected = Variable([10, 20, 30, 40]).covariance_with(other)
+        self.assertAlmostEqual(var.covariance_with(other), expected)
+        self.assertAlmostEqual(other.covariance_with(var), expected)
+        self.assertAlmostEqual(
+         var.co_moments_with(other).covariance(), expected
+        )
+        self.assertAlmostEqual(
+         var.correlation_with(Variable([1, 2, 4, 3])),
+         Variable([10, 20, 30, 40]).correlation_with(Variable([1, 2, 4, 3]))
+        )
+
+
+    def test_categorical_variables_have_no_buffer(self):
+        with self.assertRaises(TypeError):
+            self.var.buffer()
+
+
+
+class VariableMissingValueTests(TestCase):
+
+    def test_complete_variables_have_no_mask(self):
+        var = Variable(4, 23, 10)
+        self.assertIsNone(var._valid)
+        self.assertEqual(var._missing, 0)
+        self.assertEqual(var.count_missing, 0)
+
+
+    def test_missing_values_are_masked(self):
+        var = Variable(4, None, 10, None)
+        self.assertEqual(var._values, [4, None, 10, None])
+        self.assertEqual(var._valid, bytearray([1, 0, 1, 0]))
+        self.assertEqual(var.count_missing, 2)
+        self.assertEqual(var.length, 4)
+
+
+    def test_typed_storage_uses_placeholders(self):
+        var = Variable(4, None, 10, dtype="i8")
+        self.assertEqual(var._values, array("q", [4, 0, 10]))
+        self.assertEqual(var._valid, bytearray([1, 0, 1]))
+        self.assertEqual(var.values, (4, None, 10))
+        self.assertEqual(list(var), [4, None, 10])
+        self.assertIsNone(var[1])
+        self.assertEqual(var[0:2], [4, None])
+        self.assertIn(None, var)
+        self.assertNotIn(0, var)
+        self.assertEqual(str(var), "<Variable (4, None, 10)>")
+
+
+    def test_statistics_need_a_present_value(self):
+        for var in (Variable([None, None]), Variable([None], dtype="f8")):
+            for statistic in (
+             lambda: var.max, lambda: var.min, lambda: var.sum,
+             lambda: var.mean, lambda: var.median,
+             lambda: var.percentiles([25, 75])
+            ):
+                with self.assertRaises(EmptyVariableError):
+                    statistic()
+        var = Variable([None, None])
+        var.add(3)
+        self.assertEqual(var.mean, 3)
+
+
+    def test_statistics_skip_missing_values(self):
+        for dtype in (None, "f8"):
+            var = Variable(2, None, 4, 4, 4, 5, None, 5, 7, 9, dtype=dtype)
+            self.assertEqual(var.sum, 40)
+            self.assertEqual(var.mean, 5)
+            self.assertEqual(var.min, 2)
+            self.assertEqual(var.max, 9)
+            self.assertEqual(var.median, 4.5)
+            self.assertEqual(var.variance(population=True), 4)
+            self.assertEqual(var.mode, 4)
+            self.assertEqual(var.frequencies, {2: 1, 4: 3, 5: 2, 7: 1, 9: 1})
+            self.assertEqual(var.count_below(5), 4)
+            self.assertEqual(var.moments().length, 8)
+
+
+    def test_index_skips_missing_values(self):
+        var = Variable(2, None, 4, 9, dtype="f8", indexed=True)
+        self.assertEqual(list(var._index), [2, 4, 9])
+        self.assertEqual(var.median, 4)
+
+
+    def test_adding_missing_values_keeps_statistics(self):
+        var = Variable(4, 23, 10, dtype="i8")
+        var.sum
+        var.add(None)
+        self.assertEqual(var._cache, {"sum": 37})
+        self.assertEqual(var.values, (4, 23, 10, None))
+        self.assertEqual(var.count_missing, 1)
+        var.insert(0, None)
+        self.assertEqual(var.values, (None, 4, 23, 10, None))
+        self.assertEqual(var._valid, bytearray([0, 1, 1, 1, 0]))
+        self.assertEqual(var.count_missing, 2)
+        self.assertEqual(var.mean, 37 / 3)
+
+
+    def test_removing_missing_values(self):
+        var = Variable(None, 4, 0, None, dtype="i8")
+        self.assertIsNone(var.pop())
+        self.assertEqual(var.count_missing, 1)
+        var.remove(0)
+        self.assertEqual(var.values, (None, 4))
+        var.remove(None)
+        self.assertEqual(var.values, (4,))
+        self.assertEqual(var.count_missing, 0)
+        self.assertIsNone(var._valid)
+
+
+    def test_setting_missing_values(self):
+        var = Variable(4, 23, 10, dtype="i8", indexed=True)
+        var[1] = None
+        self.assertEqual(var.values, (4, None, 10))
+        self.assertEqual(list(var._index), [4, 10])
+        self.assertEqual(var.count_missing, 1)
+        var[1] = 5
+        self.assertEqual(var.values, (4, 5, 10))
+        self.assertIsNone(var._valid)
+        var[0:2] = [None, None]
+        self.assertEqual(var.values, (None, None, 10))
+        self.assertEqual(var.count_missing, 2)
+        self.assertEqual(list(var._index), [10])
+
+
+    def test_arithmetic_keeps_values_missing(self):
+        var1 = Variable(4, None, 10, dtype="i8")
+        var2 = Variable(1, 2, None)
+        self.assertEqual((var1 + 1).values, (5, None, 11))
+        self.assertEqual((var1 + 1).dtype, "i8")
+        self.assertEqual((var1 * var2).values, (4, None, None))
+        self.assertEqual((-var1).values, (-4, None, -10))
+        self.assertEqual((var1 > 5).values, (False, None, True))
+        var1 += var2
+        self.assertEqual(var1.values, (5, None, None))
+        self.assertEqual(var1.count_missing, 2)
+
+
+    def test_zscores_keep_values_missing(self):
+        var = Variable(2, None, 4, 4, 4, 5, 5, 7, 9)
+        self.assertEqual(var.zscores(population=True).values, (
+         -1.5, None, -0.5, -0.5, -0.5, 0, 0, 1, 2
+        ))
+
+
+    def test_reordering_reorders_mask(self):
+        var = Variable(4, None, 10, dtype="f8")
+        var._reorder([2, 1, 0])
+        self.assertEqual(var.values, (10, None, 4))
+
+
+    def test_covariance_uses_complete_pairs(self):
+        var1 = Variable(2.1, 2.5, None, 4.0, 3.6, 7)
+        var2 = Variable(8, 12, 4, 14, 10, None)
+        self.assertAlmostEqual(var1.covariance_with(var2), 1.53, delta=0.005)
+        self.assertEqual(var1.co_moments_with(var2).x.length, 4)
+        self.assertAlmostEqual(var1.correlation_with(var2), 0.66, delta=0.005)
+
+
+    def test_complete_pairs(self):
+        var1, var2 = Variable(1, None, 3), Variable(4, 5, None)
+        self.assertEqual(var1._complete_pairs(var2), ([1], [4]))
+        var1, var2 = Variable(1, 2, 3), Variable(4, 5, 6)
+        self.assertEqual(var1._complete_pairs(var2), ([1, 2, 3], [4, 5, 6]))
+
+
+
 '''
 
 